@@ -0,0 +1,72 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundBuilder:
+	def __init__(self, build=None, background: bool = True):
+		"""
+		Runs a build whenever one is requested, off the thread that requested it.
+		Requests arriving during a run are coalesced into one more run. A failed run
+		is logged and leaves the builder idle for the next request.
+
+		Args:
+		    build (callable, optional): Called without arguments for every run;
+		                                subclasses may override build() instead.
+		    background (bool): Run on a daemon thread instead of the caller's thread.
+		"""
+		self._build = build
+		self.background = background
+		self._lock = threading.Lock()
+		self._running = False
+		self._pending = False
+		self._idle = threading.Event()
+		self._idle.set()
+
+	def build(self):
+		"""Performs one run."""
+		if self._build is not None:
+			self._build()
+
+	def request_rebuild(self):
+		"""Schedules a run, or one more run if a run is in progress."""
+		with self._lock:
+			if self._running:
+				self._pending = True
+				return
+			self._running = True
+			self._idle.clear()
+
+		if self.background:
+			threading.Thread(target=self._run, daemon=True).start()
+		else:
+			self._run()
+
+	def wait(self, timeout: float | None = None) -> bool:
+		"""Blocks until no run is in progress. Returns False on timeout."""
+		return self._idle.wait(timeout)
+
+	def _run(self):
+		idle = False
+		try:
+			while True:
+				try:
+					self.build()
+				except Exception:
+					logger.exception('%s run failed', type(self).__name__)
+
+				with self._lock:
+					if not self._pending:
+						self._running = False
+						self._idle.set()
+						idle = True
+						return
+					self._pending = False
+		finally:
+			if not idle:
+				# Interrupted by a BaseException: later requests must still get a run.
+				with self._lock:
+					self._running = False
+					self._pending = False
+					self._idle.set()
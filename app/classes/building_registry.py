@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+
+from .topology_cache import CachedTopology, build_topology, compute_topology_hash
+
+
+class BuildingNotFoundError(LookupError):
+	"""Raised when a request refers to a building ID that was never registered."""
+
+
+class BuildingRegistry:
+	def __init__(self, backend: str = 'networkx', distance_matrix_options: dict | None = None):
+		"""
+		Buildings registered once under a client-chosen ID, so that later requests only
+		send occupancy changes or room IDs instead of every room and sensor. Unlike
+		TopologyCache entries, registered buildings are never evicted, and their rooms
+		change only through this registry.
+
+		Args:
+		    backend (str): Graph backend passed to every SensorGraph that is built.
+		    distance_matrix_options (dict, optional): See TopologyCache.
+		"""
+		self.backend = backend
+		self.distance_matrix_options = distance_matrix_options
+		self._buildings = {}
+		self._lock = threading.Lock()
+
+	def register(
+		self, building_id: str, room_schemas: list, sensor_schemas: list
+	) -> CachedTopology:
+		"""
+		Stores a building under building_id. If the building is already registered
+		with the same topology, its graph is kept and only occupancy is refreshed.
+
+		Args:
+		    building_id (str): The client's ID for the building.
+		    room_schemas (list): Room schema objects or records.
+		    sensor_schemas (list): Sensor schema objects or records.
+
+		Returns:
+		    CachedTopology: The registered topology.
+		"""
+		topology_hash = compute_topology_hash(room_schemas, sensor_schemas)
+		with self._lock:
+			topology = self._buildings.get(building_id)
+
+		if topology is not None and topology.topology_hash == topology_hash:
+			topology.apply_occupancy(room_schemas)
+			return topology
+
+		topology = build_topology(
+			room_schemas,
+			sensor_schemas,
+			backend=self.backend,
+			distance_matrix_options=self.distance_matrix_options,
+			topology_hash=topology_hash,
+			key=('building', building_id, topology_hash),
+		)
+		with self._lock:
+			self._buildings[building_id] = topology
+		return topology
+
+	def get(self, building_id: str) -> CachedTopology:
+		"""
+		Raises:
+		    BuildingNotFoundError: If no building is registered under building_id.
+		"""
+		with self._lock:
+			topology = self._buildings.get(building_id)
+		if topology is None:
+			raise BuildingNotFoundError(f"Building '{building_id}' is not registered.")
+		return topology
+
+	def update_occupancy(
+		self, building_id: str, occupancy: dict, crowd_factors: dict | None = None
+	) -> CachedTopology:
+		"""
+		Applies occupancy changes to a registered building, see
+		CachedTopology.update_occupancy().
+
+		Returns:
+		    CachedTopology: The updated topology.
+
+		Raises:
+		    BuildingNotFoundError: If no building is registered under building_id.
+		    ValueError: If a room ID is not part of the building.
+		"""
+		topology = self.get(building_id)
+		topology.update_occupancy(occupancy, crowd_factors)
+		return topology
+
+	@contextmanager
+	def checkout(self, building_id: str):
+		"""
+		Yields the registered topology for one request, like TopologyCache.checkout(),
+		with its latest weights pinned for the calling thread.
+
+		Raises:
+		    BuildingNotFoundError: If no building is registered under building_id.
+		"""
+		topology = self.get(building_id)
+		with topology.sensor_graph.pinned_weights():
+			yield topology
+
+	def remove(self, building_id: str):
+		"""Forgets a registered building; unknown IDs are ignored."""
+		with self._lock:
+			self._buildings.pop(building_id, None)
+
+	def __contains__(self, building_id: str) -> bool:
+		return building_id in self._buildings
+
+	def __len__(self):
+		return len(self._buildings)
@@ -0,0 +1,229 @@
+import operator
+
+import numpy as np
+
+from .room import Room, room_weights
+from .sensor import Sensor
+
+# Numeric room columns kept as NumPy arrays, with their dtypes.
+ROOM_COLUMNS = {
+	'occupants': np.int64,
+	'area': np.float64,
+	'crowd_factor': np.float64,
+	'popularity_factor': np.float64,
+	'floor': np.int64,
+}
+# Sensor columns kept as NumPy arrays, with their dtypes.
+SENSOR_COLUMNS = {
+	'longitude': np.float64,
+	'latitude': np.float64,
+	'is_vertical': np.bool_,
+}
+
+
+def field_reader(records: list):
+	"""
+	Returns the accessor for a list of building records: operator.getitem for dict
+	records (for example, RoomRecord) and getattr for schema objects (for example,
+	RoomSchema).
+	"""
+	if records and isinstance(records[0], dict):
+		return operator.getitem
+	return getattr
+
+
+class BuildingStore:
+	def __init__(
+		self,
+		room_ids: list,
+		room_names: list,
+		room_columns: dict,
+		sensor_ids: list,
+		sensor_columns: dict,
+		sensor_room_offsets: np.ndarray,
+		sensor_rooms: np.ndarray,
+	):
+		"""
+		A columnar (struct-of-arrays) copy of a building: one NumPy array per room and
+		sensor attribute, indexed by integer room/sensor position, plus the sensor-to-room
+		memberships in compressed sparse row form. Lets the graph layer read positions,
+		floors and room weights in bulk instead of attribute by attribute.
+
+		Args:
+		    room_ids (list): Room ID per room index.
+		    room_names (list): Room name per room index.
+		    room_columns (dict): Arrays for every key of ROOM_COLUMNS.
+		    sensor_ids (list): Sensor ID per sensor index.
+		    sensor_columns (dict): Arrays for every key of SENSOR_COLUMNS.
+		    sensor_room_offsets (np.ndarray): int64 array of length sensors + 1; the rooms of
+		                                      sensor i are sensor_rooms[offsets[i]:offsets[i + 1]].
+		    sensor_rooms (np.ndarray): int64 room indices, in each sensor's room order.
+		"""
+		self.room_ids = room_ids
+		self.room_index = {room_id: index for index, room_id in enumerate(room_ids)}
+		self.room_names = room_names
+		self.room_columns = room_columns
+		self.sensor_ids = sensor_ids
+		self.sensor_columns = sensor_columns
+		self.sensor_room_offsets = sensor_room_offsets
+		self.sensor_rooms = sensor_rooms
+
+	@classmethod
+	def from_schemas(cls, room_schemas: list, sensor_schemas: list) -> 'BuildingStore':
+		"""
+		Builds the store in one pass per column from room and sensor schema objects
+		(for example, RoomSchema and SensorSchema) or their dict records (RoomRecord
+		and SensorRecord). As in Room.create_room_mapping_from_schemas() a repeated
+		room ID keeps its last values, and as in Sensor.from_schema() room IDs without
+		a room are dropped from a sensor's memberships.
+		"""
+		room_field = field_reader(room_schemas)
+		rooms = {room_field(schema, 'id'): schema for schema in room_schemas}
+		return cls.from_records(
+			rooms.keys(),
+			rooms.values(),
+			sensor_schemas,
+			room_field=room_field,
+			sensor_field=field_reader(sensor_schemas),
+		)
+
+	@classmethod
+	def from_records(
+		cls, room_ids, room_records, sensor_records, room_field, sensor_field
+	) -> 'BuildingStore':
+		"""
+		Builds the store from any room and sensor records, read with the given accessors.
+
+		Args:
+		    room_ids (iterable): Unique room IDs, in the order of room_records.
+		    room_records (iterable): One record per room.
+		    sensor_records (list): One record per sensor.
+		    room_field (callable): room_field(record, name) returns a room attribute.
+		    sensor_field (callable): sensor_field(record, name) returns a sensor attribute.
+
+		Returns:
+		    BuildingStore: The columnar building.
+		"""
+		room_ids = list(room_ids)
+		room_records = list(room_records)
+		room_index = {room_id: index for index, room_id in enumerate(room_ids)}
+
+		room_columns = {
+			name: np.fromiter(
+				(room_field(record, name) for record in room_records),
+				dtype=dtype,
+				count=len(room_records),
+			)
+			for name, dtype in ROOM_COLUMNS.items()
+		}
+		sensor_columns = {
+			name: np.fromiter(
+				(sensor_field(record, name) for record in sensor_records),
+				dtype=dtype,
+				count=len(sensor_records),
+			)
+			for name, dtype in SENSOR_COLUMNS.items()
+		}
+
+		memberships = [
+			[
+				room_index[room_id]
+				for room_id in sensor_field(record, 'rooms')
+				if room_id in room_index
+			]
+			for record in sensor_records
+		]
+		sensor_room_offsets = np.zeros(len(sensor_records) + 1, dtype=np.int64)
+		np.cumsum([len(rooms) for rooms in memberships], out=sensor_room_offsets[1:])
+		sensor_rooms = np.fromiter(
+			(index for rooms in memberships for index in rooms),
+			dtype=np.int64,
+			count=int(sensor_room_offsets[-1]),
+		)
+
+		return cls(
+			room_ids,
+			[room_field(record, 'name') for record in room_records],
+			room_columns,
+			[sensor_field(record, 'id') for record in sensor_records],
+			sensor_columns,
+			sensor_room_offsets,
+			sensor_rooms,
+		)
+
+	@property
+	def room_count(self) -> int:
+		return len(self.room_ids)
+
+	@property
+	def sensor_count(self) -> int:
+		return len(self.sensor_ids)
+
+	def positions(self) -> np.ndarray:
+		"""Returns a float64 array (sensors, 2) with the (longitude, latitude) of every sensor."""
+		return np.column_stack((self.sensor_columns['longitude'], self.sensor_columns['latitude']))
+
+	def memberships(self) -> tuple:
+		"""Returns (sensor index, room index) arrays with one entry per sensor-room link."""
+		sensor_indices = np.repeat(
+			np.arange(self.sensor_count, dtype=np.int64), np.diff(self.sensor_room_offsets)
+		)
+		return sensor_indices, self.sensor_rooms
+
+	def room_weights(self, room_indices=None) -> np.ndarray:
+		"""
+		Computes Room.calculate_weight() for many rooms at once.
+
+		Args:
+		    room_indices (array-like, optional): Rooms to compute. Defaults to all rooms.
+
+		Returns:
+		    np.ndarray: float64 weights, identical to the per-object calculation.
+
+		Raises:
+		    ZeroDivisionError: If an occupied room has an area of 0.
+		"""
+		if room_indices is None:
+			room_indices = np.arange(self.room_count)
+		return room_weights(
+			self.room_columns['occupants'][room_indices],
+			self.room_columns['area'][room_indices],
+			self.room_columns['crowd_factor'][room_indices],
+		)
+
+	def create_room_mapping(self) -> dict:
+		"""Returns {room_id: Room} with one slotted Room object per stored room."""
+		columns = [self.room_columns[name].tolist() for name in ROOM_COLUMNS]
+		return {
+			room_id: Room(
+				id=room_id,
+				name=name,
+				crowd_factor=crowd_factor,
+				occupants=occupants,
+				area=area,
+				popularity_factor=popularity_factor,
+				floor=floor,
+			)
+			for room_id, name, occupants, area, crowd_factor, popularity_factor, floor in zip(
+				self.room_ids, self.room_names, *columns
+			)
+		}
+
+	def create_sensors(self, room_mapping: dict) -> list:
+		"""Returns one slotted Sensor per stored sensor, linked to the rooms in room_mapping."""
+		rooms = [room_mapping[room_id] for room_id in self.room_ids]
+		offsets = self.sensor_room_offsets.tolist()
+		sensor_rooms = self.sensor_rooms.tolist()
+		columns = [self.sensor_columns[name].tolist() for name in SENSOR_COLUMNS]
+		return [
+			Sensor(
+				id=sensor_id,
+				longitude=longitude,
+				latitude=latitude,
+				is_vertical=is_vertical,
+				rooms=[rooms[index] for index in sensor_rooms[start:end]],
+			)
+			for sensor_id, longitude, latitude, is_vertical, start, end in zip(
+				self.sensor_ids, *columns, offsets, offsets[1:]
+			)
+		]
@@ -0,0 +1,247 @@
+import heapq
+import itertools
+import threading
+
+import networkx as nx
+
+from .weight_snapshot import WeightSnapshot
+
+
+class CCHMetric:
+	__slots__ = ('version', 'arc_weights', 'arc_middles')
+
+	def __init__(self, version: int, arc_weights: list, arc_middles: list):
+		"""
+		The arc weights of a ContractionHierarchy for one weights version.
+
+		Args:
+		    version (int): The WeightSnapshot version the weights were customized for.
+		    arc_weights (list): Weight per arc; inf if the arc has no path below it.
+		    arc_middles (list): For shortcut arcs the node the arc passes through,
+		                        None for arcs that are an edge of the graph.
+		"""
+		self.version = version
+		self.arc_weights = arc_weights
+		self.arc_middles = arc_middles
+
+
+class ContractionHierarchy:
+	def __init__(self, node_count: int, first: list, second: list):
+		"""
+		A customizable contraction hierarchy over the sensor-to-sensor edges. The
+		preprocessing only depends on the topology: nodes are ranked by a minimum
+		degree elimination order, and eliminating a node connects all of its higher
+		ranked neighbors by arcs (shortcuts). customize() then applies edge weights
+		to every arc in one pass over the lower triangles, which is fast enough to
+		repeat after each occupancy change. Queries are a bidirectional search that
+		only follows arcs towards higher ranked nodes.
+
+		Args:
+		    node_count (int): Number of nodes; node indices are 0..node_count - 1.
+		    first (list): First node index of every edge.
+		    second (list): Second node index of every edge, in the same order.
+		"""
+		adjacency = [set() for _ in range(node_count)]
+		for node1, node2 in zip(first, second):
+			if node1 != node2:
+				adjacency[node1].add(node2)
+				adjacency[node2].add(node1)
+
+		# Minimum degree elimination order; neighbors of an eliminated node become a clique.
+		self.rank = [-1] * node_count
+		upward = [None] * node_count
+		heap = [(len(neighbors), node) for node, neighbors in enumerate(adjacency)]
+		heapq.heapify(heap)
+		next_rank = 0
+		while heap:
+			degree, node = heapq.heappop(heap)
+			if self.rank[node] >= 0 or degree != len(adjacency[node]):
+				continue
+			self.rank[node] = next_rank
+			next_rank += 1
+			neighbors = adjacency[node]
+			upward[node] = neighbors
+			for neighbor in neighbors:
+				neighbor_adjacency = adjacency[neighbor]
+				neighbor_adjacency.discard(node)
+				neighbor_adjacency.update(neighbors)
+				neighbor_adjacency.discard(neighbor)
+				heapq.heappush(heap, (len(neighbor_adjacency), neighbor))
+			adjacency[node] = None
+
+		self.order = sorted(range(node_count), key=self.rank.__getitem__)
+		arc_index = {}
+		# {node: [(higher ranked neighbor, arc)]}
+		self.upward_arcs = [[] for _ in range(node_count)]
+		self.arc_tails = []
+		self.arc_heads = []
+		for node in self.order:
+			for neighbor in sorted(upward[node], key=self.rank.__getitem__):
+				arc = len(self.arc_tails)
+				arc_index[node, neighbor] = arc
+				self.upward_arcs[node].append((neighbor, arc))
+				self.arc_tails.append(node)
+				self.arc_heads.append(neighbor)
+
+		self._arc_index = arc_index
+
+		def arc_between(node1, node2):
+			if self.rank[node1] < self.rank[node2]:
+				return arc_index[node1, node2]
+			return arc_index[node2, node1]
+
+		self.edge_arcs = [arc_between(node1, node2) for node1, node2 in zip(first, second)]
+		# (lower arc, lower arc, upper arc, middle node) for every lower triangle, in rank order.
+		self.triangles = [
+			(arc1, arc2, arc_between(neighbor1, neighbor2), node)
+			for node in self.order
+			for (neighbor1, arc1), (neighbor2, arc2) in itertools.combinations(
+				self.upward_arcs[node], 2
+			)
+		]
+		self._metric = None
+		self._lock = threading.Lock()
+
+	@property
+	def arc_count(self) -> int:
+		return len(self.arc_tails)
+
+	def customize(self, edge_weights: list, version: int = 0) -> CCHMetric:
+		"""
+		Computes the arc weights for the given edge weights: every arc starts at its
+		edge's weight (or inf for shortcuts) and is lowered through each triangle with
+		a lower ranked node, lowest ranked nodes first.
+
+		Args:
+		    edge_weights (list): Weight per edge, in the order given to the constructor.
+		    version (int): Stored as the metric's version.
+		"""
+		arc_weights = [float('inf')] * self.arc_count
+		for arc, weight in zip(self.edge_arcs, edge_weights):
+			if weight < arc_weights[arc]:
+				arc_weights[arc] = weight
+		arc_middles = [None] * self.arc_count
+
+		for arc1, arc2, upper_arc, node in self.triangles:
+			weight = arc_weights[arc1] + arc_weights[arc2]
+			if weight < arc_weights[upper_arc]:
+				arc_weights[upper_arc] = weight
+				arc_middles[upper_arc] = node
+
+		return CCHMetric(version, arc_weights, arc_middles)
+
+	def current_metric(self, weights: WeightSnapshot) -> CCHMetric | None:
+		"""Returns the kept metric if it was customized for the given weights, else None."""
+		metric = self._metric
+		if metric is None or metric.version != weights.version:
+			return None
+		return metric
+
+	def update_metric(self, weights: WeightSnapshot) -> CCHMetric:
+		"""Customizes the metric for the given weights and keeps it unless a newer one is kept already."""
+		with self._lock:
+			metric = self._metric
+			if metric is not None and metric.version == weights.version:
+				return metric
+			metric = self.customize(weights.edge_weights, weights.version)
+			if self._metric is None or self._metric.version < metric.version:
+				self._metric = metric
+			return metric
+
+	def shortest_path(self, sources: list, targets: list, metric: CCHMetric) -> tuple:
+		"""
+		Bidirectional upward search between two sets of nodes that all start at
+		distance 0. Each direction stops once its queue holds nothing shorter than
+		the best path found so far; the path's shortcuts are then unpacked.
+
+		Args:
+		    sources (list): Source node indices.
+		    targets (list): Target node indices.
+		    metric (CCHMetric): The customized arc weights to search with.
+
+		Returns:
+		    tuple: (node indices from a source to a target, distance).
+
+		Raises:
+		    nx.NetworkXNoPath: If no target can be reached.
+		"""
+		arc_weights = metric.arc_weights
+		upward_arcs = self.upward_arcs
+		node_count = len(upward_arcs)
+		inf = float('inf')
+		tentative = ([inf] * node_count, [inf] * node_count)
+		preds = ({}, {})
+		settled = (bytearray(node_count), bytearray(node_count))
+		heaps = ([], [])
+		for side, seeds in enumerate((sources, targets)):
+			for node in seeds:
+				tentative[side][node] = 0.0
+				preds[side][node] = None
+				heaps[side].append((0.0, node))
+
+		best = inf
+		meeting = None
+		while True:
+			side = None
+			for candidate_side in (0, 1):
+				heap = heaps[candidate_side]
+				if heap and heap[0][0] < best:
+					if side is None or heap[0][0] < heaps[side][0][0]:
+						side = candidate_side
+			if side is None:
+				break
+
+			distance, node = heapq.heappop(heaps[side])
+			side_settled = settled[side]
+			if side_settled[node]:
+				continue
+			side_settled[node] = 1
+			if distance + tentative[1 - side][node] < best:
+				best = distance + tentative[1 - side][node]
+				meeting = node
+
+			side_tentative = tentative[side]
+			side_preds = preds[side]
+			side_heap = heaps[side]
+			for neighbor, arc in upward_arcs[node]:
+				candidate = distance + arc_weights[arc]
+				if candidate < side_tentative[neighbor]:
+					side_tentative[neighbor] = candidate
+					side_preds[neighbor] = (node, arc)
+					heapq.heappush(side_heap, (candidate, neighbor))
+
+		if meeting is None:
+			raise nx.NetworkXNoPath('No path between the given nodes.')
+
+		upward_steps = []
+		node = meeting
+		while preds[0][node] is not None:
+			previous, arc = preds[0][node]
+			upward_steps.append((arc, previous))
+			node = previous
+		path = [node]
+		for arc, from_node in reversed(upward_steps):
+			path.extend(self._arc_path(arc, from_node, metric)[1:])
+
+		node = meeting
+		while preds[1][node] is not None:
+			previous, arc = preds[1][node]
+			path.extend(self._arc_path(arc, node, metric)[1:])
+			node = previous
+		return path, best
+
+	def _arc_path(self, arc: int, from_node: int, metric: CCHMetric) -> list:
+		"""Unpacks an arc traversed from from_node into the graph's nodes, both ends included."""
+		path = [from_node]
+		stack = [(arc, from_node)]
+		while stack:
+			arc, from_node = stack.pop()
+			tail = self.arc_tails[arc]
+			to_node = self.arc_heads[arc] if from_node == tail else tail
+			middle = metric.arc_middles[arc]
+			if middle is None:
+				path.append(to_node)
+				continue
+			stack.append((self._arc_index[middle, to_node], middle))
+			stack.append((self._arc_index[middle, from_node], from_node))
+		return path
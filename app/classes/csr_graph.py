@@ -0,0 +1,405 @@
+from collections import defaultdict
+from heapq import heappop, heappush
+from itertools import count
+
+import numpy as np
+
+
+class CSRGraph:
+	def __init__(
+		self,
+		node_ids: list,
+		offsets: np.ndarray,
+		neighbors: np.ndarray,
+		weights: np.ndarray,
+		edge_arcs: np.ndarray,
+		coordinates: np.ndarray | None = None,
+	):
+		"""
+		A compact, array-backed undirected graph in compressed sparse row form.
+
+		Args:
+		    node_ids (list): The node ID for every integer node index.
+		    offsets (np.ndarray): int64 array of length n + 1; the arcs of node i are
+		                          offsets[i]:offsets[i + 1].
+		    neighbors (np.ndarray): int64 array with the head node index of every arc.
+		    weights (np.ndarray): float64 array with the weight of every arc.
+		    edge_arcs (np.ndarray): int64 array of shape (edges, 2) with the two arcs
+		                            that make up each undirected edge.
+		    coordinates (np.ndarray, optional): float64 array of shape (n, 2) with the
+		                                        (longitude, latitude) of every node.
+		"""
+		self.node_ids = node_ids
+		self.node_index = {node_id: index for index, node_id in enumerate(node_ids)}
+		self.offsets = offsets
+		self.neighbors = neighbors
+		self.weights = weights
+		self.edge_arcs = edge_arcs
+		self.coordinates = coordinates
+
+	@classmethod
+	def from_index_edges(cls, node_ids: list, first, second, weights, coordinates=None):
+		"""
+		Builds a CSRGraph from edge endpoint arrays without any per-edge Python work.
+		The arcs of every node are stored in edge order, which is the neighbor order a
+		networkx graph gets when the same edges are added one after another.
+
+		Args:
+		    node_ids (list): All node IDs; their position becomes the node index.
+		    first (array-like): Node index of one end of every edge.
+		    second (array-like): Node index of the other end of every edge.
+		    weights (array-like): The weight of every edge.
+		    coordinates (array-like, optional): (longitude, latitude) per node.
+
+		Returns:
+		    CSRGraph: The compact graph; edge indices are positions in the input arrays.
+		"""
+		first = np.asarray(first, dtype=np.int64)
+		second = np.asarray(second, dtype=np.int64)
+		weights = np.asarray(weights, dtype=np.float64)
+		edge_count = len(first)
+
+		tails = np.concatenate((first, second))
+		arc_edges = np.tile(np.arange(edge_count, dtype=np.int64), 2)
+		order = np.lexsort((arc_edges, tails))
+
+		offsets = np.zeros(len(node_ids) + 1, dtype=np.int64)
+		np.cumsum(np.bincount(tails, minlength=len(node_ids)), out=offsets[1:])
+		neighbors = np.concatenate((second, first))[order]
+		arc_weights = np.concatenate((weights, weights))[order]
+
+		arc_positions = np.empty(2 * edge_count, dtype=np.int64)
+		arc_positions[order] = np.arange(2 * edge_count, dtype=np.int64)
+		edge_arcs = np.stack((arc_positions[:edge_count], arc_positions[edge_count:]), axis=1)
+
+		if coordinates is not None:
+			coordinates = np.asarray(coordinates, dtype=np.float64).reshape(len(node_ids), 2)
+		return cls(node_ids, offsets, neighbors, arc_weights, edge_arcs, coordinates)
+
+	@property
+	def node_count(self) -> int:
+		return len(self.node_ids)
+
+	def euclidean_lower_bounds(self, positions, scale: float) -> np.ndarray:
+		"""
+		Computes, for every node, scale times the Euclidean distance to the nearest of
+		the given positions. Used as an A* heuristic.
+
+		Args:
+		    positions (array-like): (longitude, latitude) pairs of the goal.
+		    scale (float): Lower bound on edge weight per unit of distance.
+
+		Returns:
+		    np.ndarray: float64 array with one bound per node.
+		"""
+		positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+		if self.coordinates is None or len(positions) == 0 or scale <= 0:
+			return np.zeros(self.node_count, dtype=np.float64)
+
+		dx = self.coordinates[:, 0, None] - positions[None, :, 0]
+		dy = self.coordinates[:, 1, None] - positions[None, :, 1]
+		return np.hypot(dx, dy).min(axis=1) * scale
+
+	def with_weights(self, weights: np.ndarray) -> 'CSRGraph':
+		"""
+		Returns a CSRGraph that shares this graph's structure but reads its arc
+		weights from the given array.
+		"""
+		graph = CSRGraph.__new__(CSRGraph)
+		graph.__dict__.update(self.__dict__)
+		graph.weights = weights
+		return graph
+
+	def dijkstra(
+		self,
+		source: int,
+		targets=None,
+		extra_arcs: dict | None = None,
+		cutoff: float | None = None,
+	):
+		"""
+		Heap-based Dijkstra over the CSR arrays. Neighbors are relaxed in stored arc
+		order and ties are broken by insertion order, matching networkx.
+
+		Args:
+		    source (int): Index of the start node.
+		    targets (iterable, optional): Node indices; the search stops as soon as all
+		                                  of them are settled. Runs to completion if None.
+		    extra_arcs (dict, optional): Mapping {node_index: [(neighbor_index, weight)]}
+		                                 with arcs that are not stored in the arrays,
+		                                 relaxed after the stored arcs of that node.
+		    cutoff (float, optional): Nodes farther than cutoff are not settled; the
+		                              search ends once the frontier exceeds it.
+
+		Returns:
+		    tuple: (dist, pred) dictionaries keyed by node index with the final distance
+		           and the predecessor on the shortest path (None for the source).
+		"""
+		offsets = memoryview(self.offsets)
+		neighbors = memoryview(self.neighbors)
+		weights = memoryview(self.weights)
+		stored_nodes = self.node_count
+		extra_arcs = extra_arcs or {}
+		remaining_targets = set(targets) if targets is not None else None
+		cutoff = float('inf') if cutoff is None else cutoff
+
+		dist = {}
+		seen = {source: 0}
+		pred = {source: None}
+		counter = count()
+		fringe = [(0, next(counter), source)]
+
+		while fringe:
+			d, _, v = heappop(fringe)
+			if v in dist:
+				continue
+			if d > cutoff:
+				break
+			dist[v] = d
+			if remaining_targets is not None:
+				remaining_targets.discard(v)
+				if not remaining_targets:
+					break
+
+			if v < stored_nodes:
+				for arc in range(offsets[v], offsets[v + 1]):
+					u = neighbors[arc]
+					vu_dist = d + weights[arc]
+					if u not in dist and (u not in seen or vu_dist < seen[u]):
+						seen[u] = vu_dist
+						heappush(fringe, (vu_dist, next(counter), u))
+						pred[u] = v
+
+			for u, weight in extra_arcs.get(v, ()):
+				vu_dist = d + weight
+				if u not in dist and (u not in seen or vu_dist < seen[u]):
+					seen[u] = vu_dist
+					heappush(fringe, (vu_dist, next(counter), u))
+					pred[u] = v
+
+		return dist, pred
+
+	def time_dependent_dijkstra(
+		self,
+		source: int,
+		arc_weight_table: np.ndarray,
+		bucket_seconds: float,
+		seconds_per_weight: float,
+		targets=None,
+		extra_arcs: dict | None = None,
+		departure: float = 0.0,
+	):
+		"""
+		Dijkstra over the CSR arrays with weights that change over time. The weight of
+		an arc is read at the time the search reaches its tail: arc_weight_table holds
+		one column per time bucket and the weight is interpolated linearly between the
+		starts of consecutive buckets (the last column holds from its start on). Travel
+		time is the weight times seconds_per_weight and the search starts at departure.
+		The result is exact as long as leaving later never arrives earlier, which the
+		interpolation keeps for any forecast that does not change faster than time
+		passes.
+
+		Args:
+		    source (int): Index of the start node.
+		    arc_weight_table (np.ndarray): float64 array of shape (arcs, buckets).
+		    bucket_seconds (float): Length of one bucket.
+		    seconds_per_weight (float): Travel seconds per unit of weight.
+		    targets (iterable, optional): As in dijkstra().
+		    extra_arcs (dict, optional): Arcs with constant weights, as in dijkstra().
+		    departure (float): Seconds after the start of the first bucket.
+
+		Returns:
+		    tuple: (dist, pred) as in dijkstra(); dist holds the summed weights, so
+		           the arrival time at a node is departure + dist * seconds_per_weight.
+		"""
+		offsets = memoryview(self.offsets)
+		neighbors = memoryview(self.neighbors)
+		bucket_count = arc_weight_table.shape[1]
+		table = memoryview(np.ascontiguousarray(arc_weight_table, dtype=np.float64).ravel())
+		last_bucket = bucket_count - 1
+		bucket_weight = seconds_per_weight / bucket_seconds
+		departure_position = departure / bucket_seconds
+		stored_nodes = self.node_count
+		extra_arcs = extra_arcs or {}
+		remaining_targets = set(targets) if targets is not None else None
+
+		dist = {}
+		seen = {source: 0}
+		pred = {source: None}
+		counter = count()
+		fringe = [(0, next(counter), source)]
+
+		while fringe:
+			d, _, v = heappop(fringe)
+			if v in dist:
+				continue
+			dist[v] = d
+			if remaining_targets is not None:
+				remaining_targets.discard(v)
+				if not remaining_targets:
+					break
+
+			if v < stored_nodes:
+				position = departure_position + d * bucket_weight
+				bucket = int(position)
+				if bucket >= last_bucket:
+					bucket, fraction = last_bucket, 0.0
+				else:
+					fraction = position - bucket
+				for arc in range(offsets[v], offsets[v + 1]):
+					u = neighbors[arc]
+					row = arc * bucket_count + bucket
+					weight = table[row]
+					if fraction:
+						weight += (table[row + 1] - weight) * fraction
+					vu_dist = d + weight
+					if u not in dist and (u not in seen or vu_dist < seen[u]):
+						seen[u] = vu_dist
+						heappush(fringe, (vu_dist, next(counter), u))
+						pred[u] = v
+
+			for u, weight in extra_arcs.get(v, ()):
+				vu_dist = d + weight
+				if u not in dist and (u not in seen or vu_dist < seen[u]):
+					seen[u] = vu_dist
+					heappush(fringe, (vu_dist, next(counter), u))
+					pred[u] = v
+
+		return dist, pred
+
+	def _arc_reader(self, extra_arcs: dict):
+		"""
+		Returns a function that lists (neighbor_index, weight) for the stored and the
+		extra arcs of a node, reading the arrays through memoryviews.
+		"""
+		offsets = memoryview(self.offsets)
+		neighbors = memoryview(self.neighbors)
+		weights = memoryview(self.weights)
+		stored_nodes = self.node_count
+
+		def arcs(v: int) -> list:
+			result = []
+			if v < stored_nodes:
+				result = [
+					(neighbors[arc], weights[arc]) for arc in range(offsets[v], offsets[v + 1])
+				]
+			result.extend(extra_arcs.get(v, ()))
+			return result
+
+		return arcs
+
+	def astar(self, source: int, target: int, heuristic, extra_arcs: dict | None = None):
+		"""
+		A* search over the CSR arrays. Nodes may be expanded again when a cheaper
+		path to them is found, so an admissible heuristic is enough for an optimal result.
+
+		Args:
+		    source (int): Index of the start node.
+		    target (int): Index of the goal node.
+		    heuristic (callable): Maps a node index to a lower bound of its distance to target.
+		    extra_arcs (dict, optional): Additional arcs, as in dijkstra().
+
+		Returns:
+		    tuple: (dist, pred) where dist holds the distance to target if it was reached
+		           and pred the predecessors along the found path.
+		"""
+		arcs = self._arc_reader(extra_arcs or {})
+		counter = count()
+		fringe = [(0, next(counter), source, 0, None)]
+		enqueued = {}
+		explored = {}
+
+		while fringe:
+			_, _, v, g, parent = heappop(fringe)
+			if v == target:
+				explored[v] = parent
+				return {target: g}, explored
+			if v in explored:
+				if explored[v] is None:
+					continue
+				queued_g, _ = enqueued[v]
+				if queued_g < g:
+					continue
+			explored[v] = parent
+
+			for u, weight in arcs(v):
+				ug = g + weight
+				if u in enqueued:
+					queued_g, h = enqueued[u]
+					if queued_g <= ug:
+						continue
+				else:
+					h = heuristic(u)
+				enqueued[u] = ug, h
+				heappush(fringe, (ug + h, next(counter), u, ug, v))
+
+		return {}, explored
+
+	def bidirectional_dijkstra(self, source: int, target: int, extra_arcs: dict | None = None):
+		"""
+		Dijkstra run from both ends at once, stopping when the two frontiers can no
+		longer improve the best meeting point. Stored arcs are undirected, so both
+		directions use the same adjacency; extra arcs may be directed and are followed
+		reversed by the search from target.
+
+		Returns:
+		    tuple: (distance, path) with the node indices of the path, or (None, [])
+		           if target is unreachable.
+		"""
+		if source == target:
+			return 0, [source]
+
+		extra_arcs = extra_arcs or {}
+		reverse_arcs = defaultdict(list)
+		for v, node_arcs in extra_arcs.items():
+			for u, weight in node_arcs:
+				reverse_arcs[u].append((v, weight))
+		arc_readers = (self._arc_reader(extra_arcs), self._arc_reader(reverse_arcs))
+		counter = count()
+		dists = ({}, {})
+		seens = ({source: 0}, {target: 0})
+		preds = ({source: None}, {target: None})
+		fringes = ([(0, next(counter), source)], [(0, next(counter), target)])
+		best_distance = None
+		meeting_node = None
+		direction = 1
+
+		while fringes[0] and fringes[1]:
+			direction = 1 - direction
+			d, _, v = heappop(fringes[direction])
+			dist, other_dist = dists[direction], dists[1 - direction]
+			if v in dist:
+				continue
+			dist[v] = d
+			if v in other_dist:
+				break
+
+			seen = seens[direction]
+			for u, weight in arc_readers[direction](v):
+				vu_dist = d + weight
+				if u in dist:
+					continue
+				if u not in seen or vu_dist < seen[u]:
+					seen[u] = vu_dist
+					heappush(fringes[direction], (vu_dist, next(counter), u))
+					preds[direction][u] = v
+					if u in seens[1 - direction]:
+						total = vu_dist + seens[1 - direction][u]
+						if best_distance is None or total < best_distance:
+							best_distance = total
+							meeting_node = u
+
+		if meeting_node is None:
+			return None, []
+
+		path = []
+		node = meeting_node
+		while node is not None:
+			path.append(node)
+			node = preds[0][node]
+		path.reverse()
+		node = preds[1][meeting_node]
+		while node is not None:
+			path.append(node)
+			node = preds[1][node]
+		return best_distance, path
@@ -0,0 +1,226 @@
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+
+import networkx as nx
+
+from .weight_snapshot import WeightSnapshot
+
+
+class FloorOverlay:
+	__slots__ = ('version', 'floor_weights', 'cliques')
+
+	def __init__(self, version: int, floor_weights: dict, cliques: dict):
+		"""
+		The connector-to-connector distances of every floor for one weights version.
+
+		Args:
+		    version (int): The WeightSnapshot version the distances were computed for.
+		    floor_weights (dict): {floor: tuple of the floor's edge weights}, used to
+		                          reuse unchanged floors for the next version.
+		    cliques (dict): {floor: {connector_id: [(connector_id, distance)]}} with the
+		                    shortest distance between connectors within the floor.
+		"""
+		self.version = version
+		self.floor_weights = floor_weights
+		self.cliques = cliques
+
+
+class FloorHierarchy:
+	def __init__(self, edge_factors: list, room_floors: dict, vertical_sensor_ids=()):
+		"""
+		Splits a SensorGraph into one subgraph per floor and an overlay graph over the
+		vertical connectors, the sensors whose edges reach more than one floor (stairs,
+		elevators) plus sensors flagged is_vertical. The overlay stores the shortest
+		distance between every two connectors of a floor within that floor, so a
+		search only has to explore the floors of its end points and hops across every
+		other floor through the overlay. Distances are exact.
+
+		Args:
+		    edge_factors (list): SensorGraph._edge_factors, one tuple per edge index.
+		    room_floors (dict): Mapping {room_id: floor}.
+		    vertical_sensor_ids (iterable): Sensors flagged as vertical connectors.
+		"""
+		# {floor: {sensor_id: [(neighbor_id, edge_index)]}}
+		self.cells = defaultdict(lambda: defaultdict(list))
+		self.floor_edges = defaultdict(list)
+		self.node_floors = defaultdict(set)
+		for edge_index, (sensor1_id, sensor2_id, room_id, _, _) in enumerate(edge_factors):
+			floor = room_floors[room_id]
+			cell = self.cells[floor]
+			cell[sensor1_id].append((sensor2_id, edge_index))
+			cell[sensor2_id].append((sensor1_id, edge_index))
+			self.floor_edges[floor].append(edge_index)
+			self.node_floors[sensor1_id].add(floor)
+			self.node_floors[sensor2_id].add(floor)
+
+		vertical_sensor_ids = set(vertical_sensor_ids)
+		self.connectors = defaultdict(list)
+		for sensor_id, floors in self.node_floors.items():
+			if len(floors) > 1 or sensor_id in vertical_sensor_ids:
+				for floor in floors:
+					self.connectors[floor].append(sensor_id)
+
+		self._overlay = None
+		self._lock = threading.Lock()
+
+	def current_overlay(self, weights: WeightSnapshot) -> FloorOverlay | None:
+		"""Returns the kept overlay if it was computed for the given weights, else None."""
+		overlay = self._overlay
+		if overlay is None or overlay.version != weights.version:
+			return None
+		return overlay
+
+	def update_overlay(self, weights: WeightSnapshot) -> FloorOverlay:
+		"""
+		Computes the overlay for the given weights and keeps it unless a newer one is
+		kept already. Only the floors whose edge weights changed since the kept overlay
+		are recomputed.
+		"""
+		with self._lock:
+			previous = self._overlay
+			if previous is not None and previous.version == weights.version:
+				return previous
+
+			edge_weights = weights.edge_weights
+			floor_weights = {}
+			cliques = {}
+			for floor, edge_indices in self.floor_edges.items():
+				floor_weights[floor] = tuple(edge_weights[index] for index in edge_indices)
+				if previous is not None and previous.floor_weights[floor] == floor_weights[floor]:
+					cliques[floor] = previous.cliques[floor]
+				else:
+					cliques[floor] = self._floor_clique(floor, edge_weights)
+
+			overlay = FloorOverlay(weights.version, floor_weights, cliques)
+			if previous is None or previous.version < overlay.version:
+				self._overlay = overlay
+			return overlay
+
+	def _floor_clique(self, floor, edge_weights: list) -> dict:
+		connectors = self.connectors.get(floor, [])
+		connector_set = set(connectors)
+		clique = {}
+		for connector_id in connectors:
+			dist, _ = self.cell_search(floor, connector_id, edge_weights, connector_set)
+			clique[connector_id] = [
+				(other_id, dist[other_id])
+				for other_id in connectors
+				if other_id != connector_id and other_id in dist
+			]
+		return clique
+
+	def cell_search(self, floor, source, edge_weights: list, targets=None) -> tuple:
+		"""
+		Dijkstra search restricted to one floor's subgraph.
+
+		Returns:
+		    tuple: (dist, pred) dicts of the settled nodes. The search stops once every
+		           node in targets is settled.
+		"""
+		cell = self.cells[floor]
+		remaining = set(targets) if targets is not None else None
+		dist = {}
+		pred = {source: None}
+		best = {source: 0.0}
+		counter = itertools.count()
+		heap = [(0.0, next(counter), source)]
+		while heap:
+			distance, _, node_id = heapq.heappop(heap)
+			if node_id in dist:
+				continue
+			dist[node_id] = distance
+			if remaining is not None:
+				remaining.discard(node_id)
+				if not remaining:
+					break
+			for neighbor_id, edge_index in cell.get(node_id, ()):
+				candidate = distance + edge_weights[edge_index]
+				if neighbor_id not in dist and candidate < best.get(neighbor_id, float('inf')):
+					best[neighbor_id] = candidate
+					pred[neighbor_id] = node_id
+					heapq.heappush(heap, (candidate, next(counter), neighbor_id))
+		return dist, pred
+
+	def shortest_path(
+		self,
+		source,
+		target,
+		local_floors: set,
+		extra_arcs: dict,
+		weights: WeightSnapshot,
+		overlay: FloorOverlay,
+	) -> list:
+		"""
+		Searches the subgraphs of local_floors together with the overlay of every other
+		floor, then expands overlay hops into their paths within the floor.
+
+		Args:
+		    source: Source node ID (sensor or attached room).
+		    target: Target node ID (sensor or attached room).
+		    local_floors (set): Floors searched edge by edge; must contain the floors of
+		                        source, target and every node in extra_arcs.
+		    extra_arcs (dict): {node_id: [neighbor_id]} zero-weight arcs of attached rooms.
+		    weights (WeightSnapshot): The weights to search with.
+		    overlay (FloorOverlay): The overlay computed for weights.
+
+		Returns:
+		    list: The node IDs of a shortest path from source to target.
+
+		Raises:
+		    nx.NetworkXNoPath: If target cannot be reached.
+		"""
+		edge_weights = weights.edge_weights
+		cliques = overlay.cliques
+		cells = [self.cells[floor] for floor in local_floors if floor in self.cells]
+
+		settled = set()
+		best = {source: 0.0}
+		pred = {source: None}
+		counter = itertools.count()
+		heap = [(0.0, next(counter), source)]
+		while heap:
+			distance, _, node_id = heapq.heappop(heap)
+			if node_id in settled:
+				continue
+			settled.add(node_id)
+			if node_id == target:
+				break
+
+			arcs = [(neighbor_id, 0.0, None) for neighbor_id in extra_arcs.get(node_id, ())]
+			for cell in cells:
+				arcs.extend(
+					(neighbor_id, edge_weights[edge_index], None)
+					for neighbor_id, edge_index in cell.get(node_id, ())
+				)
+			for floor in self.node_floors.get(node_id, ()):
+				if floor not in local_floors:
+					arcs.extend(
+						(neighbor_id, hop_distance, floor)
+						for neighbor_id, hop_distance in cliques[floor].get(node_id, ())
+					)
+
+			for neighbor_id, arc_weight, floor in arcs:
+				candidate = distance + arc_weight
+				if neighbor_id not in settled and candidate < best.get(neighbor_id, float('inf')):
+					best[neighbor_id] = candidate
+					pred[neighbor_id] = (node_id, floor)
+					heapq.heappush(heap, (candidate, next(counter), neighbor_id))
+
+		if target not in settled:
+			raise nx.NetworkXNoPath(f'Node {target} not reachable from {source}')
+
+		reversed_path = [target]
+		node_id = target
+		while pred[node_id] is not None:
+			previous_id, floor = pred[node_id]
+			if floor is not None:
+				_, cell_pred = self.cell_search(floor, previous_id, edge_weights, {node_id})
+				step = cell_pred[node_id]
+				while step != previous_id:
+					reversed_path.append(step)
+					step = cell_pred[step]
+			reversed_path.append(previous_id)
+			node_id = previous_id
+		return reversed_path[::-1]
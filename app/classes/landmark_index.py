@@ -0,0 +1,89 @@
+import numpy as np
+
+from .csr_graph import CSRGraph
+from .weight_snapshot import WeightSnapshot
+
+
+class LandmarkIndex:
+	def __init__(self, csr_graph: CSRGraph, baseline_weights, landmark_count: int = 16):
+		"""
+		ALT lower bounds: graph distances from a few landmark sensors, computed with
+		free-flow baseline edge weights. By the triangle inequality |d(L, t) - d(L, v)|
+		is a lower bound on the distance from v to t for any weights at or above the
+		baseline. For other weights the bound is scaled by bound_scale(), the smallest
+		ratio of current to baseline weight, so the index only depends on the topology
+		and is never rebuilt for occupancy changes. The graph is undirected, so
+		distances to and from a landmark are the same and are stored once.
+
+		Args:
+		    csr_graph (CSRGraph): The graph to index.
+		    baseline_weights (array-like): Baseline weight per edge, in edge order.
+		    landmark_count (int): Number of landmarks, chosen by farthest-point selection.
+		"""
+		self.baseline_weights = np.asarray(baseline_weights, dtype=np.float64)
+		baseline_arc_weights = np.empty(len(csr_graph.neighbors), dtype=np.float64)
+		baseline_arc_weights[csr_graph.edge_arcs[:, 0]] = self.baseline_weights
+		baseline_arc_weights[csr_graph.edge_arcs[:, 1]] = self.baseline_weights
+		baseline_graph = csr_graph.with_weights(baseline_arc_weights)
+
+		node_count = csr_graph.node_count
+		landmarks = []
+		rows = []
+		# The first landmark is the node farthest from node 0, then the node farthest
+		# from every chosen landmark; unreached nodes (other components) come first.
+		farthest = self._distances(baseline_graph, 0) if node_count else None
+		nearest = np.full(node_count, np.inf)
+		while node_count and len(landmarks) < min(landmark_count, node_count):
+			candidates = farthest if not landmarks else nearest
+			candidates = np.where(np.isinf(candidates), np.finfo(np.float64).max, candidates)
+			candidates[landmarks] = -1.0
+			landmark = int(np.argmax(candidates))
+			row = self._distances(baseline_graph, landmark)
+			landmarks.append(landmark)
+			rows.append(row)
+			nearest = np.minimum(nearest, row)
+
+		self.landmarks = np.asarray(landmarks, dtype=np.int64)
+		self.distances = np.asarray(rows, dtype=np.float64).reshape(len(landmarks), node_count)
+		self._scale = (None, 0.0)
+
+	@staticmethod
+	def _distances(graph: CSRGraph, source: int) -> np.ndarray:
+		dist, _ = graph.dijkstra(source)
+		row = np.full(graph.node_count, np.inf)
+		row[list(dist)] = list(dist.values())
+		return row
+
+	def bound_scale(self, weights: WeightSnapshot) -> float:
+		"""
+		Returns the largest s with weight >= s * baseline for every edge of the
+		snapshot; lower_bounds() times s bounds the distances of these weights.
+		It is 1.0 while any room is empty and grows as every room gets crowded.
+		"""
+		version, scale = self._scale
+		if version == weights.version:
+			return scale
+		edge_weights = np.asarray(weights.edge_weights[:-1], dtype=np.float64)
+		positive = self.baseline_weights > 0
+		ratios = edge_weights[positive] / self.baseline_weights[positive]
+		scale = max(float(ratios.min()), 0.0) if len(ratios) else 0.0
+		self._scale = (weights.version, scale)
+		return scale
+
+	def lower_bounds(self, target_indices: list) -> np.ndarray:
+		"""
+		Returns, for every node, a lower bound on its baseline distance to the nearest
+		of the target nodes. Landmarks that cannot reach a node or target give no bound.
+		"""
+		node_count = self.distances.shape[1]
+		if not len(self.landmarks) or not target_indices:
+			return np.zeros(node_count, dtype=np.float64)
+
+		bounds = np.full(node_count, np.inf)
+		for target in target_indices:
+			to_target = self.distances[:, target, None]
+			with np.errstate(invalid='ignore'):
+				differences = np.abs(self.distances - to_target)
+			differences[~np.isfinite(differences)] = 0.0
+			bounds = np.minimum(bounds, differences.max(axis=0))
+		return bounds
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import numpy as np
+
+# Length of one forecast time bucket in seconds.
+DEFAULT_BUCKET_SECONDS = 300.0
+# Number of forecast buckets; with the default length they cover one hour.
+DEFAULT_BUCKET_COUNT = 12
+
+
+class OccupancyForecast:
+	def __init__(
+		self,
+		room_ids: list,
+		occupants,
+		popularity_factors,
+		bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+		bucket_count: int = DEFAULT_BUCKET_COUNT,
+		level_smoothing: float = 0.5,
+		trend_smoothing: float = 0.3,
+		timestamp: float | None = None,
+	):
+		"""
+		A short occupancy forecast for every room of a building, kept with Holt's
+		linear exponential smoothing: a smoothed level per room, updated from every
+		occupancy observation, and a trend (occupants per bucket) updated from the
+		level change once at least a bucket has passed, so bursts of updates do not
+		read as steep trends. Rooms without history start with the trend their
+		popularity_factor suggests: the room is expected to reach popularity_factor
+		times its current occupants by the end of the forecast (1.0 keeps it as is).
+		Observations and forecasts are computed for all rooms at once with NumPy.
+
+		Args:
+		    room_ids (list): The rooms, in the row order of forecast().
+		    occupants (array-like): Current occupants per room.
+		    popularity_factors (array-like): Popularity factor per room.
+		    bucket_seconds (float): Length of one forecast bucket.
+		    bucket_count (int): Number of forecast buckets.
+		    level_smoothing (float): Weight of a new observation in the level (0..1].
+		    trend_smoothing (float): Weight of the latest level change in the trend (0..1].
+		    timestamp (float, optional): time.monotonic() of the initial occupants.
+		"""
+		self.room_ids = list(room_ids)
+		self.room_index = {room_id: index for index, room_id in enumerate(self.room_ids)}
+		self.bucket_seconds = bucket_seconds
+		self.bucket_count = bucket_count
+		self.level_smoothing = level_smoothing
+		self.trend_smoothing = trend_smoothing
+
+		now = time.monotonic() if timestamp is None else timestamp
+		self.observed = np.asarray(occupants, dtype=np.float64).copy()
+		self.level = self.observed.copy()
+		popularity = np.asarray(popularity_factors, dtype=np.float64)
+		self.trend = self.observed * (popularity - 1) / max(bucket_count, 1)
+		self.observed_at = np.full(len(self.room_ids), now, dtype=np.float64)
+		# Level and time of the last trend update.
+		self.anchor_level = self.level.copy()
+		self.anchor_at = self.observed_at.copy()
+		self._lock = threading.Lock()
+
+	def observe(self, occupancy: dict, timestamp: float | None = None):
+		"""
+		Updates level and trend of the observed rooms. Unknown room IDs are ignored.
+
+		Args:
+		    occupancy (dict): Mapping {room_id: occupants}.
+		    timestamp (float, optional): time.monotonic() of the observation.
+		"""
+		now = time.monotonic() if timestamp is None else timestamp
+		observed = [
+			(self.room_index[room_id], occupants)
+			for room_id, occupants in occupancy.items()
+			if room_id in self.room_index
+		]
+		if not observed:
+			return
+		indices = np.fromiter((index for index, _ in observed), dtype=np.int64)
+		values = np.fromiter((occupants for _, occupants in observed), dtype=np.float64)
+
+		with self._lock:
+			elapsed = np.maximum(now - self.observed_at[indices], 0.0) / self.bucket_seconds
+			trend = self.trend[indices]
+			new_level = self.level_smoothing * values + (1 - self.level_smoothing) * (
+				self.level[indices] + trend * elapsed
+			)
+			self.level[indices] = new_level
+			self.observed[indices] = values
+			self.observed_at[indices] = now
+
+			anchor_elapsed = (now - self.anchor_at[indices]) / self.bucket_seconds
+			stepped = anchor_elapsed >= 1
+			if np.any(stepped):
+				indices, new_level = indices[stepped], new_level[stepped]
+				slope = (new_level - self.anchor_level[indices]) / anchor_elapsed[stepped]
+				self.trend[indices] = (
+					self.trend_smoothing * slope + (1 - self.trend_smoothing) * trend[stepped]
+				)
+				self.anchor_level[indices] = new_level
+				self.anchor_at[indices] = now
+
+	def forecast(self, timestamp: float | None = None) -> np.ndarray:
+		"""
+		Predicts the occupants of every room at the start of each bucket from timestamp
+		on: the last observed count extended by the trend, rounded to whole occupants
+		and never negative.
+
+		Returns:
+		    np.ndarray: float64 array of shape (rooms, bucket_count), rows in room_ids order.
+		"""
+		now = time.monotonic() if timestamp is None else timestamp
+		with self._lock:
+			elapsed = np.maximum(now - self.observed_at, 0.0) / self.bucket_seconds
+			steps = elapsed[:, None] + np.arange(self.bucket_count, dtype=np.float64)[None, :]
+			predicted = self.observed[:, None] + self.trend[:, None] * steps
+		return np.rint(np.maximum(predicted, 0.0))
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import Counter
+
+from .building_registry import BuildingNotFoundError, BuildingRegistry
+
+
+class OccupancyIngestor:
+	def __init__(self, registry: BuildingRegistry, window: float = 0.2):
+		"""
+		Collects occupancy events for registered buildings and applies them in batches.
+		Events only touch a pending dict; a background thread waits window seconds
+		after the first pending event, coalesces everything received meanwhile into
+		one occupancy value per room, and reweights each building's changed rooms at
+		once. Neither senders nor path queries wait for the graph's writers.
+
+		Args:
+		    registry (BuildingRegistry): The buildings the events belong to.
+		    window (float): Seconds over which events are coalesced before applying.
+		"""
+		self.registry = registry
+		self.window = window
+		# Counters: 'events', 'batches', 'rooms_applied', 'dropped', 'failed_batches'.
+		self.stats = Counter()
+		# {building_id: {room_id: [occupants or None, delta]}}
+		self._pending = {}
+		self._lock = threading.Lock()
+		self._wakeup = threading.Event()
+		self._thread = None
+		self._stopped = False
+
+	def record_count(self, building_id: str, room_id: str, occupants: int):
+		"""Sets a room's occupants; earlier passes in the same window are superseded."""
+		with self._lock:
+			self._pending.setdefault(building_id, {})[room_id] = [occupants, 0]
+			self.stats['events'] += 1
+		self._notify()
+
+	def record_pass(self, building_id: str, from_room: str | None, to_room: str | None):
+		"""Moves one person from from_room to to_room; None stands for outside the building."""
+		with self._lock:
+			rooms = self._pending.setdefault(building_id, {})
+			if from_room is not None:
+				rooms.setdefault(from_room, [None, 0])[1] -= 1
+			if to_room is not None:
+				rooms.setdefault(to_room, [None, 0])[1] += 1
+			self.stats['events'] += 1
+		self._notify()
+
+	def submit(self, building_id: str, event):
+		"""Records a RoomCountEvent or SensorPassEvent."""
+		if event.type == 'count':
+			self.record_count(building_id, event.room_id, event.occupants)
+		else:
+			self.record_pass(building_id, event.from_room, event.to_room)
+
+	def flush(self) -> int:
+		"""
+		Applies every pending event now. Rooms or buildings that are unknown are dropped.
+
+		Returns:
+		    int: The number of rooms whose occupancy was applied.
+		"""
+		with self._lock:
+			pending, self._pending = self._pending, {}
+
+		applied = 0
+		dropped = 0
+		for building_id, rooms in pending.items():
+			try:
+				topology = self.registry.get(building_id)
+			except BuildingNotFoundError:
+				dropped += len(rooms)
+				continue
+
+			with topology.write_lock:
+				occupancy = {}
+				for room_id, (occupants, delta) in rooms.items():
+					room = topology.room_mapping.get(room_id)
+					if room is None:
+						dropped += 1
+						continue
+					base = room.occupants if occupants is None else occupants
+					occupancy[room_id] = max(0, base + delta)
+				topology.update_occupancy(occupancy)
+			applied += len(occupancy)
+
+		with self._lock:
+			self.stats['dropped'] += dropped
+			if pending:
+				self.stats['batches'] += 1
+				self.stats['rooms_applied'] += applied
+		return applied
+
+	def stop(self):
+		"""Stops the background thread after applying the events still pending."""
+		self._stopped = True
+		self._wakeup.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+		self.flush()
+
+	def _notify(self):
+		if self._thread is None and not self._stopped:
+			with self._lock:
+				if self._thread is None:
+					self._thread = threading.Thread(
+						target=self._run, name='occupancy-ingestor', daemon=True
+					)
+					self._thread.start()
+		self._wakeup.set()
+
+	def _run(self):
+		while not self._stopped:
+			self._wakeup.wait()
+			if self._stopped:
+				break
+			time.sleep(self.window)
+			self._wakeup.clear()
+			try:
+				self.flush()
+			except Exception:
+				# A failing batch (for example an invalid room area) must not stop ingestion.
+				with self._lock:
+					self.stats['failed_batches'] += 1
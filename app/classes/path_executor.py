@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Pool types PathExecutor can run jobs on.
+EXECUTOR_KINDS = ('thread', 'process')
+
+
+class ExecutorBusyError(RuntimeError):
+	"""Raised when a job is rejected because the executor is saturated."""
+
+
+class PathExecutor:
+	def __init__(
+		self,
+		kind: str = 'thread',
+		max_workers: int = 4,
+		max_in_flight: int = 32,
+		queue_timeout: float = 5.0,
+	):
+		"""
+		Runs CPU-bound path computations on a bounded thread or process pool so that
+		async routes do not block the event loop while a graph is built or searched.
+
+		Args:
+		    kind (str): 'thread' or 'process'. Process pools need picklable jobs and
+		                keep one topology cache per worker process.
+		    max_workers (int): Number of jobs computed at the same time.
+		    max_in_flight (int): Jobs admitted at once (running plus waiting); further
+		                         jobs are rejected with ExecutorBusyError.
+		    queue_timeout (float): Seconds a job may wait for a free worker before it is
+		                           rejected with ExecutorBusyError.
+		"""
+		if kind not in EXECUTOR_KINDS:
+			raise ValueError(f"Unknown executor kind '{kind}'. Expected one of {EXECUTOR_KINDS}.")
+
+		self.kind = kind
+		self.max_workers = max_workers
+		self.max_in_flight = max_in_flight
+		self.queue_timeout = queue_timeout
+		self.in_flight = 0
+		self._pool = None
+		self._lock = threading.Lock()
+		# One semaphore of max_workers slots per event loop; asyncio primitives cannot
+		# be shared between loops.
+		self._loop_slots = weakref.WeakKeyDictionary()
+
+	def _get_pool(self):
+		"""Creates the pool on first use, so importing the module starts no workers."""
+		with self._lock:
+			if self._pool is None:
+				pool_class = ThreadPoolExecutor if self.kind == 'thread' else ProcessPoolExecutor
+				self._pool = pool_class(max_workers=self.max_workers)
+			return self._pool
+
+	def _slots(self, loop) -> asyncio.Semaphore:
+		"""The worker slots of an event loop, created on first use."""
+		with self._lock:
+			slots = self._loop_slots.get(loop)
+			if slots is None:
+				slots = self._loop_slots[loop] = asyncio.Semaphore(self.max_workers)
+			return slots
+
+	def _release(self, loop, slots: asyncio.Semaphore | None):
+		"""Ends a job's admission and frees its worker slot; safe from any thread."""
+		with self._lock:
+			self.in_flight -= 1
+		if slots is None:
+			return
+		try:
+			loop.call_soon_threadsafe(slots.release)
+		except RuntimeError:
+			# The loop is closed, and its slots with it.
+			pass
+
+	async def run(self, func, *args):
+		"""
+		Computes func(*args) on the pool and waits for it without blocking the loop.
+		A job is only submitted once a worker slot is free, so the wait for a worker
+		is bounded by queue_timeout. The slot and the admission are released when the
+		computation ends, even if the awaiting caller was cancelled before that.
+
+		Returns:
+		    The return value of func.
+
+		Raises:
+		    ExecutorBusyError: If max_in_flight jobs are already admitted, or no worker
+		                       became free within queue_timeout.
+		"""
+		with self._lock:
+			if self.in_flight >= self.max_in_flight:
+				raise ExecutorBusyError(
+					f'Too many path computations in progress (limit {self.max_in_flight}).'
+				)
+			self.in_flight += 1
+
+		loop = asyncio.get_running_loop()
+		slots = self._slots(loop)
+		try:
+			await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+		except asyncio.TimeoutError:
+			self._release(loop, None)
+			raise ExecutorBusyError(
+				f'Request waited more than {self.queue_timeout} seconds for a free solver.'
+			) from None
+		except BaseException:
+			self._release(loop, None)
+			raise
+
+		try:
+			future = self._get_pool().submit(func, *args)
+		except BaseException:
+			self._release(loop, slots)
+			raise
+		# Registered before wrap_future() so the slot is free once the caller resumes.
+		future.add_done_callback(lambda _: self._release(loop, slots))
+		return await asyncio.wrap_future(future)
+
+	def shutdown(self):
+		"""Stops the pool's workers after the jobs already submitted have finished."""
+		with self._lock:
+			pool, self._pool = self._pool, None
+		if pool is not None:
+			pool.shutdown(wait=True)
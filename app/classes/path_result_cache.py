@@ -0,0 +1,148 @@
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+
+from .weight_snapshot import WeightSnapshot
+
+
+class _CachedPath:
+	__slots__ = (
+		'graph_ref',
+		'version',
+		'edge_indices',
+		'edge_weights',
+		'path',
+		'distance',
+		'expires',
+	)
+
+	def __init__(self, graph_ref, version, edge_indices, edge_weights, path, distance, expires):
+		self.graph_ref = graph_ref
+		self.version = version
+		self.edge_indices = edge_indices
+		self.edge_weights = edge_weights
+		self.path = path
+		self.distance = distance
+		self.expires = expires
+
+
+class PathResultCache:
+	def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+		"""
+		A bounded cache of fastest-path results keyed by (topology key, source room,
+		target room, mode). Every entry remembers the graph and weights version it
+		was computed for, and the weights of the edges on its path. When the graph's
+		weights change, an entry stays valid as long as none of its own edges changed
+		and no edge anywhere got cheaper: more expensive edges elsewhere cannot make
+		another path shorter. Entries expire after ttl seconds, and the least recently
+		used entry is evicted beyond max_entries.
+
+		Args:
+		    max_entries (int): Maximum number of cached paths.
+		    ttl (float): Seconds after which an entry is recomputed regardless.
+		"""
+		self.max_entries = max_entries
+		self.ttl = ttl
+		# Counters: 'hits', 'misses', 'invalidated', 'expired', 'evicted'.
+		self.stats = Counter()
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key: tuple, sensor_graph, weights: WeightSnapshot) -> tuple | None:
+		"""
+		Returns the cached (path, distance) for key if it is still the fastest path
+		for the given weights of sensor_graph, otherwise None.
+
+		Args:
+		    key (tuple): (topology key, source room, target room, mode).
+		    sensor_graph (SensorGraph): The graph the query runs on.
+		    weights (WeightSnapshot): The weights the query reads.
+		"""
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self.stats['misses'] += 1
+				return None
+			if entry.expires <= time.monotonic():
+				self._drop(key, 'expired')
+				return None
+			if entry.graph_ref() is not sensor_graph:
+				self._drop(key, 'invalidated')
+				return None
+
+			if entry.version != weights.version:
+				if weights.version < entry.version:
+					# An older pinned version; the entry is kept for newer readers.
+					self.stats['misses'] += 1
+					return None
+				edge_weights = weights.edge_weights
+				if weights.decreased_version > entry.version or any(
+					edge_weights[edge_index] != weight
+					for edge_index, weight in zip(entry.edge_indices, entry.edge_weights)
+				):
+					self._drop(key, 'invalidated')
+					return None
+				entry.version = weights.version
+
+			self._entries.move_to_end(key)
+			self.stats['hits'] += 1
+			return entry.path, entry.distance
+
+	def put(
+		self,
+		key: tuple,
+		sensor_graph,
+		weights: WeightSnapshot,
+		path: list,
+		distance: float,
+		edge_indices: list,
+	):
+		"""
+		Stores a path computed with the given weights of sensor_graph.
+
+		Args:
+		    key (tuple): (topology key, source room, target room, mode).
+		    sensor_graph (SensorGraph): The graph the path was found on.
+		    weights (WeightSnapshot): The weights the path was computed with.
+		    path (list): The path's Sensor objects.
+		    distance (float): The path's distance.
+		    edge_indices (list): The path's edges, see SensorGraph.path_edge_indices().
+		"""
+		if self.max_entries <= 0:
+			return
+		entry = _CachedPath(
+			weakref.ref(sensor_graph),
+			weights.version,
+			tuple(edge_indices),
+			tuple(weights.edge_weights[edge_index] for edge_index in edge_indices),
+			path,
+			distance,
+			time.monotonic() + self.ttl,
+		)
+		with self._lock:
+			current = self._entries.get(key)
+			if (
+				current is not None
+				and current.graph_ref() is sensor_graph
+				and current.version > entry.version
+			):
+				return
+			self._entries[key] = entry
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+				self.stats['evicted'] += 1
+
+	def clear(self):
+		"""Removes every cached path; the counters are kept."""
+		with self._lock:
+			self._entries.clear()
+
+	def _drop(self, key: tuple, reason: str):
+		del self._entries[key]
+		self.stats[reason] += 1
+		self.stats['misses'] += 1
+
+	def __len__(self):
+		return len(self._entries)
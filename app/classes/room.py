@@ -1,4 +1,33 @@
+import numpy as np
+
+# Weight of a room without occupants; occupied rooms weigh at least 1 with a non-negative crowd factor.
+EMPTY_ROOM_WEIGHT = 0.01
+
+
+def room_weights(occupants, area, crowd_factor) -> np.ndarray:
+	"""
+	Computes Room.calculate_weight() element-wise for arrays of room fields, which
+	may have any broadcastable shapes (for example one column of forecast occupants
+	per time bucket).
+
+	Raises:
+	    ZeroDivisionError: If an occupied room has an area of 0.
+	"""
+	occupants, area, crowd_factor = np.broadcast_arrays(
+		np.asarray(occupants), np.asarray(area, dtype=np.float64), np.asarray(crowd_factor)
+	)
+	occupied = occupants != 0
+	if np.any(occupied & (area == 0)):
+		raise ZeroDivisionError('division by zero')
+
+	weights = np.full(occupants.shape, EMPTY_ROOM_WEIGHT, dtype=np.float64)
+	weights[occupied] = 1 + (occupants[occupied] / area[occupied] * crowd_factor[occupied])
+	return weights
+
+
 class Room:
+	__slots__ = ('id', 'name', 'crowd_factor', 'occupants', 'area', 'popularity_factor', 'floor')
+
 	def __init__(
 		self,
 		id: str,
@@ -22,10 +51,18 @@ class Room:
 		Calculates the weight of a room based on area, occupants, and crowd_factor.
 		"""
 		if self.occupants == 0:
-			return 0.01
+			return EMPTY_ROOM_WEIGHT
 
 		return 1 + (self.occupants / self.area * self.crowd_factor)
 
+	def copy(self) -> 'Room':
+		"""Returns a new Room with the same fields."""
+		return Room(*(getattr(self, field) for field in self.__slots__))
+
+	def to_dict(self) -> dict:
+		"""Returns the room's fields as a JSON-serializable dictionary."""
+		return {field: getattr(self, field) for field in self.__slots__}
+
 	@classmethod
 	def from_dict(cls, data: dict):
 		return cls(
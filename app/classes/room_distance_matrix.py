@@ -0,0 +1,214 @@
+import logging
+
+import numpy as np
+
+from .background_builder import BackgroundBuilder
+
+logger = logging.getLogger(__name__)
+
+# Default upper bound for the memory a distance matrix may use (256 MiB).
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class RoomDistanceMatrix:
+	def __init__(
+		self,
+		room_ids: list,
+		distances: np.ndarray,
+		entry_sensors: np.ndarray,
+		predecessors: np.ndarray,
+		sensor_ids: list,
+		weights_version: int,
+	):
+		"""
+		Precomputed room-to-room shortest distances and the data needed to rebuild
+		the sensor path between any two of the rooms.
+
+		Args:
+		    room_ids (list): The rooms covered; their position is the matrix index.
+		    distances (np.ndarray): float64 array (k, k); inf where no path exists.
+		    entry_sensors (np.ndarray): int32 array (k, k) with the sensor index at which
+		                                the path from room i first reaches room j.
+		    predecessors (np.ndarray): int32 array (k, sensors) with the next hop from each
+		                               sensor back towards room i (-1 at room i's sensors).
+		    sensor_ids (list): Sensor ID for every sensor index.
+		    weights_version (int): SensorGraph.weights_version the matrix was built for.
+		"""
+		self.room_ids = room_ids
+		self.room_index = {room_id: index for index, room_id in enumerate(room_ids)}
+		self.distances = distances
+		self.entry_sensors = entry_sensors
+		self.predecessors = predecessors
+		self.sensor_ids = sensor_ids
+		self.weights_version = weights_version
+
+	@staticmethod
+	def estimate_bytes(room_count: int, sensor_count: int) -> int:
+		"""Returns the memory needed by a matrix over room_count rooms."""
+		return room_count * room_count * (8 + 4) + room_count * sensor_count * 4
+
+	@classmethod
+	def build(cls, sensor_graph, room_ids=None, max_bytes: int = DEFAULT_MAX_BYTES):
+		"""
+		Runs one multi-source Dijkstra per room on the graph's CSR arrays.
+
+		Args:
+		    sensor_graph (SensorGraph): A built graph.
+		    room_ids (iterable, optional): Subset of rooms to cover. Defaults to all rooms.
+		    max_bytes (int): Refuse to build when the matrix would need more memory.
+
+		Returns:
+		    RoomDistanceMatrix: The matrix for the graph's weights at call time.
+
+		Raises:
+		    ValueError: If the matrix would exceed max_bytes.
+		"""
+		snapshot = sensor_graph.current_weights()
+		weights_version = snapshot.version
+		csr_graph = sensor_graph.get_csr_graph()
+		csr_graph = csr_graph.with_weights(snapshot.arc_weights(csr_graph))
+		room_sensors = sensor_graph.room_sensor_indices(csr_graph)
+		if room_ids is None:
+			room_ids = list(room_sensors)
+		room_ids = [room_id for room_id in room_ids if room_sensors.get(room_id)]
+
+		sensor_count = csr_graph.node_count
+		room_count = len(room_ids)
+		required_bytes = cls.estimate_bytes(room_count, sensor_count)
+		if required_bytes > max_bytes:
+			raise ValueError(
+				f'Distance matrix for {room_count} rooms needs {required_bytes} bytes, '
+				f'more than the limit of {max_bytes}.'
+			)
+
+		group_sizes = [len(room_sensors[room_id]) for room_id in room_ids]
+		flat_sensors = np.fromiter(
+			(index for room_id in room_ids for index in room_sensors[room_id]),
+			dtype=np.int64,
+			count=sum(group_sizes),
+		)
+		group_ids = np.repeat(np.arange(room_count), group_sizes)
+		group_starts = np.cumsum([0] + group_sizes[:-1]).astype(np.int64)
+
+		distances = np.full((room_count, room_count), np.inf, dtype=np.float64)
+		entry_sensors = np.full((room_count, room_count), -1, dtype=np.int32)
+		predecessors = np.full((room_count, sensor_count), -1, dtype=np.int32)
+
+		virtual_source = sensor_count
+		for row, room_id in enumerate(room_ids):
+			seeds = [(sensor_index, 0) for sensor_index in room_sensors[room_id]]
+			dist, pred = csr_graph.dijkstra(virtual_source, None, {virtual_source: seeds})
+
+			reached = [index for index in dist if index < sensor_count]
+			sensor_dist = np.full(sensor_count, np.inf, dtype=np.float64)
+			sensor_dist[reached] = [dist[index] for index in reached]
+			parents = [pred[index] for index in reached]
+			predecessors[row, reached] = [
+				-1 if parent == virtual_source else parent for parent in parents
+			]
+
+			group_dist = sensor_dist[flat_sensors]
+			# Sorting by (room, distance) puts each room's closest sensor at its group start.
+			order = np.lexsort((group_dist, group_ids))[group_starts]
+			distances[row] = group_dist[order]
+			entry_sensors[row] = flat_sensors[order]
+			distances[row, row] = 0.0
+
+		return cls(
+			room_ids, distances, entry_sensors, predecessors, csr_graph.node_ids, weights_version
+		)
+
+	def covers(self, room_ids) -> bool:
+		"""Returns True if every given room is part of the matrix."""
+		return all(room_id in self.room_index for room_id in room_ids)
+
+	def distance(self, source_room: str, target_room: str) -> float:
+		"""Returns the shortest distance between two covered rooms (inf if unreachable)."""
+		return float(self.distances[self.room_index[source_room], self.room_index[target_room]])
+
+	def path(self, source_room: str, target_room: str) -> list:
+		"""
+		Returns the sensor IDs on the shortest path from source_room to target_room,
+		starting at a sensor of source_room and ending at a sensor of target_room.
+		"""
+		row = self.room_index[source_room]
+		column = self.room_index[target_room]
+		if row == column or not np.isfinite(self.distances[row, column]):
+			return []
+
+		sensor_index = int(self.entry_sensors[row, column])
+
+		path = []
+		while sensor_index != -1:
+			path.append(self.sensor_ids[sensor_index])
+			sensor_index = int(self.predecessors[row, sensor_index])
+		path.reverse()
+		return path
+
+	def row(self, source_room: str) -> 'RoomDistanceRow':
+		"""Returns the distances and paths from source_room to every covered room."""
+		return RoomDistanceRow(self, source_room)
+
+
+class RoomDistanceRow:
+	def __init__(self, matrix: RoomDistanceMatrix, source_room: str):
+		"""
+		One row of a RoomDistanceMatrix with the same reaches/distance/path interface
+		as ShortestPathTree, so tours can use either interchangeably.
+		"""
+		self.matrix = matrix
+		self.source = source_room
+
+	def reaches(self, target_room: str) -> bool:
+		return np.isfinite(self.matrix.distance(self.source, target_room))
+
+	def distance(self, target_room: str) -> float:
+		return self.matrix.distance(self.source, target_room)
+
+	def path(self, target_room: str) -> list:
+		"""Returns [source_room, sensor IDs..., target_room] like a search over room nodes."""
+		return [self.source, *self.matrix.path(self.source, target_room), target_room]
+
+
+class DistanceMatrixBuilder(BackgroundBuilder):
+	def __init__(
+		self,
+		sensor_graph,
+		room_ids=None,
+		max_bytes: int = DEFAULT_MAX_BYTES,
+		background: bool = True,
+	):
+		"""
+		Keeps a RoomDistanceMatrix for a SensorGraph up to date. Rebuilds are
+		requested whenever the graph's weights change and run on a background
+		thread; requests arriving during a rebuild are coalesced into one more run.
+
+		Args:
+		    sensor_graph (SensorGraph): The graph to precompute distances for.
+		    room_ids (iterable, optional): Opt-in subset of rooms. Defaults to all rooms.
+		    max_bytes (int): Memory bound passed to RoomDistanceMatrix.build().
+		    background (bool): Rebuild on a daemon thread instead of the caller's thread.
+		"""
+		super().__init__(background=background)
+		self.sensor_graph = sensor_graph
+		self.room_ids = list(room_ids) if room_ids is not None else None
+		self.max_bytes = max_bytes
+		self.matrix = None
+
+	def current(self):
+		"""Returns the matrix if it matches the graph's current weights, else None."""
+		matrix = self.matrix
+		if matrix is None or matrix.weights_version != self.sensor_graph.weights_version:
+			return None
+		return matrix
+
+	def build(self):
+		"""Builds the matrix for the graph's current weights."""
+		try:
+			self.matrix = RoomDistanceMatrix.build(self.sensor_graph, self.room_ids, self.max_bytes)
+		except ValueError as e:
+			logger.warning('Distance matrix not built: %s', e)
+			self.matrix = None
+		except Exception:
+			self.matrix = None
+			raise
@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+
+
+class RouteDispersion:
+	def __init__(self, max_entries: int = 4096):
+		"""
+		Hands out the alternative routes of a query across the requests that ask for
+		it, so that visitors with the same source and target do not all walk the same
+		corridor. Each route gets a share inversely proportional to its distance, and
+		a smooth weighted round-robin per query key picks the route with the most
+		accumulated credit: consecutive requests are interleaved instead of handed
+		out in runs, and over any stretch of requests every route is picked close to
+		its share.
+
+		Args:
+		    max_entries (int): Number of query keys remembered; the least recently
+		                       used key is forgotten beyond it.
+		"""
+		self.max_entries = max_entries
+		# {key: {route signature: credit}}
+		self._credits = OrderedDict()
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def shares(distances: list) -> list:
+		"""Returns each route's share of the requests, inversely proportional to its distance."""
+		if not distances or min(distances) <= 0:
+			return [1.0] + [0.0] * (len(distances) - 1)
+		inverse = [1 / distance for distance in distances]
+		total = sum(inverse)
+		return [value / total for value in inverse]
+
+	def assign(self, key: tuple, signatures: list, distances: list) -> int:
+		"""
+		Picks the route for one request.
+
+		Args:
+		    key (tuple): Identifies the query, e.g. (topology key, source room, target room).
+		    signatures (list): A hashable signature per route, such as its sensor IDs.
+		                       Credit is kept per signature, so a route that is still
+		                       offered after a weight update keeps its credit.
+		    distances (list): The distance of every route.
+
+		Returns:
+		    int: The index of the assigned route.
+		"""
+		if len(signatures) <= 1:
+			return 0
+		shares = self.shares(distances)
+
+		with self._lock:
+			previous = self._credits.pop(key, {})
+			credits = {
+				signature: previous.get(signature, 0.0) + share
+				for signature, share in zip(signatures, shares)
+			}
+			chosen = max(range(len(signatures)), key=lambda index: credits[signatures[index]])
+			credits[signatures[chosen]] -= 1.0
+			self._credits[key] = credits
+			while len(self._credits) > self.max_entries:
+				self._credits.popitem(last=False)
+		return chosen
+
+	def __len__(self):
+		return len(self._credits)
@@ -2,6 +2,8 @@ import math
 
 
 class Sensor:
+	__slots__ = ('id', 'longitude', 'latitude', 'rooms', 'is_vertical')
+
 	def __init__(
 		self,
 		id: str,
@@ -39,9 +41,19 @@ class Sensor:
 		"""
 		dx = other_sensor.longitude - self.longitude
 		dy = other_sensor.latitude - self.latitude
-		distance = math.sqrt(dx**2 + dy**2)
+		distance = math.sqrt(dx * dx + dy * dy)
 		return distance
 
+	def to_dict(self) -> dict:
+		"""Returns the sensor's fields, with its rooms expanded, as a JSON-serializable dictionary."""
+		return {
+			'id': self.id,
+			'longitude': self.longitude,
+			'latitude': self.latitude,
+			'rooms': [room.to_dict() for room in self.rooms],
+			'is_vertical': self.is_vertical,
+		}
+
 	@classmethod
 	def from_schema(cls, schema, room_mapping: dict):
 		"""
@@ -1,14 +1,80 @@
 import networkx as nx
 from collections import defaultdict
 import itertools
+import threading
+from contextlib import contextmanager
 import math
+from typing import Literal, get_args
+
+import numpy as np
+
+from .contraction_hierarchy import ContractionHierarchy
+from .background_builder import BackgroundBuilder
+from .csr_graph import CSRGraph
+from .floor_hierarchy import FloorHierarchy
+from .landmark_index import LandmarkIndex
+from .room import EMPTY_ROOM_WEIGHT, room_weights
+from .room_distance_matrix import DEFAULT_MAX_BYTES, DistanceMatrixBuilder
+from .shortest_path_tree import ShortestPathTree
+from .tour_optimizer import TourOptimizer
+from .weight_snapshot import WeightSnapshot
+
+# Graph engines that can answer path queries; both give identical results.
+BACKENDS = ('networkx', 'csr')
+# Point-to-point search algorithms; all return a shortest path.
+SearchMode = Literal['dijkstra', 'astar', 'alt', 'bidirectional', 'hierarchical', 'ch']
+SEARCH_MODES = get_args(SearchMode)
+# Landmarks of the ALT index used by the 'alt' search mode.
+DEFAULT_LANDMARK_COUNT = 16
+# Smallest floor_penalty_multiplier build_graph() can assign to an edge.
+MIN_FLOOR_PENALTY_MULTIPLIER = 1.0
+# Keeps the A* heuristic admissible despite floating point rounding.
+HEURISTIC_SAFETY_FACTOR = 1 - 1e-9
+# Factor applied to the weights of a found route's edges before searching for the next alternative.
+ALTERNATIVE_PENALTY = 0.5
 
 
 class SensorGraph:
-	def __init__(self, sensors: list):
+	def __init__(self, sensors: list, backend: str = 'networkx', store=None):
+		"""
+		Args:
+		    sensors (list): The Sensor objects that become the nodes of the graph.
+		    backend (str): The engine used for path queries, either 'networkx'
+		                   (dict-of-dicts graph) or 'csr' (array-backed CSRGraph).
+		    store (BuildingStore, optional): Columnar copy of the same building, with
+		                                     one sensor row per entry of sensors. When
+		                                     given, build_graph() reads memberships,
+		                                     positions, floors and room weights from it.
+		"""
+		if backend not in BACKENDS:
+			raise ValueError(f"Unknown graph backend '{backend}'. Expected one of {BACKENDS}.")
+
 		self.sensors = sensors
+		self.backend = backend
+		self.store = store
 		self.graph = nx.Graph()
+		self.rooms = {}
 		self._sensor_map = {s.id: s for s in sensors}
+		self._edge_factors = []
+		self._edge_sensor_indices = None
+		self._room_edges = defaultdict(list)
+		self._csr_graph = None
+		self._search_graph = None
+		self._room_sensor_ids = {}
+		self._room_sensor_indices = None
+		self._floor_hierarchy = None
+		self._contraction_hierarchy = None
+		self._landmark_index = None
+		self.landmark_count = DEFAULT_LANDMARK_COUNT
+		self._weights = WeightSnapshot(0, [0.0], 0.0)
+		self._pinned = threading.local()
+		# Serializes writers; readers only read the current or their pinned snapshot.
+		self._write_lock = threading.Lock()
+		# Serializes the builds of the CSR graph, indices and hierarchies on first use.
+		self._build_lock = threading.RLock()
+		self.distance_matrix_builder = None
+		# Customizes the built hierarchies for every new weights version, off the query path.
+		self.hierarchy_builder = BackgroundBuilder(self._customize_hierarchies)
 
 	def build_graph(self):
 		"""
@@ -16,10 +82,101 @@ class SensorGraph:
 		For each room, an edge is added between every pair of sensors in that room.
 		Each edge is assigned a weight equal to the room's calculate_weight().
 		If two sensors share more than one room, only the first added edge is kept.
+
+		The pairwise sensor distances of a room are computed in one NumPy batch, the
+		room weight once per room, and all edges are inserted with a single bulk call.
 		"""
 		for sensor in self.sensors:
 			self.graph.add_node(sensor.id, sensor=sensor)
 
+		sensor_index = {}
+		for sensor in self.sensors:
+			sensor_index.setdefault(sensor.id, len(sensor_index))
+		sensor_ids = list(sensor_index)
+
+		if self.store is not None:
+			grouped = self._group_members_from_store(sensor_index)
+		else:
+			grouped = self._group_members_from_objects(sensor_index)
+		room_order, room_multipliers, member_sensors, member_positions, group_sizes, weigh = grouped
+
+		first, second, room_positions = self._membership_pairs(group_sizes)
+		dx = member_positions[second, 0] - member_positions[first, 0]
+		dy = member_positions[second, 1] - member_positions[first, 1]
+		distances = np.sqrt(dx * dx + dy * dy)
+		first, second = member_sensors[first], member_sensors[second]
+
+		# Keep only the first occurrence of every sensor pair, in insertion order.
+		pair_keys = np.minimum(first, second) * len(sensor_ids) + np.maximum(first, second)
+		_, first_occurrence = np.unique(pair_keys, return_index=True)
+		kept = np.sort(first_occurrence)
+		first, second = first[kept], second[kept]
+		distances, room_positions = distances[kept], room_positions[kept]
+
+		multipliers = np.asarray(room_multipliers, dtype=np.float64)[room_positions]
+		base_room_weights = np.zeros(len(room_order), dtype=np.float64)
+		used_room_positions = np.unique(room_positions)
+		base_room_weights[used_room_positions] = weigh(used_room_positions)
+		final_weights = (distances * base_room_weights[room_positions]) * multipliers
+
+		edge_rooms = [room_order[room_position] for room_position in room_positions.tolist()]
+		edge_sensor1_ids = [sensor_ids[index] for index in first.tolist()]
+		edge_sensor2_ids = [sensor_ids[index] for index in second.tolist()]
+
+		edge_weights = final_weights.tolist()
+		self.graph.add_edges_from(
+			(
+				sensor1_id,
+				sensor2_id,
+				{'weight': final_weight, 'room_id': room_id, 'edge': edge_index},
+			)
+			for edge_index, (sensor1_id, sensor2_id, final_weight, room_id) in enumerate(
+				zip(edge_sensor1_ids, edge_sensor2_ids, edge_weights, edge_rooms)
+			)
+		)
+
+		self._edge_sensor_indices = (first, second)
+		self._edge_factors = list(
+			zip(
+				edge_sensor1_ids,
+				edge_sensor2_ids,
+				edge_rooms,
+				distances.tolist(),
+				multipliers.tolist(),
+			)
+		)
+		for edge_index, room_id in enumerate(edge_rooms):
+			self._room_edges[room_id].append(edge_index)
+
+		self.rooms = {room.id: room for sensor in self.sensors for room in sensor.rooms}
+		group_ends = np.cumsum(group_sizes).tolist()
+		member_ids = [sensor_ids[index] for index in member_sensors.tolist()]
+		self._room_sensor_ids = {
+			room_id: member_ids[end - size : end]
+			for room_id, size, end in zip(room_order, group_sizes.tolist(), group_ends)
+		}
+		with self._write_lock:
+			self._csr_graph = None
+			self._search_graph = None
+			self._room_sensor_indices = None
+			self._floor_hierarchy = None
+			self._contraction_hierarchy = None
+			self._landmark_index = None
+			self._weights = WeightSnapshot(
+				self._weights.version + 1, edge_weights + [0.0], self._compute_heuristic_scale()
+			)
+		return self.graph
+
+	def _group_members_from_objects(self, sensor_index: dict) -> tuple:
+		"""
+		Groups the sensor-room memberships of the Sensor objects by room.
+
+		Returns:
+		    tuple: (room_order, room_multipliers, member_sensors, member_positions,
+		           group_sizes, weigh) where rooms are in order of first appearance,
+		           members are grouped by room, and weigh(room_positions) returns the
+		           base weights of the rooms at those positions of room_order.
+		"""
 		room_to_sensors = defaultdict(list)
 		room_info = {}
 		for sensor_obj in self.sensors:
@@ -27,42 +184,766 @@ class SensorGraph:
 				room_to_sensors[room_obj.id].append(sensor_obj)
 				room_info[room_obj.id] = room_obj
 
+		room_order = list(room_to_sensors)
+		room_multipliers = []
 		previous_room_floor_value = None
-
-		for room_id, sensor_list in room_to_sensors.items():
+		for room_id in room_order:
 			current_room = room_info[room_id]
-
 			floor_penalty_multiplier = 1.0
 			if current_room.floor != previous_room_floor_value:
 				floor_penalty_multiplier = 2.0
+			room_multipliers.append(floor_penalty_multiplier)
+			previous_room_floor_value = current_room.floor
+
+		members = [sensor for room_id in room_order for sensor in room_to_sensors[room_id]]
+		member_sensors = np.fromiter(
+			(sensor_index[sensor.id] for sensor in members), dtype=np.int64, count=len(members)
+		)
+		member_positions = np.array(
+			[(sensor.longitude, sensor.latitude) for sensor in members], dtype=np.float64
+		).reshape(len(members), 2)
+		group_sizes = np.fromiter(
+			(len(room_to_sensors[room_id]) for room_id in room_order),
+			dtype=np.int64,
+			count=len(room_order),
+		)
+
+		def weigh(room_positions):
+			return [
+				room_info[room_order[room_position]].calculate_weight()
+				for room_position in room_positions.tolist()
+			]
+
+		return room_order, room_multipliers, member_sensors, member_positions, group_sizes, weigh
+
+	def _group_members_from_store(self, sensor_index: dict) -> tuple:
+		"""Same as _group_members_from_objects(), computed from the BuildingStore arrays."""
+		store = self.store
+		sensor_rows, member_rooms = store.memberships()
+
+		present_rooms, first_positions = np.unique(member_rooms, return_index=True)
+		room_sequence = present_rooms[np.argsort(first_positions)]
+		room_rank = np.empty(store.room_count, dtype=np.int64)
+		room_rank[room_sequence] = np.arange(len(room_sequence))
+
+		member_ranks = room_rank[member_rooms]
+		member_rows = sensor_rows[np.argsort(member_ranks, kind='stable')]
+		group_sizes = np.bincount(member_ranks, minlength=len(room_sequence)).astype(np.int64)
+
+		floors = store.room_columns['floor'][room_sequence]
+		floor_changes = np.ones(len(floors), dtype=bool)
+		floor_changes[1:] = floors[1:] != floors[:-1]
+		room_multipliers = np.where(floor_changes, 2.0, 1.0)
+
+		row_nodes = np.fromiter(
+			(sensor_index[sensor_id] for sensor_id in store.sensor_ids),
+			dtype=np.int64,
+			count=store.sensor_count,
+		)
+		room_order = [store.room_ids[index] for index in room_sequence.tolist()]
+
+		def weigh(room_positions):
+			return store.room_weights(room_sequence[room_positions])
 
-			for sensor1, sensor2 in itertools.combinations(sensor_list, 2):
-				if not self.graph.has_edge(sensor1.id, sensor2.id):
-					sensor_distance = sensor1.calculate_distance(sensor2)
-					base_room_weight = current_room.calculate_weight()
+		return (
+			room_order,
+			room_multipliers,
+			row_nodes[member_rows],
+			store.positions()[member_rows],
+			group_sizes,
+			weigh,
+		)
 
+	@staticmethod
+	def _membership_pairs(group_sizes: np.ndarray) -> tuple:
+		"""
+		Enumerates every pair of members within each group of a grouped membership
+		list, in the order itertools.combinations would yield them group by group.
+
+		Args:
+		    group_sizes (np.ndarray): Number of consecutive members in each group.
+
+		Returns:
+		    tuple: Arrays (first member, second member, group position) per pair.
+		"""
+		group_starts = np.cumsum(group_sizes) - group_sizes
+		member_groups = np.repeat(np.arange(len(group_sizes)), group_sizes)
+		member_offsets = np.arange(len(member_groups)) - group_starts[member_groups]
+		partner_counts = group_sizes[member_groups] - member_offsets - 1
+
+		first = np.repeat(np.arange(len(member_groups)), partner_counts)
+		pair_starts = np.cumsum(partner_counts) - partner_counts
+		second = first + 1 + np.arange(len(first)) - np.repeat(pair_starts, partner_counts)
+		return first, second, member_groups[first]
+
+	def refresh_room_weights(self, room_ids, room_states: dict | None = None):
+		"""
+		Recomputes the weights of only the edges belonging to the given rooms,
+		using the room-to-edges index built by build_graph(). The new weights are
+		published as a new WeightSnapshot; readers that pinned an older snapshot
+		keep seeing its weights.
+
+		Args:
+		    room_ids (iterable): IDs of the rooms whose state has changed.
+		    room_states (dict, optional): New WeightSnapshot.room_states, published
+		                                  with the weights even if no edge changed.
+
+		Returns:
+		    int: The number of edges that were updated.
+		"""
+		with self._write_lock:
+			updated_edges = []
+			updated_weights = []
+			for room_id in room_ids:
+				edge_indices = self._room_edges.get(room_id)
+				if not edge_indices:
+					continue
+
+				base_room_weight = self.rooms[room_id].calculate_weight()
+				for edge_index in edge_indices:
+					sensor1_id, sensor2_id, _, sensor_distance, floor_penalty_multiplier = (
+						self._edge_factors[edge_index]
+					)
 					final_weight = (sensor_distance * base_room_weight) * floor_penalty_multiplier
+					self.graph[sensor1_id][sensor2_id]['weight'] = final_weight
+					updated_edges.append(edge_index)
+					updated_weights.append(final_weight)
+
+			if not updated_edges:
+				if room_states is not None:
+					self._weights = self._weights.with_room_states(room_states)
+				return 0
 
-					self.graph.add_edge(
-						sensor1.id,
-						sensor2.id,
-						weight=final_weight,
-						room_id=room_id,
+			self._weights = self._weights.updated(
+				updated_edges,
+				updated_weights,
+				self._compute_heuristic_scale(),
+				csr_graph=self._csr_graph,
+				room_states=room_states,
+			)
+			if self._csr_graph is not None:
+				self._csr_graph.weights = self._weights.arc_weights(self._csr_graph)
+
+		if self.distance_matrix_builder is not None:
+			self.distance_matrix_builder.request_rebuild()
+		if self._floor_hierarchy is not None or self._contraction_hierarchy is not None:
+			self.hierarchy_builder.request_rebuild()
+		return len(updated_edges)
+
+	@property
+	def weights_version(self) -> int:
+		"""Version of the weights this thread reads: its pinned snapshot, else the latest."""
+		return self.current_weights().version
+
+	def current_weights(self) -> WeightSnapshot:
+		"""Returns the snapshot pinned by this thread, or the latest one."""
+		pinned = getattr(self._pinned, 'snapshot', None)
+		return self._weights if pinned is None else pinned
+
+	def latest_weights(self) -> WeightSnapshot:
+		"""Returns the most recently published snapshot, ignoring this thread's pin."""
+		return self._weights
+
+	@contextmanager
+	def pinned_weights(self, snapshot: WeightSnapshot | None = None):
+		"""
+		Pins the latest weights, or the given snapshot, for this thread until the block
+		exits, so that every search in the block (for example all legs of a tour) uses
+		the same version, while writers keep publishing newer ones. Nested pins reuse
+		the outer one.
+
+		Args:
+		    snapshot (WeightSnapshot, optional): A snapshot of this graph to pin, for
+		                                         example the one an occupancy update
+		                                         published. Defaults to the latest.
+
+		Yields:
+		    WeightSnapshot: The pinned weights; its version identifies them.
+		"""
+		pinned = getattr(self._pinned, 'snapshot', None)
+		if pinned is not None:
+			yield pinned
+			return
+
+		self._pinned.snapshot = self._weights if snapshot is None else snapshot
+		try:
+			yield self._pinned.snapshot
+		finally:
+			self._pinned.snapshot = None
+
+	def path_edge_indices(self, node_path: list) -> list:
+		"""
+		Returns the indices (into WeightSnapshot.edge_weights) of the sensor-to-sensor
+		edges along a path of node IDs, such as the sensors of a found path. Steps to
+		or from a virtual room node are skipped.
+		"""
+		edge_indices = []
+		for node1_id, node2_id in zip(node_path, node_path[1:]):
+			edge_data = self.graph.get_edge_data(node1_id, node2_id)
+			if edge_data is not None:
+				edge_indices.append(edge_data['edge'])
+		return edge_indices
+
+	def _networkx_search_graph(self) -> nx.Graph:
+		"""
+		The graph networkx searches run on: a copy of the sensor graph with a node for
+		every room that has sensors, linked to each of them. Built on first use and
+		never modified afterwards; _networkx_weight() decides which room links a
+		search may follow.
+		"""
+		if self._search_graph is None:
+			with self._build_lock:
+				if self._search_graph is None:
+					search_graph = nx.Graph(self.graph)
+					room_link_edge = self.current_weights().room_link_edge
+					search_graph.add_edges_from(
+						(room_id, sensor_id, {'edge': room_link_edge})
+						for room_id, room_sensor_ids in self._room_sensor_ids.items()
+						if room_id not in self._sensor_map
+						for sensor_id in room_sensor_ids
 					)
+					self._search_graph = search_graph
+		return self._search_graph
 
-			previous_room_floor_value = current_room.floor
+	def _networkx_weight(self, source=None, targets=()):
+		"""
+		Edge weight function for a networkx search between the given endpoints on
+		_networkx_search_graph(), reading the current snapshot. It applies the room
+		overlay of _room_arcs(): room links are hidden (None), except from a source
+		room to its sensors and from the sensors of a target room to that room.
+		"""
+		weights = self.current_weights()
+		edge_weights = weights.edge_weights
+		room_link_edge = weights.room_link_edge
+		source_room = source if self._is_room_endpoint(source) else None
+		target_rooms = {target for target in targets if self._is_room_endpoint(target)}
 
-		return self.graph
+		def weight(u, v, data):
+			edge = data['edge']
+			if edge != room_link_edge:
+				return edge_weights[edge]
+			return 0.0 if u == source_room or v in target_rooms else None
 
-	def attach_rooms(self, rooms_to_add: list):
+		return weight
+
+	def _query_csr_graph(self) -> CSRGraph:
+		"""The CSR graph with the arc weights of the current snapshot."""
+		csr_graph = self.get_csr_graph()
+		return csr_graph.with_weights(self.current_weights().arc_weights(csr_graph))
+
+	def update_room_occupancy(self, occupancy: dict, crowd_factors: dict | None = None):
 		"""
-		Attaches a room node to all its sensors in the graph with weight 0.
-		Expects a list of Room objects.
+		Applies a batch of occupancy changes and updates only the affected edges.
+
+		Args:
+		    occupancy (dict): Mapping {room_id: occupants} with the new occupant counts.
+		    crowd_factors (dict, optional): Mapping {room_id: crowd_factor} for rooms
+		                                    whose crowd factor changed as well.
+
+		Returns:
+		    int: The number of edges that were updated.
+
+		Raises:
+		    ValueError: If a room ID is not part of the graph. No changes are applied then.
 		"""
-		for sensor in self.sensors:
-			for room in sensor.rooms:
-				if room.id in rooms_to_add:
-					self.graph.add_edge(sensor.id, room.id, weight=0, room_id=room.id)
+		crowd_factors = crowd_factors or {}
+		unknown_rooms = [
+			room_id
+			for room_id in itertools.chain(occupancy, crowd_factors)
+			if room_id not in self.rooms
+		]
+		if unknown_rooms:
+			raise ValueError(f'Unknown rooms in occupancy update: {sorted(set(unknown_rooms))}')
+
+		for room_id, occupants in occupancy.items():
+			self.rooms[room_id].occupants = occupants
+		for room_id, crowd_factor in crowd_factors.items():
+			self.rooms[room_id].crowd_factor = crowd_factor
+
+		return self.refresh_room_weights(set(occupancy) | set(crowd_factors))
+
+	def _is_room_endpoint(self, node_id) -> bool:
+		"""Returns True if node_id names a room with sensors rather than a sensor."""
+		return node_id in self._room_sensor_ids and node_id not in self._sensor_map
+
+	def _room_arcs(self, source, targets=()) -> dict:
+		"""
+		The read-only room overlay of one search. Rooms among its endpoints become
+		virtual nodes: a source room gets arcs to all of its sensors and every target
+		room arcs from all of its sensors, all of weight 0. The search thus starts at
+		every sensor of the source room at once and reaches a target room through its
+		closest sensor, but never passes through a room. The overlay only lives for the
+		search, so the shared graph is never modified. networkx searches apply the same
+		overlay to the room nodes of _networkx_search_graph() through _networkx_weight().
+
+		Args:
+		    source: The node ID the search starts from.
+		    targets (iterable): Node IDs the search looks for.
+
+		Returns:
+		    dict: {node_id: [neighbor_id]} with the overlay arcs; empty if no endpoint
+		          is a room.
+		"""
+		arcs = defaultdict(list)
+		if self._is_room_endpoint(source):
+			arcs[source].extend(self._room_sensor_ids[source])
+		for target in dict.fromkeys(targets):
+			if self._is_room_endpoint(target):
+				for sensor_id in self._room_sensor_ids[target]:
+					arcs[sensor_id].append(target)
+		return arcs
+
+	def _has_node(self, node_id) -> bool:
+		"""Returns True if node_id is a sensor of the graph or a room that can be an endpoint."""
+		return self.graph.has_node(node_id) or self._is_room_endpoint(node_id)
+
+	def get_csr_graph(self) -> CSRGraph:
+		"""
+		Returns the array-backed copy of the sensor-to-sensor edges, building it on
+		first use. Its weights array is replaced by the latest arc weights whenever
+		the weights change; searches use _query_csr_graph() instead.
+		"""
+		if self._csr_graph is None:
+			with self._build_lock:
+				if self._csr_graph is None:
+					self._build_csr_graph()
+		return self._csr_graph
+
+	def _build_csr_graph(self):
+		"""Builds the CSR graph with the latest weights; called with _build_lock held."""
+		sensor_ids = [node_id for node_id, data in self.graph.nodes(data=True) if 'sensor' in data]
+		first, second = self._edge_sensor_indices
+		coordinates = [
+			(
+				self.graph.nodes[sensor_id]['sensor'].longitude,
+				self.graph.nodes[sensor_id]['sensor'].latitude,
+			)
+			for sensor_id in sensor_ids
+		]
+		with self._write_lock:
+			snapshot = self._weights
+			csr_graph = CSRGraph.from_index_edges(
+				sensor_ids, first, second, snapshot.edge_weights[:-1], coordinates=coordinates
+			)
+			csr_graph.weights = snapshot.arc_weights(csr_graph)
+			self._csr_graph = csr_graph
+
+	def room_sensor_indices(self, csr_graph: CSRGraph | None = None) -> dict:
+		"""
+		Returns the room-to-sensor table {room_id: [sensor index]} in CSR node indices,
+		in the order build_graph() met the sensors. Room endpoints of CSR searches take
+		their sensors from it, see _csr_search_space().
+		"""
+		if self._room_sensor_indices is None:
+			node_index = (csr_graph or self.get_csr_graph()).node_index
+			with self._build_lock:
+				if self._room_sensor_indices is None:
+					self._room_sensor_indices = {
+						room_id: [node_index[sensor_id] for sensor_id in sensor_ids]
+						for room_id, sensor_ids in self._room_sensor_ids.items()
+					}
+		return self._room_sensor_indices
+
+	def enable_distance_matrix(
+		self, room_ids=None, max_bytes: int = DEFAULT_MAX_BYTES, background: bool = True
+	) -> DistanceMatrixBuilder:
+		"""
+		Starts keeping a precomputed room-to-room distance matrix for this graph. It is
+		rebuilt whenever edge weights change; tours use it while it is up to date.
+
+		Args:
+		    room_ids (iterable, optional): Opt-in subset of rooms. Defaults to all rooms.
+		    max_bytes (int): Memory bound for the matrix.
+		    background (bool): Build on a background thread.
+
+		Returns:
+		    DistanceMatrixBuilder: The builder, whose wait() blocks until a build is done.
+		"""
+		self.get_csr_graph()
+		self.distance_matrix_builder = DistanceMatrixBuilder(
+			self, room_ids, max_bytes=max_bytes, background=background
+		)
+		self.distance_matrix_builder.request_rebuild()
+		return self.distance_matrix_builder
+
+	def _current_distance_matrix(self, room_ids: list):
+		"""Returns the distance matrix if it is up to date and covers room_ids, else None."""
+		if self.distance_matrix_builder is None:
+			return None
+		matrix = self.distance_matrix_builder.current()
+		if matrix is None or not matrix.covers(room_ids):
+			return None
+		return matrix
+
+	def _csr_search_space(self, source, targets=()):
+		"""
+		Adds the room overlay of one search (see _room_arcs()) to the CSR graph: rooms
+		among the endpoints get virtual node indices after the sensor nodes, and their
+		arcs are read from room_sensor_indices().
+
+		Args:
+		    source: The node ID the search starts from.
+		    targets (iterable): Node IDs the search looks for.
+
+		Returns:
+		    tuple: (csr_graph, to_key, to_id, extra_arcs) where to_key/to_id translate
+		           between node IDs and indices and extra_arcs holds the overlay arcs.
+		"""
+		csr_graph = self._query_csr_graph()
+		room_sensors = self.room_sensor_indices(csr_graph)
+		targets = list(dict.fromkeys(targets))
+		room_ids = [
+			node_id
+			for node_id in dict.fromkeys([source, *targets])
+			if self._is_room_endpoint(node_id)
+		]
+		room_index = {
+			room_id: csr_graph.node_count + position for position, room_id in enumerate(room_ids)
+		}
+
+		extra_arcs = defaultdict(list)
+		if source in room_index:
+			extra_arcs[room_index[source]].extend(
+				(sensor_index, 0) for sensor_index in room_sensors[source]
+			)
+		for target in targets:
+			if target in room_index:
+				for sensor_index in room_sensors[target]:
+					extra_arcs[sensor_index].append((room_index[target], 0))
+
+		def to_key(node_id):
+			return room_index.get(node_id, csr_graph.node_index.get(node_id))
+
+		def to_id(index):
+			if index < csr_graph.node_count:
+				return csr_graph.node_ids[index]
+			return room_ids[index - csr_graph.node_count]
+
+		return csr_graph, to_key, to_id, extra_arcs
+
+	def _csr_shortest_path_tree(
+		self, source: str, targets=None, cutoff: float | None = None
+	) -> ShortestPathTree:
+		"""Runs one Dijkstra search on the CSR backend, see shortest_path_tree()."""
+		targets = None if targets is None else list(targets)
+		csr_graph, to_key, to_id, extra_arcs = self._csr_search_space(source, targets or ())
+
+		source_index = to_key(source)
+		if source_index is None:
+			raise nx.NodeNotFound(f'Source {source} is not in G')
+
+		target_indices = None
+		if targets is not None:
+			target_indices = {to_key(target) for target in targets} - {None}
+
+		dist, pred = csr_graph.dijkstra(source_index, target_indices, extra_arcs, cutoff)
+		return ShortestPathTree(source, dist, pred, to_key=to_key, to_id=to_id)
+
+	def shortest_path_tree(
+		self, source: str, targets=None, cutoff: float | None = None
+	) -> ShortestPathTree:
+		"""
+		Runs a single single-source Dijkstra search from source with the configured
+		backend. The result holds the distance to every reached node together with
+		the predecessors needed to rebuild their paths.
+
+		Args:
+		    source (str): The node (room or sensor) to search from.
+		    targets (iterable, optional): Nodes of interest; the search may stop once
+		                                  all of them are settled. Rooms among source
+		                                  and targets are searched through the room
+		                                  overlay, see _room_arcs().
+		    cutoff (float, optional): Only nodes within this distance are settled.
+
+		Returns:
+		    ShortestPathTree: Distances and paths from source.
+
+		Raises:
+		    nx.NodeNotFound: If source is not in the graph.
+		"""
+		if self.backend == 'csr':
+			return self._csr_shortest_path_tree(source, targets, cutoff)
+
+		pred, dist = nx.dijkstra_predecessor_and_distance(
+			self._networkx_search_graph(),
+			source,
+			cutoff=cutoff,
+			weight=self._networkx_weight(source, targets or ()),
+		)
+		return ShortestPathTree(source, dist, pred)
+
+	def heuristic_scale(self) -> float:
+		"""
+		Returns a lower bound on edge weight per unit of Euclidean distance: the
+		smallest current room weight times the smallest floor penalty. Scaling sensor
+		distances by it gives an admissible A* heuristic even when empty rooms
+		(weight 0.01) are present. Stored with each weight snapshot.
+		"""
+		return self.current_weights().heuristic_scale
+
+	def _compute_heuristic_scale(self) -> float:
+		room_weights = [room.calculate_weight() for room in self.rooms.values()]
+		minimum_weight = max(min(room_weights, default=0.0), 0.0)
+		return minimum_weight * MIN_FLOOR_PENALTY_MULTIPLIER * HEURISTIC_SAFETY_FACTOR
+
+	def _target_positions(self, target: str) -> list:
+		"""Returns the (longitude, latitude) of target, or of every sensor of a room."""
+		sensor = self._sensor_map.get(target)
+		if sensor is not None:
+			return [(sensor.longitude, sensor.latitude)]
+		return [
+			(self._sensor_map[sensor_id].longitude, self._sensor_map[sensor_id].latitude)
+			for sensor_id in self._room_sensor_ids.get(target, [])
+		]
+
+	def landmark_index(self) -> LandmarkIndex:
+		"""
+		Returns the ALT index with landmark_count landmarks, building it on first use.
+		Its baseline is every edge's weight with its room empty; the bounds are scaled
+		to the current weights per query, so the index is only rebuilt with the graph.
+		"""
+		if self._landmark_index is None:
+			with self._build_lock:
+				if self._landmark_index is None:
+					baseline_weights = [
+						(sensor_distance * EMPTY_ROOM_WEIGHT) * floor_penalty_multiplier
+						for _, _, _, sensor_distance, floor_penalty_multiplier in self._edge_factors
+					]
+					self._landmark_index = LandmarkIndex(
+						self.get_csr_graph(), baseline_weights, self.landmark_count
+					)
+		return self._landmark_index
+
+	def _target_indices(self, target: str) -> list:
+		"""CSR indices of target, or of the sensors of the room target."""
+		node_index = self.get_csr_graph().node_index
+		if target in node_index:
+			return [node_index[target]]
+		return self.room_sensor_indices().get(target, [])
+
+	def _astar_bounds(self, target: str, mode: str) -> np.ndarray:
+		"""
+		Lower bounds on the distance to target per CSR node: the Euclidean bound, and
+		for mode 'alt' the larger of it and the scaled landmark bound.
+		"""
+		bounds = self.get_csr_graph().euclidean_lower_bounds(
+			self._target_positions(target), self.heuristic_scale()
+		)
+		index = self.landmark_index() if mode == 'alt' else None
+		if index is not None:
+			scale = index.bound_scale(self.current_weights()) * HEURISTIC_SAFETY_FACTOR
+			if scale > 0:
+				landmark_bounds = index.lower_bounds(self._target_indices(target))
+				bounds = np.maximum(bounds, landmark_bounds * scale)
+		return bounds
+
+	def _networkx_heuristic(self, target: str, mode: str = 'astar'):
+		"""Builds the A* heuristic for nx.astar_path towards target."""
+		if mode == 'alt':
+			bounds = self._astar_bounds(target, mode).tolist()
+			node_index = self.get_csr_graph().node_index
+
+			def landmark_heuristic(node_id, _target):
+				index = node_index.get(node_id)
+				return 0.0 if index is None else bounds[index]
+
+			return landmark_heuristic
+
+		scale = self.heuristic_scale()
+		positions = self._target_positions(target)
+
+		def heuristic(node_id, _target):
+			sensor = self._sensor_map.get(node_id)
+			if sensor is None or not positions:
+				return 0.0
+			return scale * min(
+				math.hypot(sensor.longitude - longitude, sensor.latitude - latitude)
+				for longitude, latitude in positions
+			)
+
+		return heuristic
+
+	def _csr_shortest_path(self, source: str, target: str, mode: str):
+		"""Point-to-point search on the CSR backend; returns (path_nodes, distance)."""
+		if mode == 'dijkstra':
+			tree = self.shortest_path_tree(source, [target])
+			return tree.path(target), tree.distance(target)
+
+		csr_graph, to_key, to_id, extra_arcs = self._csr_search_space(source, [target])
+		source_index = to_key(source)
+		target_index = to_key(target)
+		if source_index is None:
+			raise nx.NodeNotFound(f'Source {source} is not in G')
+		if target_index is None:
+			raise nx.NetworkXNoPath(f'Node {target} not reachable from {source}')
+
+		if mode == 'bidirectional':
+			distance, index_path = csr_graph.bidirectional_dijkstra(
+				source_index, target_index, extra_arcs
+			)
+			if distance is None:
+				raise nx.NetworkXNoPath(f'Node {target} not reachable from {source}')
+			return [to_id(index) for index in index_path], distance
+
+		bounds = self._astar_bounds(target, mode).tolist()
+		stored_nodes = len(bounds)
+
+		def heuristic(index):
+			return bounds[index] if index < stored_nodes else 0.0
+
+		dist, pred = csr_graph.astar(source_index, target_index, heuristic, extra_arcs)
+		tree = ShortestPathTree(source, dist, pred, to_key=to_key, to_id=to_id)
+		return tree.path(target), tree.distance(target)
+
+	def floor_hierarchy(self) -> FloorHierarchy:
+		"""
+		Returns the per-floor subgraphs and connector overlay, building them on first
+		use. Later weights versions are customized by hierarchy_builder.
+		"""
+		if self._floor_hierarchy is None:
+			with self._build_lock:
+				if self._floor_hierarchy is None:
+					hierarchy = FloorHierarchy(
+						self._edge_factors,
+						{room_id: room.floor for room_id, room in self.rooms.items()},
+						[sensor.id for sensor in self.sensors if sensor.is_vertical],
+					)
+					self._floor_hierarchy = hierarchy
+					# Published first so that weights published from here on reach the builder.
+					hierarchy.update_overlay(self.latest_weights())
+		return self._floor_hierarchy
+
+	def _hierarchical_shortest_path(self, source: str, target: str):
+		"""
+		Point-to-point search on the floor hierarchy: the floors of source and target
+		are searched edge by edge, every other floor only through its connector
+		overlay. Room endpoints are joined to their sensors by the room overlay, see
+		_room_arcs(). Returns (path_nodes, distance).
+		"""
+		if not self._has_node(source):
+			raise nx.NodeNotFound(f'Source {source} is not in G')
+		if not self._has_node(target):
+			raise nx.NetworkXNoPath(f'Node {target} not reachable from {source}')
+
+		hierarchy = self.floor_hierarchy()
+		extra_arcs = self._room_arcs(source, [target])
+		local_floors = set()
+		for node_id in (source, target):
+			if self._is_room_endpoint(node_id):
+				local_floors.add(self.rooms[node_id].floor)
+			local_floors.update(hierarchy.node_floors.get(node_id, ()))
+
+		weights = self.current_weights()
+		overlay = hierarchy.current_overlay(weights)
+		if overlay is None:
+			# The overlay for these weights is still being customized.
+			return self._shortest_path(source, target, 'dijkstra')
+		path_nodes = hierarchy.shortest_path(
+			source, target, local_floors, extra_arcs, weights, overlay
+		)
+		return path_nodes, self._path_distance(path_nodes, weights)
+
+	def contraction_hierarchy(self) -> ContractionHierarchy:
+		"""
+		Returns the customizable contraction hierarchy over the CSR node indices,
+		building it on first use. Later weights versions are customized by
+		hierarchy_builder.
+		"""
+		if self._contraction_hierarchy is None:
+			with self._build_lock:
+				if self._contraction_hierarchy is None:
+					first, second = self._edge_sensor_indices
+					hierarchy = ContractionHierarchy(
+						self.get_csr_graph().node_count, first.tolist(), second.tolist()
+					)
+					self._contraction_hierarchy = hierarchy
+					# Published first so that weights published from here on reach the builder.
+					hierarchy.update_metric(self.latest_weights())
+		return self._contraction_hierarchy
+
+	def _customize_hierarchies(self):
+		"""Customizes the hierarchies built so far for the latest weights."""
+		weights = self.latest_weights()
+		floor_hierarchy = self._floor_hierarchy
+		if floor_hierarchy is not None:
+			floor_hierarchy.update_overlay(weights)
+		contraction_hierarchy = self._contraction_hierarchy
+		if contraction_hierarchy is not None:
+			contraction_hierarchy.update_metric(weights)
+
+	def _ch_shortest_path(self, source: str, target: str):
+		"""
+		Point-to-point query on the contraction hierarchy; a room starts or ends the
+		search at all of its sensors. Returns (path_nodes, distance).
+		"""
+		if not self._has_node(source):
+			raise nx.NodeNotFound(f'Source {source} is not in G')
+		if not self._has_node(target):
+			raise nx.NetworkXNoPath(f'Node {target} not reachable from {source}')
+
+		csr_graph = self.get_csr_graph()
+		node_index = csr_graph.node_index
+
+		def seeds(node_id):
+			if node_id in node_index:
+				return [node_index[node_id]]
+			return self.room_sensor_indices(csr_graph)[node_id]
+
+		hierarchy = self.contraction_hierarchy()
+		weights = self.current_weights()
+		metric = hierarchy.current_metric(weights)
+		if metric is None:
+			# The metric for these weights is still being customized.
+			return self._shortest_path(source, target, 'dijkstra')
+		index_path, _ = hierarchy.shortest_path(seeds(source), seeds(target), metric)
+		path_nodes = [csr_graph.node_ids[index] for index in index_path]
+		if source not in node_index:
+			path_nodes.insert(0, source)
+		if target not in node_index:
+			path_nodes.append(target)
+		return path_nodes, self._path_distance(path_nodes, weights)
+
+	def _path_distance(self, path_nodes: list, weights) -> float:
+		"""Sums the weights of a path's edges in path order, as the networkx searches do."""
+		distance = 0
+		for node1_id, node2_id in zip(path_nodes, path_nodes[1:]):
+			edge_data = self.graph.get_edge_data(node1_id, node2_id)
+			if edge_data is not None:
+				distance += weights.edge_weights[edge_data['edge']]
+		return distance
+
+	def _shortest_path(self, source: str, target: str, mode: str = 'dijkstra'):
+		"""Returns (path_nodes, distance) between two nodes from a single search."""
+		if mode not in SEARCH_MODES:
+			raise ValueError(f"Unknown search mode '{mode}'. Expected one of {SEARCH_MODES}.")
+		if mode == 'hierarchical':
+			return self._hierarchical_shortest_path(source, target)
+		if mode == 'ch':
+			return self._ch_shortest_path(source, target)
+
+		if self.backend == 'csr':
+			return self._csr_shortest_path(source, target, mode)
+
+		graph = self._networkx_search_graph()
+		weight = self._networkx_weight(source, [target])
+		if mode in ('astar', 'alt'):
+			path_nodes = nx.astar_path(
+				graph,
+				source,
+				target,
+				heuristic=self._networkx_heuristic(target, mode),
+				weight=weight,
+			)
+			distance = 0
+			for node1_id, node2_id in zip(path_nodes, path_nodes[1:]):
+				distance += weight(node1_id, node2_id, graph[node1_id][node2_id])
+			return path_nodes, distance
+		if mode == 'bidirectional':
+			distance, path_nodes = nx.bidirectional_dijkstra(graph, source, target, weight=weight)
+			return path_nodes, distance
+
+		distance, path_nodes = nx.single_source_dijkstra(graph, source, target, weight=weight)
+		return path_nodes, distance
 
 	def _get_path_coordinates(self, node_path: list, rooms_to_exclude: set):
 		"""Helper to convert a node path (including rooms/sensors) to sensor coordinates."""
@@ -77,9 +958,14 @@ class SensorGraph:
 				path_with_coordinates.append(sensor_obj)
 		return path_with_coordinates
 
-	def find_fastest_path(self, source: str, target: str):
+	def find_fastest_path(self, source: str, target: str, mode: str = 'dijkstra'):
 		"""
 		Uses Dijkstra's algorithm to find the fastest path between two nodes (rooms or sensors).
+		mode selects the search: 'dijkstra', 'astar' (goal-directed with a Euclidean
+		heuristic, see heuristic_scale()), 'alt' (A* with landmark bounds as well, see
+		landmark_index()), 'bidirectional', 'hierarchical' (floor
+		subgraphs plus connector overlay, see floor_hierarchy()) or 'ch' (contraction
+		hierarchy, see contraction_hierarchy()). All modes return a shortest path.
 		Returns:
 		    - List of intermediate sensor objects (excluding source/target rooms/sensors).
 		    - Total distance (weight) of the path.
@@ -89,8 +975,7 @@ class SensorGraph:
 		    KeyError: If source or target node does not exist in the graph.
 		"""
 		try:
-			path_nodes = nx.dijkstra_path(self.graph, source, target, weight='weight')
-			distance = nx.dijkstra_path_length(self.graph, source, target, weight='weight')
+			path_nodes, distance = self._shortest_path(source, target, mode)
 
 			path_with_coordinates = self._get_path_coordinates(path_nodes, {source, target})
 
@@ -98,10 +983,168 @@ class SensorGraph:
 		except (nx.NetworkXNoPath, KeyError) as e:
 			raise e
 
+	def find_alternative_paths(
+		self,
+		source: str,
+		target: str,
+		k: int = 3,
+		max_shared: float = 0.5,
+		max_stretch: float = 1.5,
+		penalty: float = ALTERNATIVE_PENALTY,
+	) -> list:
+		"""
+		Finds up to k diverse routes between two nodes with the penalty method: after
+		every search the edges of the found route get (1 + penalty) times heavier, and
+		the next search on the penalized weights yields a route that avoids them where
+		that is cheap. A route is kept if it is at most max_stretch times as long as
+		the fastest one and shares at most max_shared of its length with every kept
+		route. At most 2 * k searches are run.
+
+		Args:
+		    source (str): Source node ID (a room or a sensor).
+		    target (str): Target node ID (a room or a sensor).
+		    k (int): Maximum number of routes.
+		    max_shared (float): Largest fraction of a route's distance on edges of an
+		                        already kept route.
+		    max_stretch (float): Largest distance of a route relative to the fastest.
+		    penalty (float): Relative weight increase of a found route's edges.
+
+		Returns:
+		    list: (path_sensors, distance) tuples in the format of find_fastest_path(),
+		          fastest first. The first route is a fastest path.
+
+		Raises:
+		    nx.NetworkXNoPath: If no path exists between source and target.
+		    nx.NodeNotFound: If source is not in the graph.
+		"""
+		# The search space and the distances of the kept routes must come from the
+		# same weights version, even if new occupancy is published meanwhile.
+		with self.pinned_weights() as weights:
+			csr_graph, to_key, to_id, extra_arcs = self._csr_search_space(source, [target])
+			source_index = to_key(source)
+			if source_index is None:
+				raise nx.NodeNotFound(f'Source {source} is not in G')
+			target_index = to_key(target)
+			if target_index is None:
+				raise nx.NetworkXNoPath(f'Node {target} not reachable from {source}')
+
+			edge_weights = weights.edge_weights
+			penalized = np.array(csr_graph.weights, dtype=np.float64)
+			penalized_graph = csr_graph.with_weights(penalized)
+			# (path_nodes, distance, {edge_index}) of the kept routes.
+			kept = []
+			for _ in range(2 * k):
+				dist, pred = penalized_graph.dijkstra(source_index, {target_index}, extra_arcs)
+				tree = ShortestPathTree(source, dist, pred, to_key=to_key, to_id=to_id)
+				path_nodes = tree.path(target)
+				edge_indices = self.path_edge_indices(path_nodes)
+				distance = self._path_distance(path_nodes, weights)
+
+				fastest = kept[0][1] if kept else distance
+				route_edges = set(edge_indices)
+				if distance <= fastest * max_stretch and all(
+					sum(edge_weights[edge_index] for edge_index in route_edges & edges)
+					<= max_shared * distance
+					for _, _, edges in kept
+				):
+					kept.append((path_nodes, distance, route_edges))
+					if len(kept) == k:
+						break
+				if not edge_indices:
+					break
+
+				arcs = csr_graph.edge_arcs[np.asarray(edge_indices, dtype=np.int64)].ravel()
+				penalized[arcs] *= 1 + penalty
+
+			return [
+				(self._get_path_coordinates(path_nodes, {source, target}), distance)
+				for path_nodes, distance, _ in sorted(kept, key=lambda route: route[1])
+			]
+
+	def _closest_room_sensors(self, tree: ShortestPathTree, room_ids) -> dict:
+		"""
+		Returns {room_id: (sensor_id, distance)} with the closest reached sensor of each
+		room in tree; a room counts as reached as soon as one of its sensors is.
+		"""
+		closest = {}
+		for room_id in room_ids:
+			reached = [
+				sensor_id
+				for sensor_id in self._room_sensor_ids.get(room_id, [])
+				if tree.reaches(sensor_id)
+			]
+			if reached:
+				sensor_id = min(reached, key=tree.distance)
+				closest[room_id] = (sensor_id, tree.distance(sensor_id))
+		return closest
+
+	def find_paths_from_room(self, source_room: str, target_rooms) -> dict:
+		"""
+		Answers many fastest-path queries that share a source with one single-source
+		search. Target rooms are reached through their closest sensor.
+
+		Args:
+		    source_room (str): The ID of the source room.
+		    target_rooms (iterable): Target room IDs.
+
+		Returns:
+		    dict: Mapping {target_room: (path_sensors, distance)} for every reachable
+		          target, in the format of find_fastest_path().
+
+		Raises:
+		    nx.NodeNotFound: If source_room is not in the graph.
+		"""
+		target_rooms = set(target_rooms)
+		tree = self.shortest_path_tree(
+			source_room,
+			{
+				sensor_id
+				for room_id in target_rooms
+				for sensor_id in self._room_sensor_ids.get(room_id, [])
+			},
+		)
+
+		results = {}
+		if source_room in target_rooms:
+			results[source_room] = ([], 0)
+		closest = self._closest_room_sensors(tree, target_rooms - {source_room})
+		for room_id, (sensor_id, distance) in closest.items():
+			results[room_id] = (
+				self._get_path_coordinates(tree.path(sensor_id), {source_room}),
+				distance,
+			)
+		return results
+
+	def find_room_distances(self, source_room: str, budget: float | None = None) -> dict:
+		"""
+		Computes the distance from source_room to every room with one single-source
+		search. With a budget the search stops as soon as its frontier exceeds it, and
+		only rooms within the budget are returned (an isochrone).
+
+		Args:
+		    source_room (str): The ID of the source room.
+		    budget (float, optional): Largest distance of interest.
+
+		Returns:
+		    dict: Mapping {room_id: distance}, nearest rooms first. The source room
+		          itself is included with distance 0.
+
+		Raises:
+		    nx.NodeNotFound: If source_room is not in the graph.
+		"""
+		tree = self.shortest_path_tree(source_room, cutoff=budget)
+		closest = self._closest_room_sensors(tree, self._room_sensor_ids)
+		distances = {room_id: distance for room_id, (_, distance) in closest.items()}
+		distances[source_room] = 0
+		return dict(sorted(distances.items(), key=lambda item: item[1]))
+
 	def find_multi_point_path_nearest_neighbor(self, source_room: str, target_rooms: list[str]):
 		"""
 		Finds a path starting at source_room, visiting all target_rooms using the
-		Nearest Neighbor heuristic based on Dijkstra path lengths.
+		Nearest Neighbor heuristic based on Dijkstra path lengths. Each leg runs one
+		single-source search that yields the distances to all remaining targets and
+		the path to the nearest one, or reads them from an up-to-date distance matrix
+		(see enable_distance_matrix()) when it covers every room of the tour.
 
 		Args:
 		    source_room (str): The ID of the starting room.
@@ -123,38 +1166,34 @@ class SensorGraph:
 		ordered_rooms_visited = [source_room]
 		full_node_path = [source_room]
 		total_distance = 0.0
+		distance_matrix = self._current_distance_matrix([source_room, *unvisited_targets])
 
 		while unvisited_targets:
+			try:
+				if distance_matrix is not None:
+					tree = distance_matrix.row(current_room)
+				else:
+					tree = self.shortest_path_tree(current_room, unvisited_targets)
+			except (nx.NodeNotFound, KeyError):
+				raise ValueError(f"Node '{current_room}' not found in graph during NN search.")
+
 			nearest_target = None
 			shortest_segment_distance = math.inf
 
 			for target in unvisited_targets:
-				try:
-					distance = nx.dijkstra_path_length(
-						self.graph, current_room, target, weight='weight'
-					)
-					if distance < shortest_segment_distance:
-						shortest_segment_distance = distance
-						nearest_target = target
-				except nx.NetworkXNoPath:
+				if not tree.reaches(target):
 					raise ValueError('No path found between the given rooms.')
-				except KeyError:
-					raise ValueError(
-						f"Node '{current_room}' or '{target}' not found in graph during NN search."
-					)
+				distance = tree.distance(target)
+				if distance < shortest_segment_distance:
+					shortest_segment_distance = distance
+					nearest_target = target
 
 			if nearest_target is None:
 				raise ValueError(
 					f"Could not find nearest neighbor from '{current_room}' among remaining targets: {unvisited_targets}"
 				)
 
-			try:
-				segment_nodes = nx.dijkstra_path(
-					self.graph, current_room, nearest_target, weight='weight'
-				)
-			except (nx.NetworkXNoPath, KeyError):
-				raise ValueError('No path found between the given rooms after distance check.')
-
+			segment_nodes = tree.path(nearest_target)
 			full_node_path.extend(segment_nodes[1:])
 			total_distance += shortest_segment_distance
 			current_room = nearest_target
@@ -165,3 +1204,168 @@ class SensorGraph:
 		full_sensor_path_coords = self._get_path_coordinates(full_node_path, all_tour_rooms)
 
 		return full_sensor_path_coords, total_distance
+
+	def forecast_edge_weights(self, room_ids: list, room_forecast: np.ndarray) -> np.ndarray:
+		"""
+		Computes the edge weights for forecast occupants of the rooms in one batch, with
+		the distances and floor penalties found by build_graph().
+
+		Args:
+		    room_ids (list): The room of every row of room_forecast; must include every
+		                     room with edges.
+		    room_forecast (np.ndarray): Occupants per room (rows) and time bucket (columns),
+		                                such as OccupancyForecast.forecast().
+
+		Returns:
+		    np.ndarray: float64 array of shape (edges, buckets) in edge index order.
+		"""
+		row_index = {room_id: row for row, room_id in enumerate(room_ids)}
+		edge_rooms = list(self._room_edges)
+		rooms = [self.rooms[room_id] for room_id in edge_rooms]
+		weights_by_room = room_weights(
+			room_forecast[[row_index[room_id] for room_id in edge_rooms]],
+			np.array([room.area for room in rooms], dtype=np.float64)[:, None],
+			np.array([room.crowd_factor for room in rooms], dtype=np.float64)[:, None],
+		)
+
+		edge_room_positions = np.empty(len(self._edge_factors), dtype=np.int64)
+		for position, room_id in enumerate(edge_rooms):
+			edge_room_positions[self._room_edges[room_id]] = position
+		distances = np.array([factors[3] for factors in self._edge_factors], dtype=np.float64)
+		multipliers = np.array([factors[4] for factors in self._edge_factors], dtype=np.float64)
+		return (distances[:, None] * weights_by_room[edge_room_positions]) * multipliers[:, None]
+
+	def find_multi_point_path_forecast(
+		self,
+		source_room: str,
+		target_rooms: list[str],
+		edge_weight_table: np.ndarray,
+		bucket_seconds: float,
+		seconds_per_weight: float,
+	):
+		"""
+		Nearest neighbor tour like find_multi_point_path_nearest_neighbor(), planned
+		against forecast weights instead of the current ones: every leg is a
+		time-dependent Dijkstra search (see CSRGraph.time_dependent_dijkstra()) that
+		departs when the previous leg arrives, so rooms are weighed by the occupancy
+		predicted for the time the tour passes them.
+
+		Args:
+		    source_room (str): The ID of the starting room.
+		    target_rooms (list): Target room IDs to visit.
+		    edge_weight_table (np.ndarray): Edge weights per time bucket, see
+		                                    forecast_edge_weights().
+		    bucket_seconds (float): Length of one time bucket.
+		    seconds_per_weight (float): Travel seconds per unit of weight.
+
+		Returns:
+		    tuple: (full_sensor_path_coords, total_distance) as for
+		           find_multi_point_path_nearest_neighbor(); the distance sums the
+		           forecast weights, so the tour takes total_distance * seconds_per_weight.
+
+		Raises:
+		    ValueError: If a tour room is not in the graph or two tour rooms are not connected.
+		"""
+		csr_graph = self.get_csr_graph()
+		arc_weight_table = np.empty(
+			(len(csr_graph.neighbors), edge_weight_table.shape[1]), dtype=np.float64
+		)
+		arc_weight_table[csr_graph.edge_arcs[:, 0]] = edge_weight_table
+		arc_weight_table[csr_graph.edge_arcs[:, 1]] = edge_weight_table
+
+		unvisited_targets = set(target_rooms) - {source_room}
+		current_room = source_room
+		tour_rooms = {source_room}
+		full_node_path = [source_room]
+		total_distance = 0.0
+		while unvisited_targets:
+			csr_graph, to_key, to_id, extra_arcs = self._csr_search_space(
+				current_room, unvisited_targets
+			)
+			source_index = to_key(current_room)
+			if source_index is None:
+				raise ValueError(f"Node '{current_room}' not found in graph during NN search.")
+			dist, pred = csr_graph.time_dependent_dijkstra(
+				source_index,
+				arc_weight_table,
+				bucket_seconds,
+				seconds_per_weight,
+				{to_key(target) for target in unvisited_targets} - {None},
+				extra_arcs,
+				departure=total_distance * seconds_per_weight,
+			)
+			tree = ShortestPathTree(current_room, dist, pred, to_key=to_key, to_id=to_id)
+			if not all(tree.reaches(target) for target in unvisited_targets):
+				raise ValueError('No path found between the given rooms.')
+
+			nearest_target = min(unvisited_targets, key=tree.distance)
+			full_node_path.extend(tree.path(nearest_target)[1:])
+			total_distance += tree.distance(nearest_target)
+			current_room = nearest_target
+			tour_rooms.add(current_room)
+			unvisited_targets.remove(current_room)
+
+		return self._get_path_coordinates(full_node_path, tour_rooms), total_distance
+
+	def _tour_legs(self, tour_rooms: list) -> dict:
+		"""
+		Returns {room_id: leg} where each leg answers reaches/distance/path queries from
+		that room to the other tour rooms: a distance matrix row when an up-to-date
+		matrix covers the tour, otherwise one single-source search per room.
+		"""
+		distance_matrix = self._current_distance_matrix(tour_rooms)
+		legs = {}
+		for room_id in tour_rooms:
+			if distance_matrix is not None:
+				legs[room_id] = distance_matrix.row(room_id)
+				continue
+			try:
+				legs[room_id] = self.shortest_path_tree(room_id, tour_rooms)
+			except (nx.NodeNotFound, KeyError):
+				raise ValueError(f"Node '{room_id}' not found in graph during tour planning.")
+		return legs
+
+	def find_multi_point_path_optimized(
+		self, source_room: str, target_rooms: list[str], time_budget: float = 0.05
+	):
+		"""
+		Finds a short path starting at source_room that visits all target_rooms.
+		Distances between all tour rooms are computed once (or read from the distance
+		matrix) and the visiting order is chosen by TourOptimizer: exact Held-Karp for
+		small tours, nearest neighbor improved by 2-opt/Or-opt within time_budget otherwise.
+
+		Args:
+		    source_room (str): The ID of the starting room.
+		    target_rooms (list): Target room IDs to visit.
+		    time_budget (float): Wall-clock seconds the local search may use.
+
+		Returns:
+		    tuple: (full_sensor_path_coords, total_distance) as for
+		           find_multi_point_path_nearest_neighbor().
+
+		Raises:
+		    ValueError: If a tour room is not in the graph or two tour rooms are not connected.
+		"""
+		tour_rooms = [source_room] + [
+			room_id for room_id in dict.fromkeys(target_rooms) if room_id != source_room
+		]
+		legs = self._tour_legs(tour_rooms)
+
+		distances = []
+		for room_id in tour_rooms:
+			leg = legs[room_id]
+			if not all(leg.reaches(other_room) for other_room in tour_rooms):
+				raise ValueError('No path found between the given rooms.')
+			distances.append([leg.distance(other_room) for other_room in tour_rooms])
+
+		order, _ = TourOptimizer(time_budget=time_budget).optimize(distances)
+
+		full_node_path = [source_room]
+		total_distance = 0.0
+		for from_index, to_index in zip(order, order[1:]):
+			leg = legs[tour_rooms[from_index]]
+			full_node_path.extend(leg.path(tour_rooms[to_index])[1:])
+			total_distance += distances[from_index][to_index]
+
+		full_sensor_path_coords = self._get_path_coordinates(full_node_path, set(tour_rooms))
+		return full_sensor_path_coords, total_distance
@@ -0,0 +1,383 @@
+import json
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+from .sensor_graph import SensorGraph
+
+# Snapshots (structure plus one weights version) every worker process keeps attached.
+WORKER_CACHE_SIZE = 8
+
+
+class SharedBlock(NamedTuple):
+	"""Name and array layout ((key, dtype, shape, byte offset), ...) of a shared memory block."""
+
+	name: str
+	layout: tuple
+
+
+class SnapshotHandle(NamedTuple):
+	"""The small, picklable part of a GraphSnapshot that is sent to worker processes."""
+
+	structure: SharedBlock
+	weights: SharedBlock
+	heuristic_scale: float
+
+
+def create_block(arrays: dict) -> tuple:
+	"""
+	Copies named NumPy arrays into one new shared memory block.
+
+	Args:
+	    arrays (dict): Mapping {key: np.ndarray}.
+
+	Returns:
+	    tuple: (SharedMemory, SharedBlock) for the new block.
+	"""
+	layout = []
+	size = 0
+	for key, array in arrays.items():
+		size = -(-size // 8) * 8
+		layout.append((key, array.dtype.str, array.shape, size))
+		size += array.nbytes
+
+	memory = SharedMemory(create=True, size=max(size, 1))
+	for (_, dtype, shape, offset), array in zip(layout, arrays.values()):
+		np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)[...] = array
+	return memory, SharedBlock(memory.name, tuple(layout))
+
+
+def attach_block(block: SharedBlock) -> tuple:
+	"""
+	Maps an existing shared memory block without copying it.
+
+	Returns:
+	    tuple: (SharedMemory, {key: np.ndarray view into the block}).
+	"""
+	memory = SharedMemory(name=block.name)
+	arrays = {
+		key: np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+		for key, dtype, shape, offset in block.layout
+	}
+	return memory, arrays
+
+
+def _release_block(memory: SharedMemory, unlink: bool = False):
+	"""Closes (and optionally unlinks) a block; views still in use keep it mapped."""
+	try:
+		memory.close()
+	except BufferError:
+		pass
+	if unlink:
+		memory.unlink()
+
+
+class GraphSnapshot:
+	def __init__(self, sensor_graph: SensorGraph):
+		"""
+		Publishes the CSR arrays of a built SensorGraph in shared memory so that solver
+		processes can search it without their own copy. The structure (offsets,
+		neighbors, coordinates, room memberships and IDs) is written once; the arc
+		weights live in a separate block that is replaced whenever the graph's
+		weights_version changes.
+
+		Args:
+		    sensor_graph (SensorGraph): A built graph.
+		"""
+		csr_graph = sensor_graph.get_csr_graph()
+		room_sensors = sensor_graph.room_sensor_indices(csr_graph)
+		room_ids = list(room_sensors)
+		memberships = [
+			(sensor_index, room_position)
+			for room_position, room_id in enumerate(room_ids)
+			for sensor_index in room_sensors[room_id]
+		]
+		ids = json.dumps({'node_ids': csr_graph.node_ids, 'room_ids': room_ids}).encode()
+
+		structure_memory, self.structure = create_block(
+			{
+				'offsets': csr_graph.offsets,
+				'neighbors': csr_graph.neighbors,
+				'coordinates': csr_graph.coordinates,
+				'memberships': np.asarray(memberships, dtype=np.int64).reshape(-1, 2),
+				'ids': np.frombuffer(ids, dtype=np.uint8),
+			}
+		)
+		self.weights = None
+		self.weights_version = None
+		# {block name: SharedMemory} of the structure and every weights block in use.
+		self._memory = {self.structure.name: structure_memory}
+		self._users = Counter()
+		self._closed = False
+		self._lock = threading.Lock()
+
+	def acquire(self, sensor_graph: SensorGraph) -> SnapshotHandle:
+		"""
+		Returns a handle for the graph's current weights, publishing them first if they
+		changed. Must be called while the graph is not being modified, and every handle
+		must be given back with release().
+
+		Raises:
+		    RuntimeError: If the snapshot has been closed.
+		"""
+		snapshot = sensor_graph.current_weights()
+		with self._lock:
+			if self._closed:
+				raise RuntimeError('The graph snapshot is closed.')
+			if self.weights_version != snapshot.version:
+				previous = self.weights
+				memory, self.weights = create_block(
+					{'weights': snapshot.arc_weights(sensor_graph.get_csr_graph())}
+				)
+				self._memory[self.weights.name] = memory
+				self.weights_version = snapshot.version
+				if previous is not None:
+					self._retire(previous.name)
+
+			self._users[self.structure.name] += 1
+			self._users[self.weights.name] += 1
+			return SnapshotHandle(self.structure, self.weights, snapshot.heuristic_scale)
+
+	def release(self, handle: SnapshotHandle):
+		"""
+		Gives back a handle; superseded weight blocks, and every block of a closed
+		snapshot, are freed once unused.
+		"""
+		with self._lock:
+			self._users[handle.structure.name] -= 1
+			self._users[handle.weights.name] -= 1
+			if self._closed:
+				self._retire(handle.structure.name)
+			if self._closed or handle.weights.name != self.weights.name:
+				self._retire(handle.weights.name)
+
+	def close(self):
+		"""
+		Frees every block no handle is using; blocks still held by handles are freed
+		when the last of them is released.
+		"""
+		with self._lock:
+			if self._closed:
+				return
+			self._closed = True
+			for name in list(self._memory):
+				self._retire(name)
+
+	def _retire(self, name: str):
+		if self._users[name] > 0 or name not in self._memory:
+			return
+		del self._users[name]
+		_release_block(self._memory.pop(name), unlink=True)
+
+
+class SnapshotGraph(SensorGraph):
+	def __init__(self, csr_graph: CSRGraph, room_ids: list, memberships, heuristic_scale: float):
+		"""
+		A read-only SensorGraph view over shared CSR arrays, used inside solver
+		processes. Rooms are searched through the same room overlay as on the CSR
+		backend, so search results match SensorGraph(backend='csr'). Paths are
+		returned as sensor IDs rather than Sensor objects.
+
+		Args:
+		    csr_graph (CSRGraph): Graph whose arrays are views into shared memory.
+		    room_ids (list): Room ID for every room position in memberships.
+		    memberships (np.ndarray): (sensor index, room position) pairs, grouped by
+		                              room in the order of SensorGraph.room_sensor_indices().
+		    heuristic_scale (float): The parent graph's heuristic_scale().
+		"""
+		super().__init__([], backend='csr')
+		self._csr_graph = csr_graph
+		self._heuristic_scale = heuristic_scale
+		self._room_sensor_ids = {}
+		for sensor_index, room_position in memberships.tolist():
+			self._room_sensor_ids.setdefault(room_ids[room_position], []).append(
+				csr_graph.node_ids[sensor_index]
+			)
+		self.rooms = dict.fromkeys(room_ids)
+
+	def heuristic_scale(self) -> float:
+		return self._heuristic_scale
+
+	def _hierarchical_shortest_path(self, source: str, target: str):
+		# Snapshots carry no room floors; a plain search gives the same distances.
+		return self._csr_shortest_path(source, target, 'dijkstra')
+
+	def landmark_index(self):
+		# Snapshots carry no landmark index; 'alt' searches use the Euclidean bound only.
+		return None
+
+	def _ch_shortest_path(self, source: str, target: str):
+		# Snapshots carry no contraction hierarchy; a plain search gives the same distances.
+		return self._csr_shortest_path(source, target, 'dijkstra')
+
+	def _query_csr_graph(self) -> CSRGraph:
+		# The shared weights block already holds a single, fixed weights version.
+		return self._csr_graph
+
+	def _target_positions(self, target: str) -> list:
+		csr_graph = self._csr_graph
+		sensor_ids = (
+			[target] if target in csr_graph.node_index else self._room_sensor_ids.get(target, [])
+		)
+		return [
+			tuple(csr_graph.coordinates[csr_graph.node_index[sensor_id]])
+			for sensor_id in sensor_ids
+		]
+
+	def _get_path_coordinates(self, node_path: list, rooms_to_exclude: set) -> list:
+		return [
+			node_id
+			for node_id in node_path
+			if node_id not in rooms_to_exclude and node_id in self._csr_graph.node_index
+		]
+
+
+_structures = OrderedDict()
+_graphs = OrderedDict()
+
+
+def _remember(cache: OrderedDict, key, value):
+	cache[key] = value
+	cache.move_to_end(key)
+	while len(cache) > WORKER_CACHE_SIZE:
+		_, evicted = cache.popitem(last=False)
+		_release_block(evicted[0])
+
+
+def attached_graph(handle: SnapshotHandle) -> SnapshotGraph:
+	"""Returns the SnapshotGraph for a handle, attaching its blocks on first use."""
+	key = (handle.structure.name, handle.weights.name)
+	if key in _graphs:
+		_graphs.move_to_end(key)
+		return _graphs[key][1]
+
+	if handle.structure.name not in _structures:
+		memory, arrays = attach_block(handle.structure)
+		ids = json.loads(arrays['ids'].tobytes())
+		csr_graph = CSRGraph(
+			ids['node_ids'],
+			arrays['offsets'],
+			arrays['neighbors'],
+			np.empty(0, dtype=np.float64),
+			np.empty((0, 2), dtype=np.int64),
+			arrays['coordinates'],
+		)
+		_remember(_structures, handle.structure.name, (memory, csr_graph, ids, arrays))
+	_structures.move_to_end(handle.structure.name)
+	_, csr_graph, ids, arrays = _structures[handle.structure.name]
+
+	memory, weights = attach_block(handle.weights)
+	graph = SnapshotGraph(
+		csr_graph.with_weights(weights['weights']),
+		ids['room_ids'],
+		arrays['memberships'],
+		handle.heuristic_scale,
+	)
+	_remember(_graphs, key, (memory, graph))
+	return graph
+
+
+def solve_fastest_path(handle: SnapshotHandle, source_room: str, target_room: str, mode: str):
+	"""Worker task: fastest path between two rooms; returns (sensor IDs, distance)."""
+	return attached_graph(handle).find_fastest_path(source_room, target_room, mode=mode)
+
+
+def solve_multi_point_path(
+	handle: SnapshotHandle,
+	source_room: str,
+	target_rooms: list,
+	optimizer: str = 'nearest_neighbor',
+	time_budget: float = 0.05,
+):
+	"""Worker task: tour through target_rooms; returns (sensor IDs, distance)."""
+	graph = attached_graph(handle)
+	if optimizer == 'optimized':
+		return graph.find_multi_point_path_optimized(
+			source_room, target_rooms, time_budget=time_budget
+		)
+	return graph.find_multi_point_path_nearest_neighbor(source_room, target_rooms)
+
+
+class SolverPool:
+	def __init__(self, max_workers: int = 4, max_snapshots: int = 16):
+		"""
+		A pool of solver processes that answer path queries on shared-memory
+		snapshots of cached topologies, so throughput scales across cores while
+		every building graph is held in memory only once.
+
+		Args:
+		    max_workers (int): Number of solver processes.
+		    max_snapshots (int): Topologies kept published; the least recently used
+		                         snapshot is closed beyond that.
+		"""
+		self.max_workers = max_workers
+		self.max_snapshots = max_snapshots
+		self._pool = None
+		self._snapshots = OrderedDict()
+		self._lock = threading.Lock()
+
+	def _get_pool(self) -> ProcessPoolExecutor:
+		with self._lock:
+			if self._pool is None:
+				self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+			return self._pool
+
+	def lease(self, topology) -> 'SnapshotLease':
+		"""
+		Pins the topology's current weights for one query, or the weights this thread
+		pinned with SensorGraph.pinned_weights().
+
+		Args:
+		    topology (CachedTopology): The topology to query.
+
+		Returns:
+		    SnapshotLease: Context manager that runs worker tasks on the snapshot.
+		"""
+		with self._lock:
+			snapshot = self._snapshots.get(topology.key)
+			if snapshot is None:
+				snapshot = GraphSnapshot(topology.sensor_graph)
+				self._snapshots[topology.key] = snapshot
+			self._snapshots.move_to_end(topology.key)
+			# Acquired before anything is evicted, so no other thread can close it first;
+			# evicted snapshots stay mapped until their last lease is released.
+			handle = snapshot.acquire(topology.sensor_graph)
+			while len(self._snapshots) > self.max_snapshots:
+				_, evicted = self._snapshots.popitem(last=False)
+				evicted.close()
+
+		return SnapshotLease(self, snapshot, handle)
+
+	def shutdown(self):
+		"""Stops the solver processes and frees every published snapshot."""
+		with self._lock:
+			pool, self._pool = self._pool, None
+			snapshots = list(self._snapshots.values())
+			self._snapshots.clear()
+		if pool is not None:
+			pool.shutdown(wait=True)
+		for snapshot in snapshots:
+			snapshot.close()
+
+
+class SnapshotLease:
+	def __init__(self, solver_pool: SolverPool, snapshot: GraphSnapshot, handle: SnapshotHandle):
+		"""One query's hold on a snapshot; releases the weights block on exit."""
+		self.solver_pool = solver_pool
+		self.snapshot = snapshot
+		self.handle = handle
+
+	def run(self, task, *args):
+		"""Runs a worker task such as solve_fastest_path(handle, *args) and waits for it."""
+		return self.solver_pool._get_pool().submit(task, self.handle, *args).result()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.snapshot.release(self.handle)
@@ -0,0 +1,60 @@
+import networkx as nx
+
+
+class ShortestPathTree:
+	def __init__(self, source, dist: dict, pred: dict, to_key=None, to_id=None):
+		"""
+		The result of one single-source Dijkstra search: final distances to every
+		settled node plus the predecessors needed to rebuild any of their paths.
+
+		Args:
+		    source: The ID of the node the search started from.
+		    dist (dict): Mapping {node key: distance} for every settled node.
+		    pred (dict): Mapping {node key: predecessor key}. A value may also be a list
+		                 of keys (as networkx returns) of which the first is used.
+		                 The entry of the source is never read.
+		    to_key (callable, optional): Maps a node ID to its key in dist/pred.
+		                                 Defaults to using the ID itself.
+		    to_id (callable, optional): Maps a key back to its node ID.
+		"""
+		self.source = source
+		self.dist = dist
+		self.pred = pred
+		self._to_key = to_key or (lambda node_id: node_id)
+		self._to_id = to_id or (lambda key: key)
+
+	def reaches(self, target) -> bool:
+		"""Returns True if target was settled by the search."""
+		return self._to_key(target) in self.dist
+
+	def distance(self, target) -> float:
+		"""
+		Returns the shortest distance from the source to target.
+
+		Raises:
+		    nx.NetworkXNoPath: If target was not reached.
+		"""
+		key = self._to_key(target)
+		if key not in self.dist:
+			raise nx.NetworkXNoPath(f'Node {target} not reachable from {self.source}')
+		return self.dist[key]
+
+	def path(self, target) -> list:
+		"""
+		Returns the node IDs on the shortest path from the source to target.
+
+		Raises:
+		    nx.NetworkXNoPath: If target was not reached.
+		"""
+		key = self._to_key(target)
+		if key not in self.dist:
+			raise nx.NetworkXNoPath(f'Node {target} not reachable from {self.source}')
+
+		source_key = self._to_key(self.source)
+		path = [self._to_id(key)]
+		while key != source_key:
+			parent = self.pred[key]
+			key = parent[0] if isinstance(parent, list) else parent
+			path.append(self._to_id(key))
+		path.reverse()
+		return path
@@ -0,0 +1,318 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .building_store import BuildingStore, field_reader
+from .occupancy_forecast import OccupancyForecast
+from .sensor_graph import SensorGraph
+from .weight_snapshot import WeightSnapshot
+
+# Room attributes that are not part of the topology hash.
+OCCUPANCY_FIELDS = ('name', 'crowd_factor', 'occupants', 'area', 'popularity_factor')
+# The subset of OCCUPANCY_FIELDS that Room.calculate_weight() depends on.
+WEIGHT_FIELDS = ('crowd_factor', 'occupants', 'area')
+
+
+def compute_topology_hash(room_schemas: list, sensor_schemas: list) -> str:
+	"""
+	Computes a content hash of the structural part of a building: sensor ids,
+	positions, verticality and room memberships, plus room ids and floors.
+	Occupancy-dependent fields are left out so crowd updates hash to the same topology.
+	Schema objects and dict records of the same building hash to the same value.
+
+	Args:
+	    room_schemas (list): Room schema objects (for example, RoomSchema) or records.
+	    sensor_schemas (list): Sensor schema objects (for example, SensorSchema) or records.
+
+	Returns:
+	    str: A hex digest identifying the topology.
+	"""
+	room_field = field_reader(room_schemas)
+	sensor_field = field_reader(sensor_schemas)
+	structure = {
+		'rooms': [[room_field(room, 'id'), room_field(room, 'floor')] for room in room_schemas],
+		'sensors': [
+			[
+				sensor_field(sensor, 'id'),
+				sensor_field(sensor, 'longitude'),
+				sensor_field(sensor, 'latitude'),
+				sensor_field(sensor, 'is_vertical'),
+				list(sensor_field(sensor, 'rooms')),
+			]
+			for sensor in sensor_schemas
+		],
+	}
+	encoded = json.dumps(structure, separators=(',', ':')).encode()
+	return hashlib.sha256(encoded).hexdigest()
+
+
+class CachedTopology:
+	def __init__(
+		self,
+		topology_hash: str,
+		room_mapping: dict,
+		sensor_graph: SensorGraph,
+		key=None,
+	):
+		"""
+		A built SensorGraph together with the rooms it was built from.
+
+		Args:
+		    topology_hash (str): The hash returned by compute_topology_hash().
+		    room_mapping (dict): Mapping {room_id: Room} shared with the graph's sensors.
+		    sensor_graph (SensorGraph): The graph built for this topology.
+		    key (hashable, optional): Identifies this graph among graphs of the same
+		                              topology, for example in SolverPool. Defaults to
+		                              topology_hash.
+		"""
+		self.topology_hash = topology_hash
+		self.key = topology_hash if key is None else key
+		self.room_mapping = room_mapping
+		self.sensor_graph = sensor_graph
+		# Fed with every occupancy this topology receives; used by forecast tours.
+		self.occupancy_forecast = OccupancyForecast(
+			list(room_mapping),
+			[room.occupants for room in room_mapping.values()],
+			[
+				1.0 if room.popularity_factor is None else room.popularity_factor
+				for room in room_mapping.values()
+			],
+		)
+		# Serializes occupancy writers. Searches pin a weight snapshot instead of
+		# taking this lock, so writers and searches do not wait for each other.
+		self.write_lock = threading.RLock()
+		with self.write_lock:
+			sensor_graph.refresh_room_weights(
+				(), room_states={room_id: room.copy() for room_id, room in room_mapping.items()}
+			)
+
+	def _room_states_with(self, rooms: list) -> dict | None:
+		"""
+		Returns the latest WeightSnapshot.room_states with fresh copies of the given
+		rooms, or None if there are none. Called under write_lock, after the rooms
+		were updated.
+		"""
+		if not rooms:
+			return None
+		room_states = dict(self.sensor_graph.latest_weights().room_states or {})
+		for room in rooms:
+			room_states[room.id] = room.copy()
+		return room_states
+
+	def apply_occupancy(self, room_schemas: list) -> WeightSnapshot:
+		"""
+		Copies occupancy-dependent fields from the given room schemas onto the
+		cached Room objects and refreshes the edge weights of the rooms that changed.
+		Copies of the changed rooms are published with the weights (see
+		WeightSnapshot.room_states). Every room's occupants are also passed to the
+		occupancy forecast. Holds write_lock while doing so.
+
+		Returns:
+		    WeightSnapshot: The weights for exactly this occupancy, taken under
+		                    write_lock. Pin it (SensorGraph.pinned_weights()) to search
+		                    them; the latest snapshot may already hold another
+		                    request's occupancy.
+		"""
+		schema_field = field_reader(room_schemas)
+		with self.write_lock:
+			changed_room_ids = []
+			changed_rooms = []
+			for schema in room_schemas:
+				room = self.room_mapping.get(schema_field(schema, 'id'))
+				if room is None:
+					continue
+				if any(
+					getattr(room, field) != schema_field(schema, field) for field in WEIGHT_FIELDS
+				):
+					changed_room_ids.append(room.id)
+				if any(
+					getattr(room, field) != schema_field(schema, field)
+					for field in OCCUPANCY_FIELDS
+				):
+					changed_rooms.append(room)
+				for field in OCCUPANCY_FIELDS:
+					setattr(room, field, schema_field(schema, field))
+
+			self.occupancy_forecast.observe(
+				{
+					schema_field(schema, 'id'): schema_field(schema, 'occupants')
+					for schema in room_schemas
+				}
+			)
+			self.sensor_graph.refresh_room_weights(
+				changed_room_ids, room_states=self._room_states_with(changed_rooms)
+			)
+			return self.sensor_graph.latest_weights()
+
+	def update_occupancy(self, occupancy: dict, crowd_factors: dict | None = None) -> int:
+		"""
+		Applies occupancy changes for some rooms and refreshes only their edge weights.
+		Unlike SensorGraph.update_room_occupancy(), rooms without sensors are accepted.
+		The occupants are also passed to the occupancy forecast. Holds write_lock while
+		doing so.
+
+		Args:
+		    occupancy (dict): Mapping {room_id: occupants} with the new occupant counts.
+		    crowd_factors (dict, optional): Mapping {room_id: crowd_factor} for rooms
+		                                    whose crowd factor changed as well.
+
+		Returns:
+		    int: The number of edges that were updated.
+
+		Raises:
+		    ValueError: If a room ID is not part of the topology. No changes are applied then.
+		"""
+		crowd_factors = crowd_factors or {}
+		unknown_rooms = {
+			room_id for room_id in [*occupancy, *crowd_factors] if room_id not in self.room_mapping
+		}
+		if unknown_rooms:
+			raise ValueError(f'Unknown rooms in occupancy update: {sorted(unknown_rooms)}')
+
+		with self.write_lock:
+			for room_id, occupants in occupancy.items():
+				self.room_mapping[room_id].occupants = occupants
+			for room_id, crowd_factor in crowd_factors.items():
+				self.room_mapping[room_id].crowd_factor = crowd_factor
+
+			self.occupancy_forecast.observe(occupancy)
+			changed_room_ids = set(occupancy) | set(crowd_factors)
+			return self.sensor_graph.refresh_room_weights(
+				changed_room_ids,
+				room_states=self._room_states_with(
+					[self.room_mapping[room_id] for room_id in changed_room_ids]
+				),
+			)
+
+
+def build_topology(
+	room_schemas: list,
+	sensor_schemas: list,
+	backend: str = 'networkx',
+	distance_matrix_options: dict | None = None,
+	topology_hash: str | None = None,
+	key=None,
+) -> CachedTopology:
+	"""
+	Builds the rooms, sensors and sensor graph of a building.
+
+	Args:
+	    room_schemas (list): Room schema objects or records.
+	    sensor_schemas (list): Sensor schema objects or records.
+	    backend (str): Graph backend of the SensorGraph.
+	    distance_matrix_options (dict, optional): Options for
+	                                              SensorGraph.enable_distance_matrix().
+	    topology_hash (str, optional): The precomputed compute_topology_hash() value.
+	    key (hashable, optional): See CachedTopology.
+
+	Returns:
+	    CachedTopology: The built topology.
+	"""
+	if topology_hash is None:
+		topology_hash = compute_topology_hash(room_schemas, sensor_schemas)
+
+	store = BuildingStore.from_schemas(room_schemas, sensor_schemas)
+	room_mapping = store.create_room_mapping()
+	sensors = store.create_sensors(room_mapping)
+	sensor_graph = SensorGraph(sensors, backend=backend, store=store)
+	sensor_graph.build_graph()
+	if distance_matrix_options is not None:
+		sensor_graph.enable_distance_matrix(**distance_matrix_options)
+	return CachedTopology(topology_hash, room_mapping, sensor_graph, key=key)
+
+
+class TopologyCache:
+	def __init__(
+		self,
+		max_entries: int = 16,
+		backend: str = 'networkx',
+		distance_matrix_options: dict | None = None,
+	):
+		"""
+		A bounded registry of built sensor graphs keyed by topology hash.
+		The least recently used topology is evicted once max_entries is exceeded.
+
+		Args:
+		    max_entries (int): Maximum number of topologies kept in memory.
+		    backend (str): Graph backend passed to every SensorGraph that is built.
+		    distance_matrix_options (dict, optional): If given, every built graph keeps a
+		                                              room distance matrix, created with
+		                                              SensorGraph.enable_distance_matrix(**options).
+		"""
+		self.max_entries = max_entries
+		self.backend = backend
+		self.distance_matrix_options = distance_matrix_options
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get_or_build(self, room_schemas: list, sensor_schemas: list) -> CachedTopology:
+		"""
+		Returns the cached topology for the given rooms and sensors, building and
+		storing it on the first request. On a cache hit only the occupancy-dependent
+		edge weights are refreshed from room_schemas.
+
+		Args:
+		    room_schemas (list): Room schema objects or records from the request.
+		    sensor_schemas (list): Sensor schema objects or records from the request.
+
+		Returns:
+		    CachedTopology: The topology with an up-to-date sensor graph.
+		"""
+		entry = self._lookup_or_build(room_schemas, sensor_schemas)
+		entry.apply_occupancy(room_schemas)
+		return entry
+
+	@contextmanager
+	def checkout(self, room_schemas: list, sensor_schemas: list):
+		"""
+		Like get_or_build(), as a context manager around one request. Searches do not
+		modify the shared graph (rooms are endpoints of a per-search overlay), so
+		concurrent requests for the same building are not serialized. Instead, the
+		weights published for this request's occupancy are pinned for the calling
+		thread until the block exits, so a concurrent request with other occupancy
+		cannot change what this one searches; SensorGraph.pinned_weights() inside the
+		block returns that snapshot.
+
+		Yields:
+		    CachedTopology: The topology with an up-to-date sensor graph.
+		"""
+		entry = self._lookup_or_build(room_schemas, sensor_schemas)
+		weights = entry.apply_occupancy(room_schemas)
+		with entry.sensor_graph.pinned_weights(weights):
+			yield entry
+
+	def _lookup_or_build(self, room_schemas: list, sensor_schemas: list) -> CachedTopology:
+		topology_hash = compute_topology_hash(room_schemas, sensor_schemas)
+
+		with self._lock:
+			entry = self._entries.get(topology_hash)
+			if entry is not None:
+				self._entries.move_to_end(topology_hash)
+				return entry
+
+		entry = build_topology(
+			room_schemas,
+			sensor_schemas,
+			backend=self.backend,
+			distance_matrix_options=self.distance_matrix_options,
+			topology_hash=topology_hash,
+		)
+
+		with self._lock:
+			# Another thread may have built the same topology meanwhile; keep the first.
+			entry = self._entries.setdefault(topology_hash, entry)
+			self._entries.move_to_end(topology_hash)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+		return entry
+
+	def clear(self):
+		"""Removes every cached topology."""
+		with self._lock:
+			self._entries.clear()
+
+	def __len__(self):
+		return len(self._entries)
@@ -0,0 +1,196 @@
+import time
+
+import numpy as np
+
+
+class TourOptimizer:
+	def __init__(self, time_budget: float = 0.05, exact_max_stops: int = 10):
+		"""
+		Orders the stops of an open tour that starts at index 0 of a distance matrix
+		and visits every other index once, without returning to the start.
+
+		Small tours are solved exactly with Held-Karp dynamic programming. Larger
+		tours start from the nearest-neighbor order and are improved with 2-opt and
+		Or-opt moves until no move helps or the time budget is used up.
+
+		Args:
+		    time_budget (float): Wall-clock seconds the local search may use.
+		    exact_max_stops (int): Largest number of stops (excluding the start) that
+		                           is solved exactly.
+		"""
+		self.time_budget = time_budget
+		self.exact_max_stops = exact_max_stops
+
+	def optimize(self, distances) -> tuple:
+		"""
+		Args:
+		    distances (array-like): (n, n) matrix; distances[i][j] is the cost from i to j.
+
+		Returns:
+		    tuple: (order, cost) where order lists indices starting with 0.
+		"""
+		distances = np.asarray(distances, dtype=np.float64)
+		stops = len(distances) - 1
+		if stops <= 0:
+			return [0], 0.0
+		if stops <= self.exact_max_stops:
+			return self.held_karp(distances)
+
+		deadline = time.perf_counter() + self.time_budget
+		matrix = distances.tolist()
+		order = self.nearest_neighbor(matrix)
+		order = self.local_search(order, matrix, deadline)
+		return order, self.tour_cost(order, matrix)
+
+	@staticmethod
+	def tour_cost(order: list, matrix: list) -> float:
+		"""Returns the cost of visiting the indices in order."""
+		return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+	@staticmethod
+	def nearest_neighbor(matrix: list) -> list:
+		"""Greedy order that always moves to the closest unvisited index."""
+		order = [0]
+		unvisited = set(range(1, len(matrix)))
+		while unvisited:
+			current = order[-1]
+			nearest = min(unvisited, key=lambda index: (matrix[current][index], index))
+			order.append(nearest)
+			unvisited.remove(nearest)
+		return order
+
+	@staticmethod
+	def held_karp(distances: np.ndarray) -> tuple:
+		"""
+		Exact open-tour solution by dynamic programming over subsets, O(2^k * k^2).
+		dp[mask, j] is the cheapest way to start at 0, visit the stops in mask and end at j.
+		"""
+		stops = len(distances) - 1
+		between_stops = distances[1:, 1:]
+		full_mask = (1 << stops) - 1
+		dp = np.full((full_mask + 1, stops), np.inf)
+		parent = np.full((full_mask + 1, stops), -1, dtype=np.int64)
+		bits = 1 << np.arange(stops)
+		dp[bits, np.arange(stops)] = distances[0, 1:]
+
+		for mask in range(1, full_mask + 1):
+			members = np.flatnonzero(mask & bits)
+			if len(members) < 2:
+				continue
+			previous_masks = mask ^ bits[members]
+			costs = dp[previous_masks] + between_stops[:, members].T
+			best = np.argmin(costs, axis=1)
+			dp[mask, members] = costs[np.arange(len(members)), best]
+			parent[mask, members] = best
+
+		last = int(np.argmin(dp[full_mask]))
+		cost = float(dp[full_mask, last])
+		order = []
+		mask = full_mask
+		while last != -1:
+			order.append(last + 1)
+			previous = int(parent[mask, last])
+			mask ^= 1 << last
+			last = previous
+		order.append(0)
+		order.reverse()
+		return order, cost
+
+	def local_search(self, order: list, matrix: list, deadline: float) -> list:
+		"""
+		Applies improving 2-opt and Or-opt moves until none is left or deadline passes.
+		Moves are rated by the cost of the edges they change; only an accepted move
+		builds a new tour.
+		"""
+		best_cost = self.tour_cost(order, matrix)
+		improved = True
+		while improved and time.perf_counter() < deadline:
+			improved = False
+			for delta, move in self._moves(order, matrix):
+				if time.perf_counter() >= deadline:
+					break
+				if delta < -1e-12 * max(1.0, abs(best_cost)):
+					order = self._apply_move(order, move)
+					best_cost = self.tour_cost(order, matrix)
+					improved = True
+					break
+		return order
+
+	@staticmethod
+	def _moves(order: list, matrix: list):
+		"""
+		Yields (cost change, move) for every 2-opt reversal and Or-opt segment move of
+		order, see _apply_move(). Prefix sums of the path cost in both directions give
+		the cost of a reversed stretch in O(1), so asymmetric distances stay exact.
+		"""
+		length = len(order)
+		forward = [0.0]
+		backward = [0.0]
+		for a, b in zip(order, order[1:]):
+			forward.append(forward[-1] + matrix[a][b])
+			backward.append(backward[-1] + matrix[b][a])
+
+		for i in range(1, length - 1):
+			before, first = order[i - 1], order[i]
+			for j in range(i + 1, length):
+				last = order[j]
+				delta = (
+					matrix[before][last]
+					- matrix[before][first]
+					+ backward[j]
+					- backward[i]
+					- forward[j]
+					+ forward[i]
+				)
+				if j + 1 < length:
+					after = order[j + 1]
+					delta += matrix[first][after] - matrix[last][after]
+				yield delta, ('reverse', i, j)
+
+		for segment_length in (1, 2, 3):
+			rest_length = length - segment_length
+			for start in range(1, rest_length + 1):
+				end = start + segment_length - 1
+				previous, first, last = order[start - 1], order[start], order[end]
+				removed = matrix[previous][first]
+				if end + 1 < length:
+					following = order[end + 1]
+					removed += matrix[last][following] - matrix[previous][following]
+				reversal = backward[end] - backward[start] - forward[end] + forward[start]
+				for position in range(1, rest_length + 1):
+					if position == start:
+						continue
+					# Insert between rest[position - 1] and rest[position], where rest is
+					# order without the segment.
+					before = order[position - 1 if position <= start else position + end - start]
+					gap = -removed
+					after = None
+					if position < rest_length:
+						after = order[position if position < start else position + segment_length]
+						gap -= matrix[before][after]
+					delta = gap + matrix[before][first]
+					if after is not None:
+						delta += matrix[last][after]
+					yield delta, ('move', start, segment_length, position, False)
+					if segment_length > 1:
+						delta = gap + reversal + matrix[before][last]
+						if after is not None:
+							delta += matrix[first][after]
+						yield delta, ('move', start, segment_length, position, True)
+
+	@staticmethod
+	def _apply_move(order: list, move: tuple) -> list:
+		"""
+		Returns the tour after a move from _moves(): ('reverse', i, j) reverses
+		order[i..j]; ('move', start, length, position, reverse) moves the segment of
+		length stops at start to position of the remaining tour, reversed if asked.
+		"""
+		if move[0] == 'reverse':
+			_, i, j = move
+			return order[:i] + order[i : j + 1][::-1] + order[j + 1 :]
+		_, start, segment_length, position, reverse = move
+		segment = order[start : start + segment_length]
+		rest = order[:start] + order[start + segment_length :]
+		if reverse:
+			segment.reverse()
+		return rest[:position] + segment + rest[position:]
@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class WeightSnapshot:
+	__slots__ = (
+		'version',
+		'edge_weights',
+		'heuristic_scale',
+		'decreased_version',
+		'room_states',
+		'_arc_weights',
+	)
+
+	def __init__(
+		self,
+		version: int,
+		edge_weights: list,
+		heuristic_scale: float,
+		arc_weights: np.ndarray | None = None,
+		decreased_version: int | None = None,
+		room_states: dict | None = None,
+	):
+		"""
+		One immutable version of a SensorGraph's edge weights. Writers never modify a
+		snapshot: they derive a new one with updated() and swap it in with a single
+		assignment, so a reader that pinned a snapshot sees the same weights for its
+		whole request without taking a lock.
+
+		Args:
+		    version (int): Increases with every weight change of the graph.
+		    edge_weights (list): Weight per edge index (the order of SensorGraph's
+		                         edges), followed by a 0.0 for edges that attach rooms.
+		    heuristic_scale (float): SensorGraph.heuristic_scale() for these weights.
+		    arc_weights (np.ndarray, optional): The same weights in CSR arc order.
+		    decreased_version (int, optional): The latest version in which some edge got
+		                                       cheaper. Defaults to version. A shortest
+		                                       path found at a later version stays
+		                                       shortest while its own edges keep
+		                                       their weights.
+		    room_states (dict, optional): {room_id: Room} copies of the rooms as these
+		                                  weights were computed from them, for
+		                                  responses that show a room's occupancy. The
+		                                  copies are never modified; None unless a
+		                                  CachedTopology publishes them.
+		"""
+		self.version = version
+		self.edge_weights = edge_weights
+		self.heuristic_scale = heuristic_scale
+		self.decreased_version = version if decreased_version is None else decreased_version
+		self.room_states = room_states
+		self._arc_weights = arc_weights
+
+	@property
+	def room_link_edge(self) -> int:
+		"""The edge index whose weight (0.0) is used by the arcs of virtual room nodes."""
+		return len(self.edge_weights) - 1
+
+	def arc_weights(self, csr_graph) -> np.ndarray:
+		"""
+		Returns the weights in the arc order of csr_graph as a read-only array,
+		computing them on first use.
+		"""
+		if self._arc_weights is None:
+			edge_weights = np.asarray(self.edge_weights, dtype=np.float64)[:-1]
+			arc_weights = np.empty(len(csr_graph.neighbors), dtype=np.float64)
+			arc_weights[csr_graph.edge_arcs[:, 0]] = edge_weights
+			arc_weights[csr_graph.edge_arcs[:, 1]] = edge_weights
+			arc_weights.flags.writeable = False
+			self._arc_weights = arc_weights
+		return self._arc_weights
+
+	def with_room_states(self, room_states: dict) -> 'WeightSnapshot':
+		"""Returns this version of the weights with other room states."""
+		return WeightSnapshot(
+			self.version,
+			self.edge_weights,
+			self.heuristic_scale,
+			self._arc_weights,
+			decreased_version=self.decreased_version,
+			room_states=room_states,
+		)
+
+	def updated(
+		self,
+		edge_indices: list,
+		weights: list,
+		heuristic_scale: float,
+		csr_graph=None,
+		room_states: dict | None = None,
+	) -> 'WeightSnapshot':
+		"""
+		Returns the next version with the given edges reweighted; this snapshot is
+		left unchanged. Arc weights are carried over if they were already computed.
+
+		Args:
+		    edge_indices (list): Indices of the edges that changed.
+		    weights (list): The new weight of each edge.
+		    heuristic_scale (float): The heuristic scale for the new weights.
+		    csr_graph (CSRGraph, optional): Graph whose arc order the arc weights use.
+		    room_states (dict, optional): The new room states; defaults to these.
+		"""
+		edge_weights = self.edge_weights.copy()
+		decreased = False
+		for edge_index, weight in zip(edge_indices, weights):
+			decreased = decreased or weight < edge_weights[edge_index]
+			edge_weights[edge_index] = weight
+
+		arc_weights = None
+		if self._arc_weights is not None and csr_graph is not None:
+			arcs = csr_graph.edge_arcs[np.asarray(edge_indices, dtype=np.int64)]
+			new_weights = np.asarray(weights, dtype=np.float64)
+			arc_weights = self._arc_weights.copy()
+			arc_weights[arcs[:, 0]] = new_weights
+			arc_weights[arcs[:, 1]] = new_weights
+			arc_weights.flags.writeable = False
+
+		version = self.version + 1
+		return WeightSnapshot(
+			version,
+			edge_weights,
+			heuristic_scale,
+			arc_weights,
+			decreased_version=version if decreased else self.decreased_version,
+			room_states=self.room_states if room_states is None else room_states,
+		)
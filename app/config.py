@@ -13,3 +13,49 @@ CORS_SETTINGS = {
 	'allow_methods': ['*'],  # Allow all methods (GET, POST, etc...)
 	'allow_headers': ['*'],  # Allow all headers
 }
+
+
+# Number of building topologies (built sensor graphs) kept in memory between requests
+TOPOLOGY_CACHE_SIZE = 16
+
+# Engine used for path queries: 'networkx' or 'csr' (array-backed, see app/classes/csr_graph.py)
+GRAPH_BACKEND = 'networkx'
+
+# Optional precomputed room-to-room distance matrix used by multi-point tours.
+# Set DISTANCE_MATRIX_ENABLED to True to build it (in the background) for every cached topology.
+DISTANCE_MATRIX_ENABLED = False
+DISTANCE_MATRIX_MAX_BYTES = 256 * 1024 * 1024
+# Restrict the matrix to these room IDs (e.g. exhibits, exits) in very large buildings; None = all
+DISTANCE_MATRIX_ROOM_IDS = None
+
+# Default wall-clock budget (milliseconds) for improving multi-point tours with 2-opt/Or-opt
+TOUR_TIME_BUDGET_MS = 50
+
+# Walking seconds per unit of edge weight, used by 'forecast' tours to tell when a room is reached.
+# Coordinates are taken as meters: an occupied room weighs about 1 per meter, walked at 1.4 m/s.
+FORECAST_SECONDS_PER_WEIGHT = 1 / 1.4
+
+# Path computations run off the event loop on a bounded pool: 'thread' or 'process'
+PATH_EXECUTOR_KIND = 'thread'
+PATH_EXECUTOR_MAX_WORKERS = 4
+# Requests admitted at once (running plus queued); more are rejected with 503
+PATH_EXECUTOR_MAX_IN_FLIGHT = 32
+# Seconds a request may wait for a free worker before it is rejected with 503
+PATH_EXECUTOR_QUEUE_TIMEOUT = 5.0
+
+# Answer path queries on solver processes that share graph snapshots in shared memory,
+# so throughput scales across cores without one graph copy per process
+SOLVER_POOL_ENABLED = False
+SOLVER_POOL_WORKERS = 4
+
+# Streamed occupancy events are coalesced per room for this many seconds, then applied in one batch
+OCCUPANCY_INGEST_WINDOW = 0.2
+
+# Cache fastest-path results; an entry is dropped once a weight update could change its path
+PATH_CACHE_ENABLED = True
+PATH_CACHE_SIZE = 4096
+# Seconds after which a cached path is recomputed even if no weight update touched it
+PATH_CACHE_TTL = 30.0
+
+# Source/target pairs whose alternative routes are handed out in turn to spread visitors
+ROUTE_DISPERSION_SIZE = 4096
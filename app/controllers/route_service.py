@@ -1,9 +1,100 @@
-from ..classes.room import Room
+from contextlib import nullcontext
+
+from ..classes.building_registry import BuildingRegistry
+from ..classes.occupancy_ingestor import OccupancyIngestor
+from ..classes.path_executor import PathExecutor
+from ..classes.path_result_cache import PathResultCache
+from ..classes.route_dispersion import RouteDispersion
 from ..classes.sensor import Sensor
-from ..classes.sensor_graph import SensorGraph
-from ..schemas.path import FastestPathRequest, MultiplePointsRequest
+from ..classes.shared_graph import SolverPool, solve_fastest_path, solve_multi_point_path
+from ..classes.topology_cache import TopologyCache
+from ..config import (
+	DISTANCE_MATRIX_ENABLED,
+	DISTANCE_MATRIX_MAX_BYTES,
+	DISTANCE_MATRIX_ROOM_IDS,
+	FORECAST_SECONDS_PER_WEIGHT,
+	GRAPH_BACKEND,
+	OCCUPANCY_INGEST_WINDOW,
+	PATH_CACHE_ENABLED,
+	PATH_CACHE_SIZE,
+	PATH_CACHE_TTL,
+	PATH_EXECUTOR_KIND,
+	PATH_EXECUTOR_MAX_IN_FLIGHT,
+	PATH_EXECUTOR_MAX_WORKERS,
+	PATH_EXECUTOR_QUEUE_TIMEOUT,
+	ROUTE_DISPERSION_SIZE,
+	SOLVER_POOL_ENABLED,
+	SOLVER_POOL_WORKERS,
+	TOPOLOGY_CACHE_SIZE,
+	TOUR_TIME_BUDGET_MS,
+)
+from ..schemas.building import (
+	BuildingAlternativePathsRequest,
+	BuildingFastestPathRequest,
+	BuildingMultiplePointsRequest,
+	BuildingRequest,
+	OccupancyUpdateRequest,
+	occupancy_event_adapter,
+)
+from ..schemas.path import (
+	AlternativePathsRequest,
+	BatchPathRequest,
+	FastestPathRequest,
+	MultiplePointsRequest,
+	RoomDistancesRequest,
+)
+from pydantic import ValidationError
 import networkx as nx
 
+topology_cache = TopologyCache(
+	max_entries=TOPOLOGY_CACHE_SIZE,
+	backend=GRAPH_BACKEND,
+	distance_matrix_options=(
+		{'room_ids': DISTANCE_MATRIX_ROOM_IDS, 'max_bytes': DISTANCE_MATRIX_MAX_BYTES}
+		if DISTANCE_MATRIX_ENABLED
+		else None
+	),
+)
+
+building_registry = BuildingRegistry(
+	backend=GRAPH_BACKEND,
+	distance_matrix_options=topology_cache.distance_matrix_options,
+)
+
+occupancy_ingestor = OccupancyIngestor(building_registry, window=OCCUPANCY_INGEST_WINDOW)
+
+path_executor = PathExecutor(
+	kind=PATH_EXECUTOR_KIND,
+	max_workers=PATH_EXECUTOR_MAX_WORKERS,
+	max_in_flight=PATH_EXECUTOR_MAX_IN_FLIGHT,
+	queue_timeout=PATH_EXECUTOR_QUEUE_TIMEOUT,
+)
+
+# Registered buildings live in this process, so jobs on them always run on threads,
+# with the same admission limits as the path executor.
+building_executor = (
+	path_executor
+	if path_executor.kind == 'thread'
+	else PathExecutor(
+		kind='thread',
+		max_workers=PATH_EXECUTOR_MAX_WORKERS,
+		max_in_flight=PATH_EXECUTOR_MAX_IN_FLIGHT,
+		queue_timeout=PATH_EXECUTOR_QUEUE_TIMEOUT,
+	)
+)
+
+solver_pool = (
+	SolverPool(max_workers=SOLVER_POOL_WORKERS, max_snapshots=TOPOLOGY_CACHE_SIZE)
+	if SOLVER_POOL_ENABLED
+	else None
+)
+
+path_result_cache = (
+	PathResultCache(max_entries=PATH_CACHE_SIZE, ttl=PATH_CACHE_TTL) if PATH_CACHE_ENABLED else None
+)
+
+route_dispersion = RouteDispersion(max_entries=ROUTE_DISPERSION_SIZE)
+
 
 def check_room_id_is_valid(room_id: str, room_mapping: dict) -> bool:
 	"""
@@ -17,89 +108,670 @@ def check_room_id_is_valid(room_id: str, room_mapping: dict) -> bool:
 	return room_id in room_mapping
 
 
+def check_room_is_connected(room_id: str, sensor_graph) -> bool:
+	"""
+	Checks if at least one sensor of the graph belongs to the room, i.e. whether the
+	room can be the start or end point of a search.
+	"""
+	return room_id in sensor_graph.rooms
+
+
+def sensors_from_ids(sensor_ids: list, sensor_graph) -> list:
+	"""Maps sensor IDs returned by a solver process back to the graph's Sensor objects."""
+	return [sensor_graph.graph.nodes[sensor_id]['sensor'] for sensor_id in sensor_ids]
+
+
+def response_sensors(path_sensors: list, weights) -> list:
+	"""
+	Copies the sensors of a found path with their rooms taken from the room states
+	of the weights the path was searched with (WeightSnapshot.room_states). The
+	shared Room objects may already hold another request's occupancy by the time
+	the response is encoded; the copies keep showing this request's.
+	"""
+	room_states = weights.room_states
+	if room_states is None:
+		return path_sensors
+	return [
+		Sensor(
+			sensor.id,
+			sensor.longitude,
+			sensor.latitude,
+			sensor.is_vertical,
+			[room_states.get(room.id, room) for room in sensor.rooms],
+		)
+		for sensor in path_sensors
+	]
+
+
 def create_fastest_path(request_body: FastestPathRequest):
 	"""
 	Processes a FastestPathRequest to compute the fastest path using a sensor graph.
+	The search runs in this process, or on the solver pool when it is enabled.
 	Raises:
 	    ValueError: If source or target room is not found or no path can be found.
 	"""
-	room_mapping = Room.create_room_mapping_from_schemas(request_body.rooms or [])
+	return fastest_path_in_topology(
+		lambda: topology_cache.checkout(request_body.rooms or [], request_body.sensors or []),
+		request_body.source_room,
+		request_body.target_room,
+		request_body.mode,
+	)
 
-	sensors = Sensor.create_sensors_from_schemas(request_body.sensors or [], room_mapping)
 
-	source_room_id = request_body.source_room
-	target_room_id = request_body.target_room
+def create_building_fastest_path(building_id: str, request_body: BuildingFastestPathRequest):
+	"""
+	Computes the fastest path in a registered building, see create_fastest_path().
+	Raises:
+	    BuildingNotFoundError: If the building is not registered.
+	    ValueError: If source or target room is not found or no path can be found.
+	"""
+	return fastest_path_in_topology(
+		lambda: building_registry.checkout(building_id),
+		request_body.source_room,
+		request_body.target_room,
+		request_body.mode,
+	)
+
+
+def fastest_path_in_topology(
+	checkout, source_room_id: str, target_room_id: str, mode: str = 'dijkstra'
+):
+	"""
+	Computes the fastest path between two rooms of a topology, or returns it from
+	the path result cache when no weight update since could have changed it.
+	Args:
+	    checkout (callable): Returns a context manager yielding a CachedTopology with
+	                         the request's weights pinned, for example
+	                         TopologyCache.checkout() or BuildingRegistry.checkout().
+	    source_room_id (str): ID of the source room.
+	    target_room_id (str): ID of the target room.
+	    mode (str): Search algorithm, see SensorGraph.find_fastest_path().
+	Returns:
+	    dict: The path's Sensor objects, its distance and the weights version it used.
+	Raises:
+	    ValueError: If source or target room is not found or no path can be found.
+	"""
+	with checkout() as topology, topology.sensor_graph.pinned_weights() as weights:
+		check_path_rooms(topology, source_room_id, target_room_id)
+		sensor_graph = topology.sensor_graph
+
+		cache_key = (topology.key, source_room_id, target_room_id, mode)
+		if path_result_cache is not None:
+			cached = path_result_cache.get(cache_key, sensor_graph, weights)
+			if cached is not None:
+				path_sensors, distance = cached
+				return {
+					'fastest_path': response_sensors(path_sensors, weights),
+					'distance': distance,
+					'weights_version': weights.version,
+				}
+
+		try:
+			if solver_pool is None:
+				path_sensors, distance = sensor_graph.find_fastest_path(
+					source_room_id, target_room_id, mode=mode
+				)
+				cache_path(cache_key, sensor_graph, weights, path_sensors, distance)
+				return {
+					'fastest_path': response_sensors(path_sensors, weights),
+					'distance': distance,
+					'weights_version': weights.version,
+				}
+
+			lease = solver_pool.lease(topology)
+		except nx.NetworkXNoPath:
+			raise ValueError('No path found between the given rooms.')
+		except KeyError as e:
+			raise ValueError(f'Graph error: Node {e} not found during pathfinding.')
+
+	# Outside the checkout: the solver process reads the leased snapshot.
+	with lease:
+		try:
+			sensor_ids, distance = lease.run(
+				solve_fastest_path, source_room_id, target_room_id, mode
+			)
+		except nx.NetworkXNoPath:
+			raise ValueError('No path found between the given rooms.')
+		except KeyError as e:
+			raise ValueError(f'Graph error: Node {e} not found during pathfinding.')
+
+	path_sensors = sensors_from_ids(sensor_ids, sensor_graph)
+	cache_path(cache_key, sensor_graph, weights, path_sensors, distance)
+	return {
+		'fastest_path': response_sensors(path_sensors, weights),
+		'distance': distance,
+		'weights_version': weights.version,
+	}
+
+
+def check_path_rooms(topology, source_room_id: str, target_room_id: str):
+	"""
+	Checks that the source and target room of a path query exist in the topology and
+	are connected to its graph.
+	Raises:
+	    ValueError: If source or target room is not valid or not connected.
+	"""
+	room_mapping = topology.room_mapping
 
 	if not check_room_id_is_valid(source_room_id, room_mapping):
 		raise ValueError(f"Source room '{source_room_id}' is not valid.")
 	if not check_room_id_is_valid(target_room_id, room_mapping):
 		raise ValueError(f"Target room '{target_room_id}' is not valid.")
 
-	sensor_graph = SensorGraph(sensors)
-	sensor_graph.build_graph()
-
-	sensor_graph.attach_rooms([source_room_id, target_room_id])
+	sensor_graph = topology.sensor_graph
 
-	if not sensor_graph.graph.has_node(source_room_id):
+	if not check_room_is_connected(source_room_id, sensor_graph):
 		raise ValueError(
 			f"Source room '{source_room_id}' is not connected to any sensor in the graph."
 		)
-	if not sensor_graph.graph.has_node(target_room_id):
+	if not check_room_is_connected(target_room_id, sensor_graph):
 		raise ValueError(
 			f"Target room '{target_room_id}' is not connected to any sensor in the graph."
 		)
 
-	try:
-		path_sensors, distance = sensor_graph.find_fastest_path(source_room_id, target_room_id)
 
-		return {'fastest_path': path_sensors, 'distance': distance}
-	except nx.NetworkXNoPath:
-		raise ValueError('No path found between the given rooms.')
-	except KeyError as e:
-		raise ValueError(f'Graph error: Node {e} not found during pathfinding.')
+def create_alternative_paths(request_body: AlternativePathsRequest):
+	"""
+	Computes up to k diverse routes between two rooms and assigns one of them, see
+	alternative_paths_in_topology().
+	Raises:
+	    ValueError: If source or target room is not found or no path can be found.
+	"""
+	return alternative_paths_in_topology(
+		lambda: topology_cache.checkout(request_body.rooms or [], request_body.sensors or []),
+		request_body,
+	)
+
+
+def create_building_alternative_paths(
+	building_id: str, request_body: BuildingAlternativePathsRequest
+):
+	"""
+	Computes alternative routes in a registered building, see create_alternative_paths().
+	Raises:
+	    BuildingNotFoundError: If the building is not registered.
+	    ValueError: If source or target room is not found or no path can be found.
+	"""
+	return alternative_paths_in_topology(
+		lambda: building_registry.checkout(building_id), request_body
+	)
+
+
+def alternative_paths_in_topology(checkout, request_body):
+	"""
+	Computes up to request_body.k diverse routes between two rooms of a topology (see
+	SensorGraph.find_alternative_paths()) and, if request_body.spread is set, picks
+	one of them with the route dispersion so that visitors asking for the same
+	rooms are spread over the routes in inverse proportion to their distance.
+	Otherwise the fastest route is picked. Always runs in this process.
+	Args:
+	    checkout (callable): Returns a context manager yielding a CachedTopology.
+	    request_body: An AlternativePathsRequest or BuildingAlternativePathsRequest.
+	Returns:
+	    dict: Every route's Sensor objects and distance, the index of the assigned
+	          route, whose path and distance are also given as fastest_path and
+	          distance, and the weights version the routes used.
+	Raises:
+	    ValueError: If source or target room is not found or no path can be found.
+	"""
+	source_room_id = request_body.source_room
+	target_room_id = request_body.target_room
+
+	with checkout() as topology, topology.sensor_graph.pinned_weights() as weights:
+		check_path_rooms(topology, source_room_id, target_room_id)
+		sensor_graph = topology.sensor_graph
+
+		try:
+			routes = sensor_graph.find_alternative_paths(
+				source_room_id,
+				target_room_id,
+				k=request_body.k,
+				max_shared=request_body.max_shared,
+				max_stretch=request_body.max_stretch,
+			)
+		except nx.NetworkXNoPath:
+			raise ValueError('No path found between the given rooms.')
+		except KeyError as e:
+			raise ValueError(f'Graph error: Node {e} not found during pathfinding.')
+
+	assigned = 0
+	if request_body.spread:
+		assigned = route_dispersion.assign(
+			(topology.key, source_room_id, target_room_id),
+			[tuple(sensor.id for sensor in path_sensors) for path_sensors, _ in routes],
+			[distance for _, distance in routes],
+		)
+	path_sensors, distance = routes[assigned]
+	return {
+		'fastest_path': response_sensors(path_sensors, weights),
+		'distance': distance,
+		'assigned_route': assigned,
+		'routes': [
+			{'path': response_sensors(path_sensors, weights), 'distance': distance}
+			for path_sensors, distance in routes
+		],
+		'weights_version': weights.version,
+	}
+
+
+def cache_path(cache_key: tuple, sensor_graph, weights, path_sensors: list, distance: float):
+	"""Stores a computed fastest path in the path result cache, if it is enabled."""
+	if path_result_cache is None:
+		return
+	edge_indices = sensor_graph.path_edge_indices([sensor.id for sensor in path_sensors])
+	path_result_cache.put(cache_key, sensor_graph, weights, path_sensors, distance, edge_indices)
+
+
+def path_cache_stats() -> dict:
+	"""Hit, miss and invalidation counters of the path result cache."""
+	if path_result_cache is None:
+		return {'enabled': False}
+	return {
+		'enabled': True,
+		'entries': len(path_result_cache),
+		**{
+			name: path_result_cache.stats[name]
+			for name in ('hits', 'misses', 'invalidated', 'expired', 'evicted')
+		},
+	}
 
 
 def create_multiple_points_path(request_body: MultiplePointsRequest):
 	"""
 	Finds a path visiting multiple target rooms starting from a source room
-	using the Nearest Neighbor heuristic on a sensor graph.
+	using the Nearest Neighbor heuristic on a sensor graph, or the tour optimizer
+	when the request asks for an optimized tour. The search runs in this process,
+	or on the solver pool when it is enabled.
 
 	Raises:
 	    ValueError: If source or target rooms are invalid, not found in the graph,
 	                or if a path cannot be completed between required points.
 	"""
-	room_mapping = Room.create_room_mapping_from_schemas(request_body.rooms or [])
+	return tour_in_topology(
+		lambda: topology_cache.checkout(request_body.rooms or [], request_body.sensors or []),
+		request_body.source_room,
+		request_body.target_rooms,
+		request_body.optimizer,
+		request_body.time_budget_ms,
+	)
 
-	sensors = Sensor.create_sensors_from_schemas(request_body.sensors or [], room_mapping)
 
-	source_room_id = request_body.source_room
-	target_room_ids = list(set(request_body.target_rooms) - {source_room_id})
+def create_building_multiple_points_path(
+	building_id: str, request_body: BuildingMultiplePointsRequest
+):
+	"""
+	Finds a path visiting multiple rooms of a registered building, see
+	create_multiple_points_path().
+
+	Raises:
+	    BuildingNotFoundError: If the building is not registered.
+	    ValueError: If the tour's rooms are invalid or cannot be connected.
+	"""
+	return tour_in_topology(
+		lambda: building_registry.checkout(building_id),
+		request_body.source_room,
+		request_body.target_rooms,
+		request_body.optimizer,
+		request_body.time_budget_ms,
+	)
+
+
+def tour_in_topology(
+	checkout,
+	source_room_id: str,
+	target_rooms: list,
+	optimizer: str = 'nearest_neighbor',
+	time_budget_ms: int | None = None,
+):
+	"""
+	Finds a path from the source room that visits every target room of a topology.
+
+	Args:
+	    checkout (callable): Returns a context manager yielding a CachedTopology.
+	                         Only called once the targets have been checked.
+	    source_room_id (str): ID of the source room.
+	    target_rooms (list): IDs of the rooms to visit; the source room is skipped.
+	    optimizer (str): 'nearest_neighbor', 'optimized' or 'forecast'. Forecast tours
+	                     always run in this process, where the topology's occupancy
+	                     forecast is kept.
+	    time_budget_ms (int, optional): Time budget of the optimized tour.
+
+	Returns:
+	    dict: The path's Sensor objects, its total distance and the weights version
+	          every leg was computed with.
+
+	Raises:
+	    ValueError: If source or target rooms are invalid, not found in the graph,
+	                or if a path cannot be completed between required points.
+	"""
+	target_room_ids = list(set(target_rooms) - {source_room_id})
+	time_budget = (time_budget_ms or TOUR_TIME_BUDGET_MS) / 1000
 
 	if not target_room_ids:
 		raise ValueError(
 			'Target rooms list must contain at least one room different from the source room.'
 		)
 
-	all_room_ids_in_tour = [source_room_id] + target_room_ids
-	for room_id in all_room_ids_in_tour:
-		if not check_room_id_is_valid(room_id, room_mapping):
-			raise ValueError(f"Room '{room_id}' in the tour is not valid.")
+	with checkout() as topology, topology.sensor_graph.pinned_weights() as weights:
+		room_mapping = topology.room_mapping
+
+		all_room_ids_in_tour = [source_room_id] + target_room_ids
+		for room_id in all_room_ids_in_tour:
+			if not check_room_id_is_valid(room_id, room_mapping):
+				raise ValueError(f"Room '{room_id}' in the tour is not valid.")
+
+		sensor_graph = topology.sensor_graph
+
+		for room_id in all_room_ids_in_tour:
+			if not check_room_is_connected(room_id, sensor_graph):
+				raise ValueError(f"Room '{room_id}' is not connected to any sensor in the graph.")
+
+		if solver_pool is None or optimizer == 'forecast':
+			try:
+				if optimizer == 'forecast':
+					forecast = topology.occupancy_forecast
+					sensor_objects_path, total_distance = (
+						sensor_graph.find_multi_point_path_forecast(
+							source_room_id,
+							target_room_ids,
+							sensor_graph.forecast_edge_weights(
+								forecast.room_ids, forecast.forecast()
+							),
+							forecast.bucket_seconds,
+							FORECAST_SECONDS_PER_WEIGHT,
+						)
+					)
+				elif optimizer == 'optimized':
+					sensor_objects_path, total_distance = (
+						sensor_graph.find_multi_point_path_optimized(
+							source_room_id, target_room_ids, time_budget=time_budget
+						)
+					)
+				else:
+					sensor_objects_path, total_distance = (
+						sensor_graph.find_multi_point_path_nearest_neighbor(
+							source_room_id,
+							target_room_ids,
+						)
+					)
+
+				return {
+					'fastest_path': response_sensors(sensor_objects_path, weights),
+					'distance': total_distance,
+					'weights_version': weights.version,
+				}
+			except (ValueError, nx.NetworkXNoPath, KeyError) as e:
+				raise ValueError(f'Failed to compute multi-point path: {e}')
+
+		lease = solver_pool.lease(topology)
+
+	# Outside the checkout: the solver process reads the leased snapshot.
+	with lease:
+		try:
+			sensor_ids, total_distance = lease.run(
+				solve_multi_point_path,
+				source_room_id,
+				target_room_ids,
+				optimizer,
+				time_budget,
+			)
+		except (ValueError, nx.NetworkXNoPath, KeyError) as e:
+			raise ValueError(f'Failed to compute multi-point path: {e}')
+
+	return {
+		'fastest_path': response_sensors(sensors_from_ids(sensor_ids, sensor_graph), weights),
+		'distance': total_distance,
+		'weights_version': weights.version,
+	}
+
+
+def register_building(building_id: str, request_body: BuildingRequest) -> dict:
+	"""
+	Registers (or replaces) a building's rooms and sensors under building_id.
+
+	Returns:
+	    dict: The building ID, its topology version and counts of rooms and sensors.
+	"""
+	topology = building_registry.register(
+		building_id, request_body.rooms or [], request_body.sensors or []
+	)
+	return building_summary(building_id, topology)
+
 
-	sensor_graph = SensorGraph(sensors)
-	sensor_graph.build_graph()
+def update_building_occupancy(building_id: str, request_body: OccupancyUpdateRequest) -> dict:
+	"""
+	Applies the occupancy of the rooms in the request to a registered building.
+
+	Raises:
+	    BuildingNotFoundError: If the building is not registered.
+	    ValueError: If a room is not part of the building.
+	"""
+	occupancy = {room.id: room.occupants for room in request_body.rooms}
+	crowd_factors = {
+		room.id: room.crowd_factor for room in request_body.rooms if room.crowd_factor is not None
+	}
+	topology = building_registry.update_occupancy(building_id, occupancy, crowd_factors)
+	return building_summary(building_id, topology)
 
-	sensor_graph.attach_rooms(all_room_ids_in_tour)
 
-	for room_id in all_room_ids_in_tour:
-		if not sensor_graph.graph.has_node(room_id):
-			raise ValueError(f"Room '{room_id}' is not connected to any sensor in the graph.")
+def ingest_occupancy_event(building_id: str, line) -> list | None:
+	"""
+	Parses one JSON occupancy event (a RoomCountEvent or SensorPassEvent) and hands
+	it to the occupancy ingestor, which applies it to the building once its
+	coalescing window has passed. Does not wait for the graph.
 
+	Args:
+	    building_id (str): ID of a registered building.
+	    line (str | bytes): The JSON event.
+
+	Returns:
+	    list | None: The validation errors if the event was rejected, otherwise None.
+	"""
 	try:
-		sensor_objects_path, total_distance = sensor_graph.find_multi_point_path_nearest_neighbor(
-			source_room_id,
-			target_room_ids,
+		event = occupancy_event_adapter.validate_json(line)
+	except ValidationError as e:
+		return e.errors(include_url=False)
+	occupancy_ingestor.submit(building_id, event)
+	return None
+
+
+def building_summary(building_id: str, topology) -> dict:
+	"""Describes a registered building's current version."""
+	return {
+		'building_id': building_id,
+		'version': topology.topology_hash,
+		'weights_version': topology.sensor_graph.weights_version,
+		'rooms': len(topology.room_mapping),
+		'sensors': len(topology.sensor_graph.sensors),
+	}
+
+
+def create_room_distances(request_body: RoomDistancesRequest):
+	"""
+	Computes the distance from the source room to every room (or to every room within
+	the request's budget) with a single search.
+
+	Raises:
+	    ValueError: If the source room is not valid or not connected to any sensor.
+	"""
+	source_room_id = request_body.source_room
+
+	with (
+		topology_cache.checkout(request_body.rooms or [], request_body.sensors or []) as topology,
+		topology.sensor_graph.pinned_weights() as weights,
+	):
+		if not check_room_id_is_valid(source_room_id, topology.room_mapping):
+			raise ValueError(f"Source room '{source_room_id}' is not valid.")
+
+		sensor_graph = topology.sensor_graph
+		if not check_room_is_connected(source_room_id, sensor_graph):
+			raise ValueError(
+				f"Source room '{source_room_id}' is not connected to any sensor in the graph."
+			)
+
+		distances = sensor_graph.find_room_distances(source_room_id, request_body.budget)
+
+	return {
+		'source_room': source_room_id,
+		'weights_version': weights.version,
+		'distances': [
+			{'room_id': room_id, 'distance': distance} for room_id, distance in distances.items()
+		],
+	}
+
+
+def group_batch_request(request_body: BatchPathRequest) -> list:
+	"""
+	Splits a batch into units of work: one per distinct source room of the pairs,
+	answered by a single search, and one per tour.
+
+	Returns:
+	    list: ('pairs', source_room, [pair index]) and ('tour', tour index) tuples.
+	"""
+	pair_groups = {}
+	for index, pair in enumerate(request_body.pairs):
+		pair_groups.setdefault(pair.source_room, []).append(index)
+
+	groups = [
+		('pairs', source_room_id, pair_indices)
+		for source_room_id, pair_indices in pair_groups.items()
+	]
+	groups.extend(('tour', index) for index in range(len(request_body.tours)))
+	return groups
+
+
+def batch_group_errors(request_body: BatchPathRequest, group: tuple, message: str) -> list:
+	"""Returns an error result for every query of a batch group."""
+	if group[0] == 'tour':
+		return [_batch_tour_result(request_body, group[1], error=message)]
+	return [_batch_pair_result(request_body, index, error=message) for index in group[2]]
+
+
+def checkout_batch(request_body: BatchPathRequest) -> tuple:
+	"""
+	Checks out the topology of a batch once, applying the batch's occupancy.
+
+	Returns:
+	    tuple: (CachedTopology, WeightSnapshot) - every group of the batch is computed
+	           on this snapshot, see compute_batch_group().
+	"""
+	with (
+		topology_cache.checkout(request_body.rooms or [], request_body.sensors or []) as topology,
+		topology.sensor_graph.pinned_weights() as weights,
+	):
+		return topology, weights
+
+
+def compute_batch_group(request_body: BatchPathRequest, group: tuple, topology, weights) -> list:
+	"""
+	Computes the results of one batch group (see group_batch_request()) on the
+	weights returned by checkout_batch(). Failures of individual queries are
+	returned as results with an 'error' message.
+
+	Returns:
+	    list: One result dict per query in the group.
+	"""
+	with topology.sensor_graph.pinned_weights(weights):
+		if group[0] == 'tour':
+			return [_compute_batch_tour(request_body, group[1], topology)]
+		return _compute_batch_pairs(request_body, group[1], group[2], topology, weights)
+
+
+def compute_batch(request_body: BatchPathRequest, groups: list) -> list:
+	"""
+	Checks out a batch and computes all of its groups, for executors that cannot
+	share a topology between jobs (process pools).
+
+	Returns:
+	    list: The result list of every group, in the order of groups.
+	"""
+	topology, weights = checkout_batch(request_body)
+	return [compute_batch_group(request_body, group, topology, weights) for group in groups]
+
+
+def _batch_pair_result(request_body: BatchPathRequest, index: int, **fields) -> dict:
+	pair = request_body.pairs[index]
+	return {
+		'type': 'pair',
+		'index': index,
+		'source_room': pair.source_room,
+		'target_room': pair.target_room,
+		**fields,
+	}
+
+
+def _batch_tour_result(request_body: BatchPathRequest, index: int, **fields) -> dict:
+	tour = request_body.tours[index]
+	return {
+		'type': 'tour',
+		'index': index,
+		'source_room': tour.source_room,
+		'target_rooms': tour.target_rooms,
+		**fields,
+	}
+
+
+def _compute_batch_pairs(
+	request_body: BatchPathRequest,
+	source_room_id: str,
+	pair_indices: list,
+	topology,
+	weights,
+) -> list:
+	room_mapping = topology.room_mapping
+	sensor_graph = topology.sensor_graph
+
+	source_error = None
+	if not check_room_id_is_valid(source_room_id, room_mapping):
+		source_error = f"Source room '{source_room_id}' is not valid."
+	elif not check_room_is_connected(source_room_id, sensor_graph):
+		source_error = (
+			f"Source room '{source_room_id}' is not connected to any sensor in the graph."
 		)
+	if source_error is not None:
+		return [
+			_batch_pair_result(request_body, index, error=source_error) for index in pair_indices
+		]
 
-		return {'fastest_path': sensor_objects_path, 'distance': total_distance}
-	except (ValueError, nx.NetworkXNoPath, KeyError) as e:
-		raise ValueError(f'Failed to compute multi-point path: {e}')
+	target_room_ids = {request_body.pairs[index].target_room for index in pair_indices}
+	paths = sensor_graph.find_paths_from_room(source_room_id, target_room_ids)
+
+	results = []
+	for index in pair_indices:
+		target_room_id = request_body.pairs[index].target_room
+		if not check_room_id_is_valid(target_room_id, room_mapping):
+			result = _batch_pair_result(
+				request_body, index, error=f"Target room '{target_room_id}' is not valid."
+			)
+		elif not check_room_is_connected(target_room_id, sensor_graph):
+			result = _batch_pair_result(
+				request_body,
+				index,
+				error=f"Target room '{target_room_id}' is not connected to any sensor in the graph.",
+			)
+		elif target_room_id not in paths:
+			result = _batch_pair_result(
+				request_body, index, error='No path found between the given rooms.'
+			)
+		else:
+			path_sensors, distance = paths[target_room_id]
+			result = _batch_pair_result(
+				request_body,
+				index,
+				fastest_path=response_sensors(path_sensors, weights),
+				distance=distance,
+				weights_version=weights.version,
+			)
+		results.append(result)
+	return results
+
+
+def _compute_batch_tour(request_body: BatchPathRequest, index: int, topology) -> dict:
+	tour = request_body.tours[index]
+	try:
+		result = tour_in_topology(
+			lambda: nullcontext(topology), tour.source_room, tour.target_rooms, tour.optimizer
+		)
+	except ValueError as e:
+		return _batch_tour_result(request_body, index, error=str(e))
+	return _batch_tour_result(request_body, index, **result)
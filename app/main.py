@@ -1,5 +1,11 @@
 from fastapi import FastAPI
 from app.routes import routers
+from app.controllers.route_service import (
+	building_executor,
+	occupancy_ingestor,
+	path_executor,
+	solver_pool,
+)
 from app.config import CORS_SETTINGS
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -18,6 +24,13 @@ app.add_middleware(
 for router in routers:
 	app.include_router(router)
 
+app.add_event_handler('shutdown', occupancy_ingestor.stop)
+app.add_event_handler('shutdown', path_executor.shutdown)
+if building_executor is not path_executor:
+	app.add_event_handler('shutdown', building_executor.shutdown)
+if solver_pool is not None:
+	app.add_event_handler('shutdown', solver_pool.shutdown)
+
 
 if __name__ == '__main__':
 	uvicorn.run('app.main:app', host='0.0.0.0', port=8001, reload=True)
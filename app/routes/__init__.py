@@ -1,5 +1,7 @@
+from .buildings import router as buildings_router
 from .pathfinding import router as pathfinding_router
 
 routers = [
 	pathfinding_router,
+	buildings_router,
 ]
@@ -0,0 +1,202 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from ..classes.building_registry import BuildingNotFoundError
+from ..classes.path_executor import ExecutorBusyError
+from ..controllers.route_service import (
+	building_executor,
+	building_registry,
+	create_building_alternative_paths,
+	create_building_fastest_path,
+	create_building_multiple_points_path,
+	ingest_occupancy_event,
+	register_building,
+	update_building_occupancy,
+)
+from ..schemas.building import (
+	BuildingAlternativePathsRequest,
+	BuildingFastestPathRequest,
+	BuildingMultiplePointsRequest,
+	BuildingRecords,
+	BuildingRequest,
+	OccupancyUpdateRequest,
+)
+from .pathfinding import encode_result, json_body, json_body_openapi
+
+router = APIRouter(prefix='/buildings')
+
+# Rejected events reported back per upload; further rejections are only counted.
+MAX_REPORTED_EVENT_ERRORS = 20
+
+
+async def run_building_job(func, *args):
+	"""
+	Runs a job on a registered building without blocking the event loop. Registered
+	buildings live in this process, so the job runs on building_executor, a thread
+	pool even when the path executor uses processes.
+
+	Raises:
+	    ExecutorBusyError: If the executor is saturated.
+	"""
+	return await building_executor.run(func, *args)
+
+
+async def ndjson_lines(chunks):
+	"""Splits an async stream of byte chunks into lines, without reading it all first."""
+	buffer = b''
+	async for chunk in chunks:
+		buffer += chunk
+		*lines, buffer = buffer.split(b'\n')
+		for line in lines:
+			yield line
+	if buffer:
+		yield buffer
+
+
+async def handle_building_job(func, *args):
+	try:
+		return encode_result(await run_building_job(func, *args))
+	except BuildingNotFoundError as e:
+		raise HTTPException(status_code=404, detail=str(e))
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	except ExecutorBusyError as e:
+		raise HTTPException(status_code=503, detail=str(e))
+	except Exception as e:
+		raise HTTPException(status_code=500, detail='Internal server error: ' + str(e))
+
+
+@router.put('/{building_id}', openapi_extra=json_body_openapi(BuildingRequest))
+async def put_building(
+	building_id: str, request_body: BuildingRecords = Depends(json_body(BuildingRecords))
+):
+	"""
+	Register a building's rooms and sensors once, so that path requests only need the
+	building ID. Registering the same topology again keeps the built graph and only
+	updates occupancy.
+
+	- **rooms**: List of rooms with their unique IDs, names, and crowd factors.
+	- **sensors**: List of sensors with their unique IDs and associated room IDs.
+
+	Returns the building's version (its topology hash) and weights version.
+	"""
+	return await handle_building_job(register_building, building_id, request_body)
+
+
+@router.patch('/{building_id}/occupancy')
+async def patch_building_occupancy(building_id: str, request_body: OccupancyUpdateRequest):
+	"""
+	Update the occupancy of some rooms of a registered building. Only the edges of
+	the listed rooms are reweighted.
+
+	- **rooms**: List of {id, occupants, crowd_factor (optional)} for rooms that changed.
+	"""
+	return await handle_building_job(update_building_occupancy, building_id, request_body)
+
+
+@router.post('/{building_id}/fastest-path')
+async def get_building_fastest_path(building_id: str, request_body: BuildingFastestPathRequest):
+	"""
+	Calculate the fastest path in a registered building.
+
+	- **source_room**: ID of the source room.
+	- **target_room**: ID of the target room.
+	- **mode**: Search algorithm: dijkstra (default), astar, alt (A* with landmark bounds),
+	  bidirectional, hierarchical (per-floor subgraphs joined by a stair/elevator overlay)
+	  or ch (contraction hierarchy).
+	"""
+	return await handle_building_job(create_building_fastest_path, building_id, request_body)
+
+
+@router.post('/{building_id}/alternative-paths')
+async def get_building_alternative_paths(
+	building_id: str, request_body: BuildingAlternativePathsRequest
+):
+	"""
+	Calculate up to k diverse routes in a registered building and assign one of them,
+	spreading repeated requests over the routes.
+
+	- **source_room**: ID of the source room.
+	- **target_room**: ID of the target room.
+	- **k**, **max_shared**, **max_stretch**, **spread**: As for /pathfinding/alternative-paths.
+	"""
+	return await handle_building_job(create_building_alternative_paths, building_id, request_body)
+
+
+@router.post('/{building_id}/multiple-points')
+async def get_building_multiple_points_path(
+	building_id: str, request_body: BuildingMultiplePointsRequest
+):
+	"""
+	Calculate the fastest path between multiple points of a registered building.
+
+	- **source_room**: ID of the source room.
+	- **target_rooms**: List of target room IDs.
+	- **optimizer**: nearest_neighbor (default), optimized (Held-Karp / 2-opt / Or-opt) or
+	  forecast (nearest neighbor against the occupancy predicted for when each room is reached).
+	- **time_budget_ms**: Optional time budget for the optimized tour.
+	"""
+	return await handle_building_job(
+		create_building_multiple_points_path, building_id, request_body
+	)
+
+
+@router.post('/{building_id}/occupancy/events')
+async def post_occupancy_events(building_id: str, request: Request):
+	"""
+	Stream occupancy events for a registered building as newline-delimited JSON.
+	Events are coalesced per room and applied in batches shortly after they arrive;
+	path queries keep running meanwhile.
+
+	- {"type": "count", "room_id": ..., "occupants": ...}: a room's current occupants.
+	- {"type": "pass", "sensor_id": ..., "from_room": ..., "to_room": ...}: one person
+	  moved between rooms; a missing room stands for outside the building.
+
+	Returns counts of accepted and rejected lines, with the first errors.
+	"""
+	if building_id not in building_registry:
+		raise HTTPException(status_code=404, detail=f"Building '{building_id}' is not registered.")
+
+	accepted = 0
+	rejected = 0
+	errors = []
+	line_number = 0
+	async for line in ndjson_lines(request.stream()):
+		line_number += 1
+		if not line.strip():
+			continue
+		detail = ingest_occupancy_event(building_id, line)
+		if detail is None:
+			accepted += 1
+			continue
+		rejected += 1
+		if len(errors) < MAX_REPORTED_EVENT_ERRORS:
+			errors.append({'line': line_number, 'detail': detail})
+
+	return jsonable_encoder(
+		{'building_id': building_id, 'accepted': accepted, 'rejected': rejected, 'errors': errors}
+	)
+
+
+@router.websocket('/{building_id}/occupancy/stream')
+async def stream_occupancy_events(websocket: WebSocket, building_id: str):
+	"""
+	Long-lived occupancy feed for a registered building. Every text message holds
+	one or more newline-separated events in the format of /occupancy/events. Invalid
+	events are answered with {"error": ...}; valid ones are not acknowledged.
+	"""
+	if building_id not in building_registry:
+		await websocket.close(code=1008, reason=f"Building '{building_id}' is not registered.")
+		return
+
+	await websocket.accept()
+	try:
+		while True:
+			message = await websocket.receive_text()
+			for line in message.splitlines():
+				if not line.strip():
+					continue
+				detail = ingest_occupancy_event(building_id, line)
+				if detail is not None:
+					await websocket.send_json({'error': jsonable_encoder(detail)})
+	except WebSocketDisconnect:
+		pass
@@ -1,12 +1,95 @@
-from fastapi import APIRouter, HTTPException
-from ..controllers.route_service import create_fastest_path, create_multiple_points_path
-from ..schemas.path import FastestPathRequest, MultiplePointsRequest
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from ..classes.path_executor import ExecutorBusyError
+from ..classes.room import Room
+from ..classes.sensor import Sensor
+from ..controllers.route_service import (
+	batch_group_errors,
+	checkout_batch,
+	compute_batch,
+	compute_batch_group,
+	create_alternative_paths,
+	create_fastest_path,
+	create_multiple_points_path,
+	create_room_distances,
+	group_batch_request,
+	path_cache_stats,
+	path_executor,
+)
+from ..schemas.path import (
+	AlternativePathsRecords,
+	AlternativePathsRequest,
+	BatchPathRecords,
+	BatchPathRequest,
+	FastestPathRecords,
+	FastestPathRequest,
+	MultiplePointsRecords,
+	MultiplePointsRequest,
+	RoomDistancesRecords,
+	RoomDistancesRequest,
+)
 
 router = APIRouter(prefix='/pathfinding')
 
+# Room and Sensor use __slots__, so they are encoded explicitly instead of via __dict__.
+PATH_ENCODERS = {Sensor: Sensor.to_dict, Room: Room.to_dict}
+
+
+def encode_result(result):
+	"""Converts a controller result with Sensor/Room objects into JSON-ready data."""
+	return jsonable_encoder(result, custom_encoder=PATH_ENCODERS)
+
 
-@router.post('/fastest-path')
-async def get_fastest_path(request_body: FastestPathRequest):
+def json_body(model):
+	"""
+	Returns a dependency that validates the raw request body with
+	model.model_validate_json(), so large building payloads are parsed and validated
+	in one pass instead of json.loads() followed by model validation. Errors are
+	reported like FastAPI's own body validation (422).
+	"""
+
+	async def parse_body(request: Request):
+		try:
+			return model.model_validate_json(await request.body())
+		except ValidationError as e:
+			raise RequestValidationError(
+				[{**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)]
+			)
+
+	return parse_body
+
+
+def json_body_openapi(model) -> dict:
+	"""Documents model as the request body of a route that reads it with json_body()."""
+	schema = model.model_json_schema()
+	definitions = schema.pop('$defs', {})
+
+	def inline(node):
+		if isinstance(node, dict):
+			if '$ref' in node:
+				return inline(definitions[node['$ref'].split('/')[-1]])
+			return {key: inline(value) for key, value in node.items()}
+		if isinstance(node, list):
+			return [inline(value) for value in node]
+		return node
+
+	return {
+		'requestBody': {
+			'required': True,
+			'content': {'application/json': {'schema': inline(schema)}},
+		}
+	}
+
+
+@router.post('/fastest-path', openapi_extra=json_body_openapi(FastestPathRequest))
+async def get_fastest_path(
+	request_body: FastestPathRecords = Depends(json_body(FastestPathRecords)),
+):
 	"""
 	Calculate the fastest path based on the provided rooms and sensors.
 
@@ -14,17 +97,54 @@ async def get_fastest_path(request_body: FastestPathRequest):
 	- **sensors**: List of sensors with their unique IDs and associated room IDs.
 	- **source_room**: ID of the source room.
 	- **target_room**: ID of the target room.
+	- **mode**: Search algorithm: dijkstra (default), astar, alt (A* with landmark bounds),
+	  bidirectional, hierarchical (per-floor subgraphs joined by a stair/elevator overlay)
+	  or ch (contraction hierarchy).
+	"""
+	try:
+		return encode_result(await path_executor.run(create_fastest_path, request_body))
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	except ExecutorBusyError as e:
+		raise HTTPException(status_code=503, detail=str(e))
+	except Exception as e:
+		raise HTTPException(status_code=500, detail='Internal server error: ' + str(e))
+
+
+@router.post('/alternative-paths', openapi_extra=json_body_openapi(AlternativePathsRequest))
+async def get_alternative_paths(
+	request_body: AlternativePathsRecords = Depends(json_body(AlternativePathsRecords)),
+):
+	"""
+	Calculate up to k diverse routes between two rooms and assign one of them.
+	Requests for the same rooms are handed the routes in turn, the faster routes more
+	often, so visitors are spread instead of all taking the fastest corridor.
+
+	- **rooms**: List of rooms with their unique IDs, names, and crowd factors.
+	- **sensors**: List of sensors with their unique IDs and associated room IDs.
+	- **source_room**: ID of the source room.
+	- **target_room**: ID of the target room.
+	- **k**: Maximum number of routes (default 3).
+	- **max_shared**: Largest fraction of a route's distance shared with another route.
+	- **max_stretch**: Largest route distance relative to the fastest route.
+	- **spread**: Assign routes in turn (default) or always the fastest route.
+
+	Returns all routes plus the assigned one as fastest_path and distance.
 	"""
 	try:
-		return create_fastest_path(request_body)
+		return encode_result(await path_executor.run(create_alternative_paths, request_body))
 	except ValueError as e:
 		raise HTTPException(status_code=400, detail=str(e))
+	except ExecutorBusyError as e:
+		raise HTTPException(status_code=503, detail=str(e))
 	except Exception as e:
 		raise HTTPException(status_code=500, detail='Internal server error: ' + str(e))
 
 
-@router.post('/multiple-points')
-async def get_multiple_points_path(request_body: MultiplePointsRequest):
+@router.post('/multiple-points', openapi_extra=json_body_openapi(MultiplePointsRequest))
+async def get_multiple_points_path(
+	request_body: MultiplePointsRecords = Depends(json_body(MultiplePointsRecords)),
+):
 	"""
 	Calculate the fastest path between multiple points based on the provided rooms and sensors.
 
@@ -32,10 +152,98 @@ async def get_multiple_points_path(request_body: MultiplePointsRequest):
 	- **sensors**: List of sensors with their unique IDs and associated room IDs.
 	- **source_room**: ID of the source room.
 	- **target_rooms**: List of target room IDs.
+	- **optimizer**: nearest_neighbor (default), optimized (Held-Karp / 2-opt / Or-opt) or
+	  forecast (nearest neighbor against the occupancy predicted for when each room is reached).
+	- **time_budget_ms**: Optional time budget for the optimized tour.
 	"""
 	try:
-		return create_multiple_points_path(request_body)
+		return encode_result(await path_executor.run(create_multiple_points_path, request_body))
 	except ValueError as e:
 		raise HTTPException(status_code=400, detail=str(e))
+	except ExecutorBusyError as e:
+		raise HTTPException(status_code=503, detail=str(e))
 	except Exception as e:
 		raise HTTPException(status_code=500, detail='Internal server error: ' + str(e))
+
+
+@router.post('/room-distances', openapi_extra=json_body_openapi(RoomDistancesRequest))
+async def get_room_distances(
+	request_body: RoomDistancesRecords = Depends(json_body(RoomDistancesRecords)),
+):
+	"""
+	Calculate the distance from one room to every other room with a single search,
+	nearest rooms first.
+
+	- **rooms**: List of rooms with their unique IDs, names, and crowd factors.
+	- **sensors**: List of sensors with their unique IDs and associated room IDs.
+	- **source_room**: ID of the source room.
+	- **budget**: Optional maximum distance; only rooms within it are returned.
+	"""
+	try:
+		return await path_executor.run(create_room_distances, request_body)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	except ExecutorBusyError as e:
+		raise HTTPException(status_code=503, detail=str(e))
+	except Exception as e:
+		raise HTTPException(status_code=500, detail='Internal server error: ' + str(e))
+
+
+@router.post('/batch', openapi_extra=json_body_openapi(BatchPathRequest))
+async def get_batch_paths(request_body: BatchPathRecords = Depends(json_body(BatchPathRecords))):
+	"""
+	Calculate many paths over one building in a single call. Pairs that share a
+	source room are answered by one search. Results are streamed as newline-delimited
+	JSON, one object per query, as soon as each group of queries is done.
+
+	- **rooms**: List of rooms with their unique IDs, names, and crowd factors.
+	- **sensors**: List of sensors with their unique IDs and associated room IDs.
+	- **pairs**: List of {source_room, target_room} fastest-path queries.
+	- **tours**: List of {source_room, target_rooms, optimizer} multi-point queries.
+
+	Every result carries its type ('pair' or 'tour') and index in the request, and
+	either fastest_path and distance or an error message. The building is checked
+	out once, so all results are computed with the same weights_version.
+	"""
+	groups = group_batch_request(request_body)
+
+	def group_errors(group: tuple, error: Exception) -> list:
+		if isinstance(error, ExecutorBusyError):
+			return batch_group_errors(request_body, group, str(error))
+		return batch_group_errors(request_body, group, 'Internal server error: ' + str(error))
+
+	async def stream_results():
+		batch_results = None
+		try:
+			if path_executor.kind == 'process':
+				# Worker processes cannot share a checked out topology: one job per batch.
+				batch_results = await path_executor.run(compute_batch, request_body, groups)
+			else:
+				topology, weights = await path_executor.run(checkout_batch, request_body)
+		except Exception as e:
+			batch_results = [group_errors(group, e) for group in groups]
+
+		for index, group in enumerate(groups):
+			if batch_results is not None:
+				results = batch_results[index]
+			else:
+				try:
+					results = await path_executor.run(
+						compute_batch_group, request_body, group, topology, weights
+					)
+				except Exception as e:
+					results = group_errors(group, e)
+			for result in results:
+				yield json.dumps(encode_result(result)) + '\n'
+
+	return StreamingResponse(stream_results(), media_type='application/x-ndjson')
+
+
+@router.get('/path-cache')
+async def get_path_cache_stats():
+	"""
+	Counters of the fastest-path result cache in this process: entries, hits, misses,
+	and entries dropped because they were invalidated by weight updates, expired or
+	evicted.
+	"""
+	return path_cache_stats()
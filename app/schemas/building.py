@@ -0,0 +1,119 @@
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Annotated, List, Literal, Union
+from ..classes.sensor_graph import SearchMode
+from .room import RoomRecord, RoomSchema
+from .sensor import SensorRecord, SensorSchema
+
+
+class BuildingRequest(BaseModel):
+	rooms: List[RoomSchema] = Field(description='List of rooms of the building.')
+	sensors: List[SensorSchema] = Field(description='List of sensors of the building.')
+
+	class ConfigDict:
+		json_schema_extra = {
+			'example': {
+				'rooms': [
+					{
+						'id': 'room1',
+						'name': 'Lobby',
+						'crowd_factor': 2,
+						'occupants': 10,
+						'area': 100,
+						'popularity_factor': 1,
+						'floor': 1,
+					},
+					{
+						'id': 'room2',
+						'name': 'Hallway',
+						'crowd_factor': 1,
+						'occupants': 5,
+						'area': 50,
+						'popularity_factor': 1,
+						'floor': 1,
+					},
+				],
+				'sensors': [
+					{
+						'id': 'sensor1',
+						'rooms': ['room1', 'room2'],
+						'longitude': 12.57,
+						'latitude': 55.68,
+						'is_vertical': False,
+					}
+				],
+			}
+		}
+
+
+class BuildingRecords(BuildingRequest):
+	"""BuildingRequest with rooms and sensors validated into dict records."""
+
+	rooms: List[RoomRecord] = Field(description='List of rooms of the building.')
+	sensors: List[SensorRecord] = Field(description='List of sensors of the building.')
+
+
+class RoomOccupancy(BaseModel):
+	id: str = Field(..., description='ID of a room of the building.')
+	occupants: int = Field(..., description='New number of occupants in the room.')
+	crowd_factor: float | None = Field(None, description='New crowd factor, if it changed.')
+
+
+class OccupancyUpdateRequest(BaseModel):
+	rooms: List[RoomOccupancy] = Field(
+		..., description='Rooms whose occupancy changed; other rooms keep their values.'
+	)
+
+
+class BuildingFastestPathRequest(BaseModel):
+	source_room: str = Field(..., description='ID of the source room.')
+	target_room: str = Field(..., description='ID of the target room.')
+	mode: SearchMode = Field('dijkstra', description='Search algorithm used to find the path.')
+
+
+class BuildingAlternativePathsRequest(BaseModel):
+	source_room: str = Field(..., description='ID of the source room.')
+	target_room: str = Field(..., description='ID of the target room.')
+	k: int = Field(3, ge=1, le=10, description='Maximum number of alternative routes.')
+	max_shared: float = Field(
+		0.5, ge=0, le=1, description='Largest fraction of a route shared with another route.'
+	)
+	max_stretch: float = Field(
+		1.5, ge=1, description='Largest route distance relative to the fastest route.'
+	)
+	spread: bool = Field(
+		True, description='Assign one of the routes so that repeated requests are spread.'
+	)
+
+
+class BuildingMultiplePointsRequest(BaseModel):
+	source_room: str = Field(..., description='ID of the source room.')
+	target_rooms: List[str] = Field(..., description='List of target room IDs.')
+	optimizer: Literal['nearest_neighbor', 'optimized', 'forecast'] = Field(
+		'nearest_neighbor',
+		description=(
+			'Tour ordering: greedy nearest neighbor, exact/2-opt/Or-opt optimization, or '
+			'nearest neighbor against the occupancy forecast for the time each room is reached.'
+		),
+	)
+	time_budget_ms: int | None = Field(
+		None, gt=0, description='Time budget for the optimized tour in milliseconds.'
+	)
+
+
+class RoomCountEvent(BaseModel):
+	type: Literal['count'] = Field(..., description='A room counter reported its occupants.')
+	room_id: str = Field(..., description='ID of the counted room.')
+	occupants: int = Field(..., ge=0, description='Number of occupants in the room.')
+
+
+class SensorPassEvent(BaseModel):
+	type: Literal['pass'] = Field(..., description='A person passed a sensor between rooms.')
+	sensor_id: str | None = Field(None, description='ID of the sensor that was passed.')
+	from_room: str | None = Field(None, description='Room the person left, if inside.')
+	to_room: str | None = Field(None, description='Room the person entered, if inside.')
+
+
+OccupancyEvent = Annotated[Union[RoomCountEvent, SensorPassEvent], Field(discriminator='type')]
+
+# Parses one JSON occupancy event (one line of a newline-delimited stream).
+occupancy_event_adapter = TypeAdapter(OccupancyEvent)
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import List
-from .room import RoomSchema
-from .sensor import SensorSchema
+from typing import List, Literal
+from ..classes.sensor_graph import SearchMode
+from .room import RoomRecord, RoomSchema
+from .sensor import SensorRecord, SensorSchema
 
 
 class FastestPathRequest(BaseModel):
@@ -9,6 +10,7 @@ class FastestPathRequest(BaseModel):
 	sensors: List[SensorSchema] = Field(description='List of sensors involved in pathfinding.')
 	source_room: str = Field(..., description='ID of the source room.')
 	target_room: str = Field(..., description='ID of the target room.')
+	mode: SearchMode = Field('dijkstra', description='Search algorithm used to find the path.')
 
 	class ConfigDict:
 		json_schema_extra = {
@@ -46,11 +48,67 @@ class FastestPathRequest(BaseModel):
 		}
 
 
+class AlternativePathsRequest(BaseModel):
+	rooms: List[RoomSchema] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorSchema] = Field(description='List of sensors involved in pathfinding.')
+	source_room: str = Field(..., description='ID of the source room.')
+	target_room: str = Field(..., description='ID of the target room.')
+	k: int = Field(3, ge=1, le=10, description='Maximum number of alternative routes.')
+	max_shared: float = Field(
+		0.5, ge=0, le=1, description='Largest fraction of a route shared with another route.'
+	)
+	max_stretch: float = Field(
+		1.5, ge=1, description='Largest route distance relative to the fastest route.'
+	)
+	spread: bool = Field(
+		True, description='Assign one of the routes so that repeated requests are spread.'
+	)
+
+	class ConfigDict:
+		json_schema_extra = {
+			'example': {
+				'rooms': [
+					{
+						'id': 'room1',
+						'name': 'Lobby',
+						'crowd_factor': 2,
+						'occupants': 10,
+						'area': 100,
+					},
+					{
+						'id': 'room2',
+						'name': 'Hallway',
+						'crowd_factor': 1,
+						'occupants': 5,
+						'area': 50,
+					},
+				],
+				'sensors': [
+					{'id': 'sensor1', 'rooms': ['room1', 'room2']},
+					{'id': 'sensor2', 'rooms': ['room1', 'room2']},
+				],
+				'source_room': 'room1',
+				'target_room': 'room2',
+				'k': 2,
+			}
+		}
+
+
 class MultiplePointsRequest(BaseModel):
 	rooms: List[RoomSchema] = Field(description='List of rooms involved in pathfinding.')
 	sensors: List[SensorSchema] = Field(description='List of sensors involved in pathfinding.')
 	source_room: str = Field(..., description='ID of the source room.')
 	target_rooms: List[str] = Field(..., description='List of target room IDs.')
+	optimizer: Literal['nearest_neighbor', 'optimized', 'forecast'] = Field(
+		'nearest_neighbor',
+		description=(
+			'Tour ordering: greedy nearest neighbor, exact/2-opt/Or-opt optimization, or '
+			'nearest neighbor against the occupancy forecast for the time each room is reached.'
+		),
+	)
+	time_budget_ms: int | None = Field(
+		None, gt=0, description='Time budget for the optimized tour in milliseconds.'
+	)
 
 	class ConfigDict:
 		json_schema_extra = {
@@ -86,3 +144,125 @@ class MultiplePointsRequest(BaseModel):
 				'target_rooms': ['room1', 'room3'],
 			}
 		}
+
+
+class RoomDistancesRequest(BaseModel):
+	rooms: List[RoomSchema] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorSchema] = Field(description='List of sensors involved in pathfinding.')
+	source_room: str = Field(..., description='ID of the source room.')
+	budget: float | None = Field(
+		None, gt=0, description='Only return rooms within this distance (isochrone).'
+	)
+
+	class ConfigDict:
+		json_schema_extra = {
+			'example': {
+				'rooms': [
+					{
+						'id': 'room1',
+						'name': 'Lobby',
+						'crowd_factor': 2,
+						'occupants': 10,
+						'area': 100,
+					},
+					{
+						'id': 'room2',
+						'name': 'Hallway',
+						'crowd_factor': 1,
+						'occupants': 5,
+						'area': 50,
+					},
+				],
+				'sensors': [{'id': 'sensor1', 'rooms': ['room1', 'room2']}],
+				'source_room': 'room1',
+				'budget': 25.0,
+			}
+		}
+
+
+class RoutePair(BaseModel):
+	source_room: str = Field(..., description='ID of the source room.')
+	target_room: str = Field(..., description='ID of the target room.')
+
+
+class VisitorTour(BaseModel):
+	source_room: str = Field(..., description='ID of the source room.')
+	target_rooms: List[str] = Field(..., description='List of target room IDs.')
+	optimizer: Literal['nearest_neighbor', 'optimized', 'forecast'] = Field(
+		'nearest_neighbor', description='Tour ordering, as in MultiplePointsRequest.'
+	)
+
+
+class BatchPathRequest(BaseModel):
+	rooms: List[RoomSchema] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorSchema] = Field(description='List of sensors involved in pathfinding.')
+	pairs: List[RoutePair] = Field([], description='Fastest-path queries to answer.')
+	tours: List[VisitorTour] = Field([], description='Multi-point tours to answer.')
+
+	class ConfigDict:
+		json_schema_extra = {
+			'example': {
+				'rooms': [
+					{
+						'id': 'room1',
+						'name': 'Lobby',
+						'crowd_factor': 2,
+						'occupants': 10,
+						'area': 100,
+					},
+					{
+						'id': 'room2',
+						'name': 'Hallway',
+						'crowd_factor': 1,
+						'occupants': 5,
+						'area': 50,
+					},
+					{
+						'id': 'room3',
+						'name': 'Meeting Room',
+						'crowd_factor': 3,
+						'occupants': 20,
+						'area': 200,
+					},
+				],
+				'sensors': [
+					{'id': 'sensor1', 'rooms': ['room1', 'room2']},
+					{'id': 'sensor2', 'rooms': ['room2', 'room3']},
+				],
+				'pairs': [
+					{'source_room': 'room1', 'target_room': 'room3'},
+					{'source_room': 'room1', 'target_room': 'room2'},
+				],
+				'tours': [{'source_room': 'room2', 'target_rooms': ['room1', 'room3']}],
+			}
+		}
+
+
+# The request models below validate rooms and sensors into RoomRecord/SensorRecord
+# dicts. Used with model_validate_json() they parse a request body in one pass,
+# without building a RoomSchema/SensorSchema object per room and sensor.
+
+
+class FastestPathRecords(FastestPathRequest):
+	rooms: List[RoomRecord] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorRecord] = Field(description='List of sensors involved in pathfinding.')
+
+
+class AlternativePathsRecords(AlternativePathsRequest):
+	rooms: List[RoomRecord] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorRecord] = Field(description='List of sensors involved in pathfinding.')
+
+
+class MultiplePointsRecords(MultiplePointsRequest):
+	rooms: List[RoomRecord] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorRecord] = Field(description='List of sensors involved in pathfinding.')
+
+
+class RoomDistancesRecords(RoomDistancesRequest):
+	rooms: List[RoomRecord] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorRecord] = Field(description='List of sensors involved in pathfinding.')
+
+
+class BatchPathRecords(BatchPathRequest):
+	rooms: List[RoomRecord] = Field(description='List of rooms involved in pathfinding.')
+	sensors: List[SensorRecord] = Field(description='List of sensors involved in pathfinding.')
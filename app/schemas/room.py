@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
+from typing_extensions import TypedDict
 
 
 class RoomSchema(BaseModel):
@@ -10,3 +11,15 @@ class RoomSchema(BaseModel):
 	crowd_factor: float = Field(..., description='Crowd factor of the room.')
 	popularity_factor: float = Field(..., description='Popularity factor of the room')
 	floor: int = Field(..., description='Floor number of the room.')
+
+
+class RoomRecord(TypedDict):
+	"""The fields of RoomSchema, validated into a plain dict instead of a model."""
+
+	id: str
+	name: Optional[str]
+	occupants: int
+	area: float
+	crowd_factor: float
+	popularity_factor: float
+	floor: int
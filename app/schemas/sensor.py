@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List
+from typing_extensions import TypedDict
 
 
 class SensorSchema(BaseModel):
@@ -10,3 +11,13 @@ class SensorSchema(BaseModel):
 	is_vertical: bool = Field(
 		..., description='Indicates if the sensor is vertical (True) or horizontal (False).'
 	)
+
+
+class SensorRecord(TypedDict):
+	"""The fields of SensorSchema, validated into a plain dict instead of a model."""
+
+	id: str
+	rooms: List[str]
+	longitude: float
+	latitude: float
+	is_vertical: bool
@@ -0,0 +1,23 @@
+import random
+
+import pytest
+
+from app.classes.room import Room
+from app.classes.sensor import Sensor
+
+
+@pytest.fixture
+def random_building():
+	"""Returns a factory for the sensors of a small random three-floor building."""
+
+	def build(seed: int) -> list:
+		rng = random.Random(seed)
+		rooms = [
+			Room(f'room{i}', f'Room {i}', 0.5, rng.randint(0, 30), 80, 1, i % 3) for i in range(12)
+		]
+		return [
+			Sensor(f'sensor{i}', rng.random() * 40, rng.random() * 40, False, rng.sample(rooms, 2))
+			for i in range(40)
+		]
+
+	return build
@@ -0,0 +1,62 @@
+import pytest
+
+from app.classes.building_registry import BuildingNotFoundError, BuildingRegistry
+from app.test.classes.test_topology_cache import make_rooms, make_sensors
+
+
+class TestBuildingRegistry:
+	def test_reregistering_same_topology_keeps_graph(self):
+		registry = BuildingRegistry()
+		first = registry.register('museum', make_rooms(5, 3), make_sensors())
+		second = registry.register('museum', make_rooms(40, 3), make_sensors())
+
+		assert second is first
+		assert first.room_mapping['roomA'].occupants == 40
+
+	def test_new_topology_replaces_building(self):
+		registry = BuildingRegistry()
+		first = registry.register('museum', make_rooms(), make_sensors())
+		second = registry.register('museum', make_rooms(), make_sensors(longitude=1.5))
+
+		assert second is not first
+		assert registry.get('museum') is second
+		assert len(registry) == 1
+
+	def test_buildings_do_not_share_rooms(self):
+		registry = BuildingRegistry()
+		museum = registry.register('museum', make_rooms(), make_sensors())
+		annex = registry.register('annex', make_rooms(), make_sensors())
+
+		registry.update_occupancy('annex', {'roomA': 99})
+		assert annex.room_mapping['roomA'].occupants == 99
+		assert museum.room_mapping['roomA'].occupants == 5
+		assert museum.key != annex.key
+
+	def test_update_occupancy_refreshes_edges(self):
+		registry = BuildingRegistry()
+		topology = registry.register('museum', make_rooms(), make_sensors())
+		version = topology.sensor_graph.weights_version
+
+		registry.update_occupancy('museum', {'roomB': 30}, {'roomB': 2.0})
+
+		room_b = topology.room_mapping['roomB']
+		assert (room_b.occupants, room_b.crowd_factor) == (30, 2.0)
+		assert topology.sensor_graph.weights_version > version
+		edge = topology.sensor_graph.graph.get_edge_data('s2', 's3')
+		assert edge['weight'] == pytest.approx(1.0 * room_b.calculate_weight())
+
+	def test_update_rejects_unknown_rooms(self):
+		registry = BuildingRegistry()
+		topology = registry.register('museum', make_rooms(), make_sensors())
+
+		with pytest.raises(ValueError):
+			registry.update_occupancy('museum', {'roomA': 1, 'lobby': 2})
+		assert topology.room_mapping['roomA'].occupants == 5
+
+	def test_unknown_building(self):
+		registry = BuildingRegistry()
+		with pytest.raises(BuildingNotFoundError):
+			registry.update_occupancy('museum', {'roomA': 1})
+		with pytest.raises(BuildingNotFoundError):
+			with registry.checkout('museum'):
+				pass
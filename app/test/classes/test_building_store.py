@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from app.classes.building_store import BuildingStore
+from app.classes.room import Room
+from app.classes.sensor import Sensor
+from app.classes.sensor_graph import SensorGraph
+from app.schemas.path import FastestPathRequest
+from app.schemas.room import RoomSchema
+from app.schemas.sensor import SensorSchema
+
+
+@pytest.fixture
+def building():
+	with open('app/test/mock_data/rooms_and_sensors.json') as file:
+		request = FastestPathRequest.model_validate(json.load(file))
+	return request.rooms, request.sensors
+
+
+class TestBuildingStore:
+	def test_room_weights_match_room_objects(self, building):
+		rooms, sensors = building
+		store = BuildingStore.from_schemas(rooms, sensors)
+		room_mapping = Room.create_room_mapping_from_schemas(rooms)
+
+		expected = [room_mapping[room_id].calculate_weight() for room_id in store.room_ids]
+		assert store.room_weights().tolist() == expected
+
+	def test_room_weights_reject_occupied_room_without_area(self):
+		room = RoomSchema(
+			id='r', name='R', occupants=3, area=0, crowd_factor=1, popularity_factor=1, floor=0
+		)
+		store = BuildingStore.from_schemas([room], [])
+		with pytest.raises(ZeroDivisionError):
+			store.room_weights()
+
+	def test_creates_same_objects_as_schemas(self, building):
+		rooms, sensors = building
+		store = BuildingStore.from_schemas(rooms, sensors)
+		expected_sensors = Sensor.create_sensors_from_schemas(
+			sensors, Room.create_room_mapping_from_schemas(rooms)
+		)
+
+		created = store.create_sensors(store.create_room_mapping())
+		assert [sensor.to_dict() for sensor in created] == [
+			sensor.to_dict() for sensor in expected_sensors
+		]
+
+	def test_unknown_rooms_are_dropped(self):
+		room = RoomSchema(
+			id='r', name='R', occupants=0, area=10, crowd_factor=1, popularity_factor=1, floor=0
+		)
+		sensor = SensorSchema(
+			id='s', rooms=['missing', 'r'], longitude=0.0, latitude=0.0, is_vertical=False
+		)
+		store = BuildingStore.from_schemas([room], [sensor])
+		assert store.sensor_rooms.tolist() == [0]
+		assert store.sensor_room_offsets.tolist() == [0, 1]
+
+	def test_graph_built_from_store_matches_objects(self, building):
+		rooms, sensors = building
+		from_objects = SensorGraph(
+			Sensor.create_sensors_from_schemas(
+				sensors, Room.create_room_mapping_from_schemas(rooms)
+			)
+		)
+		from_objects.build_graph()
+
+		store = BuildingStore.from_schemas(rooms, sensors)
+		from_store = SensorGraph(store.create_sensors(store.create_room_mapping()), store=store)
+		from_store.build_graph()
+
+		assert list(from_store.graph.edges(data=True)) == list(from_objects.graph.edges(data=True))
+		assert list(from_store.rooms) == list(from_objects.rooms)
+		assert from_store._room_sensor_ids == from_objects._room_sensor_ids
+
+	def test_dict_records_build_the_same_store(self, building):
+		rooms, sensors = building
+		from_schemas = BuildingStore.from_schemas(rooms, sensors)
+		from_records = BuildingStore.from_schemas(
+			[room.model_dump() for room in rooms], [sensor.model_dump() for sensor in sensors]
+		)
+
+		assert from_records.room_ids == from_schemas.room_ids
+		assert from_records.sensor_ids == from_schemas.sensor_ids
+		assert from_records.sensor_rooms.tolist() == from_schemas.sensor_rooms.tolist()
+		assert from_records.room_weights().tolist() == from_schemas.room_weights().tolist()
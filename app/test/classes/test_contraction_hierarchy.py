@@ -0,0 +1,73 @@
+import random
+
+import networkx as nx
+import pytest
+
+from app.classes.contraction_hierarchy import ContractionHierarchy
+from app.classes.sensor_graph import SensorGraph
+from app.classes.weight_snapshot import WeightSnapshot
+
+
+class TestContractionHierarchy:
+	def test_query_on_square(self):
+		hierarchy = ContractionHierarchy(4, [0, 1, 0, 2], [1, 2, 3, 3])
+		weights = WeightSnapshot(1, [1.0, 1.0, 4.0, 1.0, 0.0], 0.0)
+
+		path, distance = hierarchy.shortest_path([0], [3], hierarchy.update_metric(weights))
+
+		assert path == [0, 1, 2, 3]
+		assert distance == 3.0
+
+	def test_customization_follows_new_weights(self):
+		hierarchy = ContractionHierarchy(4, [0, 1, 0, 2], [1, 2, 3, 3])
+		weights = WeightSnapshot(1, [1.0, 1.0, 4.0, 1.0, 0.0], 0.0)
+		hierarchy.update_metric(weights)
+
+		cheaper = weights.updated([2], [2.0], 0.0)
+		assert hierarchy.current_metric(cheaper) is None
+		path, distance = hierarchy.shortest_path([0], [3], hierarchy.update_metric(cheaper))
+
+		assert path == [0, 3]
+		assert distance == 2.0
+		assert hierarchy.current_metric(cheaper).version == cheaper.version
+
+	@pytest.mark.parametrize('seed', range(5))
+	def test_matches_dijkstra(self, seed, random_building):
+		graph_obj = SensorGraph(random_building(seed))
+		graph_obj.build_graph()
+		rng = random.Random(seed)
+		room_ids = sorted(graph_obj.rooms)
+		for query in range(10):
+			source, target = rng.sample(room_ids, 2)
+			_, expected = graph_obj.find_fastest_path(source, target)
+			path, distance = graph_obj.find_fastest_path(source, target, mode='ch')
+
+			assert distance == pytest.approx(expected)
+			sensor_ids = [sensor.id for sensor in path]
+			assert all(graph_obj.graph.has_edge(*pair) for pair in zip(sensor_ids, sensor_ids[1:]))
+			graph_obj.update_room_occupancy({rng.choice(room_ids): rng.randint(0, 60)})
+			assert graph_obj.hierarchy_builder.wait(timeout=5)
+
+	def test_falls_back_to_dijkstra_until_customized(self, random_building, monkeypatch):
+		graph_obj = SensorGraph(random_building(0))
+		graph_obj.build_graph()
+		hierarchy = graph_obj.contraction_hierarchy()
+		monkeypatch.setattr(graph_obj.hierarchy_builder, 'request_rebuild', lambda: None)
+		room_ids = sorted(graph_obj.rooms)
+		graph_obj.update_room_occupancy({room_id: 40 for room_id in room_ids[::2]})
+
+		weights = graph_obj.latest_weights()
+		assert hierarchy.current_metric(weights) is None
+		_, expected = graph_obj.find_fastest_path(room_ids[0], room_ids[-1])
+		_, distance = graph_obj.find_fastest_path(room_ids[0], room_ids[-1], mode='ch')
+		assert distance == pytest.approx(expected)
+
+		graph_obj.hierarchy_builder.build()
+		assert hierarchy.current_metric(weights).version == weights.version
+		_, distance = graph_obj.find_fastest_path(room_ids[0], room_ids[-1], mode='ch')
+		assert distance == pytest.approx(expected)
+
+	def test_unreachable_target(self):
+		hierarchy = ContractionHierarchy(3, [0], [1])
+		with pytest.raises(nx.NetworkXNoPath):
+			hierarchy.shortest_path([0], [2], hierarchy.customize([1.0, 0.0], 1))
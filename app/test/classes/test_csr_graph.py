@@ -0,0 +1,93 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.classes.csr_graph import CSRGraph
+from app.classes.shortest_path_tree import ShortestPathTree
+
+
+@pytest.fixture
+def square_graph():
+	edges = [('a', 'b', 1.0), ('b', 'c', 1.0), ('a', 'd', 4.0), ('c', 'd', 1.0)]
+	graph = nx.Graph()
+	graph.add_weighted_edges_from(edges)
+	node_index = {node_id: index for index, node_id in enumerate(graph.nodes)}
+	return graph, CSRGraph.from_index_edges(
+		list(graph.nodes),
+		[node_index[node1_id] for node1_id, _, _ in edges],
+		[node_index[node2_id] for _, node2_id, _ in edges],
+		[weight for _, _, weight in edges],
+	)
+
+
+class TestCSRGraph:
+	def test_from_index_edges_layout(self, square_graph):
+		_, csr_graph = square_graph
+		assert csr_graph.node_count == 4
+		assert list(csr_graph.offsets) == [0, 2, 4, 6, 8]
+		assert csr_graph.weights.dtype.name == 'float64'
+		assert len(csr_graph.neighbors) == 8
+
+	def test_dijkstra_matches_networkx(self, square_graph):
+		graph, csr_graph = square_graph
+		source = csr_graph.node_index['a']
+		target = csr_graph.node_index['d']
+
+		dist, pred = csr_graph.dijkstra(source, [target])
+		tree = ShortestPathTree(
+			'a', dist, pred, to_key=csr_graph.node_index.get, to_id=csr_graph.node_ids.__getitem__
+		)
+
+		assert tree.distance('d') == nx.dijkstra_path_length(graph, 'a', 'd')
+		assert tree.path('d') == nx.dijkstra_path(graph, 'a', 'd')
+
+	def test_with_weights_changes_route(self, square_graph):
+		_, square = square_graph
+		weights = square.weights.copy()
+		weights[square.edge_arcs[1]] = 10.0
+		csr_graph = square.with_weights(weights)
+		source = csr_graph.node_index['a']
+		target = csr_graph.node_index['d']
+
+		dist, pred = csr_graph.dijkstra(source, [target])
+		assert dist[target] == 4.0
+		assert pred[target] == source
+
+	def test_extra_arcs_are_relaxed(self, square_graph):
+		_, csr_graph = square_graph
+		virtual = csr_graph.node_count
+		extra_arcs = {virtual: [(csr_graph.node_index['c'], 0)]}
+
+		dist, _ = csr_graph.dijkstra(virtual, [csr_graph.node_index['d']], extra_arcs)
+		assert dist[csr_graph.node_index['d']] == 1.0
+
+	def test_search_stops_once_targets_are_settled(self, square_graph):
+		_, csr_graph = square_graph
+		dist, _ = csr_graph.dijkstra(csr_graph.node_index['a'], [csr_graph.node_index['b']])
+		assert csr_graph.node_index['d'] not in dist
+
+	def test_time_dependent_dijkstra_with_constant_weights(self, square_graph):
+		_, csr_graph = square_graph
+		table = np.repeat(csr_graph.weights[:, None], 3, axis=1)
+		source = csr_graph.node_index['a']
+
+		expected, _ = csr_graph.dijkstra(source)
+		dist, _ = csr_graph.time_dependent_dijkstra(source, table, 60.0, 10.0)
+
+		assert dist == expected
+
+	def test_time_dependent_dijkstra_reads_weight_at_arrival(self, square_graph):
+		_, csr_graph = square_graph
+		# The c-d edge gets expensive over the first minute; a-d keeps its weight.
+		table = np.repeat(csr_graph.weights[:, None], 2, axis=1)
+		table[csr_graph.edge_arcs[3], 1] = 10.0
+		source = csr_graph.node_index['a']
+		target = csr_graph.node_index['d']
+
+		early, _ = csr_graph.time_dependent_dijkstra(source, table, 60.0, 1.0, [target])
+		late, pred = csr_graph.time_dependent_dijkstra(source, table, 60.0, 30.0, [target])
+
+		# c is reached after 2 of 60 seconds: 1 + (10 - 1) * 2 / 60.
+		assert early[target] == pytest.approx(2.0 + 1.3)
+		assert late[target] == 4.0
+		assert pred[target] == source
@@ -0,0 +1,63 @@
+import networkx as nx
+import pytest
+
+from app.classes.room import Room
+from app.classes.sensor import Sensor
+from app.classes.sensor_graph import SensorGraph
+
+
+@pytest.fixture
+def two_floor_graph():
+	hall0 = Room('hall0', 'Hall', 1, 10, 100, 1, 0)
+	lobby0 = Room('lobby0', 'Lobby', 1, 40, 100, 1, 0)
+	hall1 = Room('hall1', 'Hall', 1, 10, 100, 1, 1)
+	exhibit1 = Room('exhibit1', 'Exhibit', 1, 5, 100, 1, 1)
+	stairs = Room('stairs', 'Stairs', 1, 0, 20, 1, 1)
+	sensors = [
+		Sensor('a', 0.0, 0.0, False, [lobby0, hall0]),
+		Sensor('b', 4.0, 0.0, False, [hall0]),
+		Sensor('c', 4.0, 3.0, False, [hall0, stairs]),
+		Sensor('d', 4.0, 4.0, False, [stairs, hall1]),
+		Sensor('e', 0.0, 4.0, False, [hall1, exhibit1]),
+		Sensor('lift', 0.0, 1.0, True, [lobby0, hall1]),
+	]
+	graph_obj = SensorGraph(sensors)
+	graph_obj.build_graph()
+	return graph_obj
+
+
+class TestFloorHierarchy:
+	def test_connectors_span_floors(self, two_floor_graph):
+		hierarchy = two_floor_graph.floor_hierarchy()
+		assert set(hierarchy.cells) == {0, 1}
+		assert sorted(hierarchy.connectors[0]) == ['c', 'lift']
+		assert sorted(hierarchy.connectors[1]) == ['c', 'lift']
+
+	@pytest.mark.parametrize('occupants', [0, 90])
+	def test_hierarchical_matches_dijkstra(self, two_floor_graph, occupants):
+		two_floor_graph.update_room_occupancy({'lobby0': occupants, 'stairs': 90 - occupants})
+
+		expected_path, expected = two_floor_graph.find_fastest_path('lobby0', 'exhibit1')
+		path, distance = two_floor_graph.find_fastest_path(
+			'lobby0', 'exhibit1', mode='hierarchical'
+		)
+
+		assert distance == pytest.approx(expected)
+		assert [sensor.id for sensor in path] == [sensor.id for sensor in expected_path]
+
+	def test_overlay_reuses_unchanged_floors(self, two_floor_graph):
+		hierarchy = two_floor_graph.floor_hierarchy()
+		before = hierarchy.current_overlay(two_floor_graph.current_weights())
+
+		two_floor_graph.update_room_occupancy({'hall1': 30})
+		assert two_floor_graph.hierarchy_builder.wait(timeout=5)
+		after = hierarchy.current_overlay(two_floor_graph.current_weights())
+
+		assert after.version == before.version + 1
+		assert after.cliques[0] is before.cliques[0]
+		assert after.cliques[1] is not before.cliques[1]
+
+	def test_unreachable_target(self, two_floor_graph):
+		two_floor_graph.graph.add_node('island')
+		with pytest.raises(nx.NetworkXNoPath):
+			two_floor_graph.find_fastest_path('a', 'island', mode='hierarchical')
@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.classes.csr_graph import CSRGraph
+from app.classes.landmark_index import LandmarkIndex
+from app.classes.sensor_graph import SensorGraph
+from app.classes.weight_snapshot import WeightSnapshot
+
+
+def path_graph() -> CSRGraph:
+	return CSRGraph.from_index_edges(['a', 'b', 'c', 'd'], [0, 1, 2], [1, 2, 3], [1.0, 2.0, 3.0])
+
+
+class TestLandmarkIndex:
+	def test_bounds_on_path(self):
+		index = LandmarkIndex(path_graph(), [1.0, 2.0, 3.0], landmark_count=2)
+
+		assert index.distances.shape == (2, 4)
+		assert list(index.lower_bounds([3])) == [6.0, 5.0, 3.0, 0.0]
+
+	def test_bound_scale_follows_weights(self):
+		index = LandmarkIndex(path_graph(), [1.0, 2.0, 3.0], landmark_count=1)
+		weights = WeightSnapshot(1, [2.0, 4.0, 9.0, 0.0], 0.0)
+
+		assert index.bound_scale(weights) == 2.0
+		assert index.bound_scale(weights.updated([0], [0.5], 0.0)) == 0.5
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	@pytest.mark.parametrize('seed', range(3))
+	def test_alt_matches_dijkstra(self, backend, seed, random_building):
+		graph_obj = SensorGraph(random_building(seed), backend=backend)
+		graph_obj.build_graph()
+		index = graph_obj.landmark_index()
+		rng = random.Random(seed)
+		room_ids = sorted(graph_obj.rooms)
+		for query in range(10):
+			source, target = rng.sample(room_ids, 2)
+			_, expected = graph_obj.find_fastest_path(source, target)
+			_, distance = graph_obj.find_fastest_path(source, target, mode='alt')
+
+			assert distance == pytest.approx(expected)
+			graph_obj.update_room_occupancy({rng.choice(room_ids): rng.randint(0, 60)})
+
+		assert graph_obj.landmark_index() is index
+
+	def test_bounds_are_admissible(self, random_building):
+		graph_obj = SensorGraph(random_building(7), backend='csr')
+		graph_obj.build_graph()
+		csr_graph = graph_obj.get_csr_graph()
+		target = csr_graph.node_ids[0]
+
+		bounds = graph_obj._astar_bounds(target, 'alt')
+		dist, _ = csr_graph.dijkstra(csr_graph.node_index[target])
+		reached = np.fromiter(dist, dtype=np.int64)
+
+		assert np.all(bounds[reached] <= np.fromiter(dist.values(), dtype=np.float64) + 1e-9)
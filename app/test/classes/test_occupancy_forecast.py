@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from app.classes.occupancy_forecast import OccupancyForecast
+
+
+class TestOccupancyForecast:
+	def test_popularity_sets_initial_trend(self):
+		forecast = OccupancyForecast(
+			['quiet', 'popular'], [10, 10], [1.0, 2.0], bucket_count=5, timestamp=0.0
+		)
+
+		predicted = forecast.forecast(timestamp=0.0)
+
+		assert predicted.shape == (2, 5)
+		assert list(predicted[0]) == [10, 10, 10, 10, 10]
+		assert list(predicted[1]) == [10, 12, 14, 16, 18]
+
+	def test_observations_update_trend(self):
+		forecast = OccupancyForecast(
+			['room'], [0], [1.0], bucket_seconds=60.0, trend_smoothing=1.0, timestamp=0.0
+		)
+		for minute in range(1, 4):
+			forecast.observe({'room': 10 * minute}, timestamp=60.0 * minute)
+
+		predicted = forecast.forecast(timestamp=180.0)
+
+		assert predicted[0, 0] == 30
+		assert np.all(np.diff(predicted[0]) > 0)
+		assert forecast.trend[0] > 0
+
+	def test_forecast_is_never_negative(self):
+		forecast = OccupancyForecast(
+			['room'],
+			[10],
+			[1.0],
+			bucket_seconds=60.0,
+			bucket_count=3,
+			level_smoothing=1.0,
+			trend_smoothing=1.0,
+			timestamp=0.0,
+		)
+		forecast.observe({'room': 4}, timestamp=60.0)
+
+		assert forecast.trend[0] == -6
+		assert list(forecast.forecast(timestamp=60.0)[0]) == [4, 0, 0]
+
+	def test_unknown_rooms_are_ignored(self):
+		forecast = OccupancyForecast(['room'], [3], [1.0], timestamp=0.0)
+		forecast.observe({'other': 5}, timestamp=10.0)
+		assert forecast.forecast(timestamp=10.0)[0, 0] == pytest.approx(3)
@@ -0,0 +1,69 @@
+import time
+
+from app.classes.building_registry import BuildingRegistry
+from app.classes.occupancy_ingestor import OccupancyIngestor
+from app.test.classes.test_topology_cache import make_rooms, make_sensors
+
+
+def make_ingestor(window=60.0):
+	registry = BuildingRegistry()
+	topology = registry.register('museum', make_rooms(5, 3), make_sensors())
+	return OccupancyIngestor(registry, window=window), topology
+
+
+class TestOccupancyIngestor:
+	def test_events_are_coalesced_per_room(self):
+		ingestor, topology = make_ingestor()
+		version = topology.sensor_graph.weights_version
+
+		ingestor.record_pass('museum', 'roomA', 'roomB')
+		ingestor.record_pass('museum', 'roomA', 'roomB')
+		ingestor.record_pass('museum', None, 'roomA')
+		assert topology.room_mapping['roomA'].occupants == 5
+
+		assert ingestor.flush() == 2
+		assert topology.room_mapping['roomA'].occupants == 4
+		assert topology.room_mapping['roomB'].occupants == 5
+		assert topology.sensor_graph.weights_version == version + 1
+		assert ingestor.stats['batches'] == 1
+		ingestor.stop()
+
+	def test_count_supersedes_earlier_passes(self):
+		ingestor, topology = make_ingestor()
+		ingestor.record_pass('museum', None, 'roomA')
+		ingestor.record_count('museum', 'roomA', 20)
+		ingestor.record_pass('museum', 'roomA', None)
+		ingestor.flush()
+
+		assert topology.room_mapping['roomA'].occupants == 19
+		ingestor.stop()
+
+	def test_occupants_never_drop_below_zero(self):
+		ingestor, topology = make_ingestor()
+		for _ in range(10):
+			ingestor.record_pass('museum', 'roomB', None)
+		ingestor.flush()
+
+		assert topology.room_mapping['roomB'].occupants == 0
+		ingestor.stop()
+
+	def test_unknown_rooms_and_buildings_are_dropped(self):
+		ingestor, topology = make_ingestor()
+		ingestor.record_count('museum', 'lobby', 4)
+		ingestor.record_count('annex', 'roomA', 4)
+		ingestor.record_count('museum', 'roomA', 9)
+
+		assert ingestor.flush() == 1
+		assert ingestor.stats['dropped'] == 2
+		assert topology.room_mapping['roomA'].occupants == 9
+		ingestor.stop()
+
+	def test_background_thread_applies_events(self):
+		ingestor, topology = make_ingestor(window=0.01)
+		ingestor.record_count('museum', 'roomA', 12)
+
+		deadline = time.time() + 5
+		while topology.room_mapping['roomA'].occupants != 12 and time.time() < deadline:
+			time.sleep(0.01)
+		assert topology.room_mapping['roomA'].occupants == 12
+		ingestor.stop()
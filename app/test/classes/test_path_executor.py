@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.classes.path_executor import ExecutorBusyError, PathExecutor
+
+
+class TestPathExecutor:
+	def test_runs_job_on_pool(self):
+		executor = PathExecutor(max_workers=1)
+		try:
+			assert asyncio.run(executor.run(pow, 2, 10)) == 1024
+			assert executor.in_flight == 0
+		finally:
+			executor.shutdown()
+
+	def test_rejects_jobs_over_in_flight_limit(self):
+		executor = PathExecutor(max_workers=1, max_in_flight=1)
+		release = threading.Event()
+
+		async def scenario():
+			blocking = asyncio.ensure_future(executor.run(release.wait, 5))
+			await asyncio.sleep(0.05)
+			with pytest.raises(ExecutorBusyError):
+				await executor.run(pow, 2, 2)
+			release.set()
+			return await blocking
+
+		try:
+			assert asyncio.run(scenario()) is True
+		finally:
+			executor.shutdown()
+
+	def test_queue_timeout(self):
+		executor = PathExecutor(max_workers=1, queue_timeout=0.05)
+		release = threading.Event()
+
+		async def scenario():
+			blocking = asyncio.ensure_future(executor.run(release.wait, 5))
+			await asyncio.sleep(0)
+			# Rejected after queue_timeout, while the blocking job still runs.
+			with pytest.raises(ExecutorBusyError):
+				await asyncio.wait_for(executor.run(pow, 2, 2), 1)
+			assert not release.is_set()
+			release.set()
+			return await blocking
+
+		try:
+			assert asyncio.run(scenario()) is True
+		finally:
+			executor.shutdown()
+
+	def test_cancelled_job_keeps_slot_until_it_finishes(self):
+		executor = PathExecutor(max_workers=1, queue_timeout=0.05)
+		release = threading.Event()
+		finished = threading.Event()
+
+		def job():
+			release.wait(5)
+			finished.set()
+
+		async def scenario():
+			blocking = asyncio.ensure_future(executor.run(job))
+			await asyncio.sleep(0.02)
+			blocking.cancel()
+			await asyncio.sleep(0.02)
+			assert executor.in_flight == 1
+			with pytest.raises(ExecutorBusyError):
+				await executor.run(pow, 2, 2)
+
+			release.set()
+			await asyncio.to_thread(finished.wait, 5)
+			await asyncio.sleep(0.02)
+			assert executor.in_flight == 0
+			return await executor.run(pow, 2, 2)
+
+		try:
+			assert asyncio.run(scenario()) == 4
+		finally:
+			executor.shutdown()
+
+	def test_process_pool(self):
+		executor = PathExecutor(kind='process', max_workers=1)
+		try:
+			assert asyncio.run(executor.run(pow, 3, 3)) == 27
+		finally:
+			executor.shutdown()
+
+	def test_unknown_kind(self):
+		with pytest.raises(ValueError):
+			PathExecutor(kind='fiber')
@@ -0,0 +1,70 @@
+import pytest
+
+from app.classes.path_result_cache import PathResultCache
+from app.classes.room import Room
+from app.classes.sensor import Sensor
+from app.classes.sensor_graph import SensorGraph
+
+KEY = ('topology', 'room1', 'room3', 'dijkstra')
+
+
+@pytest.fixture
+def cached_graph():
+	rooms = [Room(f'room{i}', f'Room {i}', 1, 10, 100, 1, 1) for i in range(1, 5)]
+	sensors = [
+		Sensor('sensor1', 0.0, 0.0, False, [rooms[0], rooms[1]]),
+		Sensor('sensor2', 1.0, 0.0, False, [rooms[1], rooms[2]]),
+		Sensor('sensor3', 0.0, 1.0, False, [rooms[0], rooms[3]]),
+	]
+	graph_obj = SensorGraph(sensors)
+	graph_obj.build_graph()
+	path = [sensors[0], sensors[1]]
+	cache = PathResultCache(max_entries=2, ttl=60)
+	weights = graph_obj.current_weights()
+	cache.put(
+		KEY, graph_obj, weights, path, 1.0, graph_obj.path_edge_indices(['sensor1', 'sensor2'])
+	)
+	return cache, graph_obj, path
+
+
+class TestPathResultCache:
+	def test_hit_and_miss(self, cached_graph):
+		cache, graph_obj, path = cached_graph
+		assert cache.get(KEY, graph_obj, graph_obj.current_weights()) == (path, 1.0)
+		assert cache.get(('topology', 'room1', 'room4', 'dijkstra'), graph_obj, None) is None
+		assert cache.stats['hits'] == 1
+		assert cache.stats['misses'] == 1
+
+	def test_more_expensive_edge_off_the_path_keeps_entry(self, cached_graph):
+		cache, graph_obj, path = cached_graph
+		graph_obj.update_room_occupancy({'room1': 80})
+		assert cache.get(KEY, graph_obj, graph_obj.current_weights()) == (path, 1.0)
+
+	def test_changed_edge_on_the_path_invalidates(self, cached_graph):
+		cache, graph_obj, _ = cached_graph
+		graph_obj.update_room_occupancy({'room2': 80})
+		assert cache.get(KEY, graph_obj, graph_obj.current_weights()) is None
+		assert cache.stats['invalidated'] == 1
+		assert len(cache) == 0
+
+	def test_cheaper_edge_anywhere_invalidates(self, cached_graph):
+		cache, graph_obj, _ = cached_graph
+		graph_obj.update_room_occupancy({'room1': 0})
+		assert cache.get(KEY, graph_obj, graph_obj.current_weights()) is None
+
+	def test_expired_entry_is_dropped(self, cached_graph):
+		cache, graph_obj, _ = cached_graph
+		cache.ttl = 0
+		cache.put(KEY, graph_obj, graph_obj.current_weights(), [], 0.0, [])
+		assert cache.get(KEY, graph_obj, graph_obj.current_weights()) is None
+		assert cache.stats['expired'] == 1
+
+	def test_least_recently_used_entry_is_evicted(self, cached_graph):
+		cache, graph_obj, _ = cached_graph
+		weights = graph_obj.current_weights()
+		cache.put(('topology', 'a', 'b', 'dijkstra'), graph_obj, weights, [], 0.0, [])
+		cache.get(KEY, graph_obj, weights)
+		cache.put(('topology', 'c', 'd', 'dijkstra'), graph_obj, weights, [], 0.0, [])
+		assert cache.stats['evicted'] == 1
+		assert cache.get(KEY, graph_obj, weights) is not None
+		assert cache.get(('topology', 'a', 'b', 'dijkstra'), graph_obj, weights) is None
@@ -0,0 +1,77 @@
+import pytest
+
+from app.classes.room import Room
+from app.classes.room_distance_matrix import RoomDistanceMatrix
+from app.classes.sensor import Sensor
+from app.classes.sensor_graph import SensorGraph
+
+
+@pytest.fixture
+def corridor_graph():
+	rooms = [Room(f'room{i}', f'Room {i}', 0.5, i * 5, 50, 1.0, 1) for i in range(4)]
+	sensors = [
+		Sensor(f'sensor{i}', float(i), 0.0, False, [rooms[i], rooms[i + 1]]) for i in range(3)
+	]
+	sensors.append(Sensor('sensor_end', 4.0, 1.0, False, [rooms[3]]))
+	graph_obj = SensorGraph(sensors)
+	graph_obj.build_graph()
+	return graph_obj
+
+
+class TestRoomDistanceMatrix:
+	def test_matrix_matches_fastest_paths(self, corridor_graph):
+		matrix = RoomDistanceMatrix.build(corridor_graph)
+
+		path, distance = corridor_graph.find_fastest_path('room0', 'room3')
+
+		assert matrix.distance('room0', 'room3') == distance
+		assert matrix.path('room0', 'room3') == [sensor.id for sensor in path]
+		assert matrix.distance('room3', 'room0') == pytest.approx(distance)
+		assert matrix.distance('room1', 'room1') == 0.0
+
+	def test_room_subset_and_memory_bound(self, corridor_graph):
+		matrix = RoomDistanceMatrix.build(corridor_graph, room_ids=['room0', 'room2'])
+		assert matrix.distances.shape == (2, 2)
+		assert matrix.covers(['room0', 'room2'])
+		assert not matrix.covers(['room1'])
+
+		with pytest.raises(ValueError):
+			RoomDistanceMatrix.build(corridor_graph, max_bytes=16)
+
+	def test_builder_rebuilds_after_weight_change(self, corridor_graph):
+		builder = corridor_graph.enable_distance_matrix(background=False)
+		first = builder.current()
+		assert first is not None
+
+		corridor_graph.update_room_occupancy({'room1': 40})
+		builder.wait(timeout=5)
+		second = builder.current()
+
+		assert second is not first
+		assert second.weights_version == corridor_graph.weights_version
+		assert second.distance('room0', 'room2') > first.distance('room0', 'room2')
+
+	def test_tour_reads_up_to_date_matrix(self, corridor_graph):
+		expected_path, _ = corridor_graph.find_multi_point_path_nearest_neighbor('room0', ['room3'])
+		matrix = corridor_graph.enable_distance_matrix(background=False).current()
+		matrix.distances[matrix.room_index['room0'], matrix.room_index['room3']] = 123.0
+
+		path, distance = corridor_graph.find_multi_point_path_nearest_neighbor('room0', ['room3'])
+
+		assert distance == 123.0
+		assert path == expected_path
+
+	def test_builder_returns_to_idle_after_a_failed_build(self, corridor_graph, monkeypatch):
+		build = RoomDistanceMatrix.build
+
+		def failing_build(*args):
+			raise ZeroDivisionError('float division by zero')
+
+		monkeypatch.setattr(RoomDistanceMatrix, 'build', failing_build)
+		builder = corridor_graph.enable_distance_matrix(background=False)
+		assert builder.wait(timeout=0)
+		assert builder.current() is None
+
+		monkeypatch.setattr(RoomDistanceMatrix, 'build', build)
+		builder.request_rebuild()
+		assert builder.current() is not None
@@ -0,0 +1,36 @@
+import pytest
+
+from app.classes.route_dispersion import RouteDispersion
+
+
+class TestRouteDispersion:
+	def test_shares_are_inverse_to_distance(self):
+		assert RouteDispersion.shares([1.0, 2.0]) == pytest.approx([2 / 3, 1 / 3])
+		assert RouteDispersion.shares([0.0, 2.0]) == [1.0, 0.0]
+
+	def test_assignments_follow_shares(self):
+		dispersion = RouteDispersion()
+		picks = [dispersion.assign('key', ['a', 'b'], [1.0, 2.0]) for _ in range(30)]
+
+		assert picks.count(0) == 20
+		assert picks.count(1) == 10
+		assert all(pair != (1, 1) for pair in zip(picks, picks[1:]))
+
+	def test_single_route_is_always_assigned(self):
+		dispersion = RouteDispersion()
+		assert dispersion.assign('key', ['a'], [1.0]) == 0
+		assert len(dispersion) == 0
+
+	def test_credit_follows_route_signature(self):
+		dispersion = RouteDispersion()
+		assert dispersion.assign('key', ['a', 'b'], [1.0, 1.0]) == 0
+		# Route 'a' is offered second now; it already had its turn.
+		assert dispersion.assign('key', ['c', 'a'], [1.0, 1.0]) == 0
+
+	def test_least_recently_used_key_is_forgotten(self):
+		dispersion = RouteDispersion(max_entries=2)
+		for key in ('first', 'second', 'third'):
+			dispersion.assign(key, ['a', 'b'], [1.0, 1.0])
+
+		assert len(dispersion) == 2
+		assert dispersion.assign('first', ['a', 'b'], [1.0, 1.0]) == 0
@@ -1,5 +1,8 @@
+import itertools
+
 import pytest
 import networkx as nx
+import numpy as np
 from app.classes.sensor import Sensor
 from app.classes.room import Room
 from app.classes.sensor_graph import SensorGraph
@@ -49,6 +52,17 @@ class TestSensorGraph:
 		assert graph.has_edge('sensor2', 'sensor3')
 		assert list(graph.adj['sensor4']) == []
 
+	def test_membership_pairs_follow_combinations_order(self):
+		group_sizes = np.array([3, 1, 4])
+		first, second, groups = SensorGraph._membership_pairs(group_sizes)
+
+		expected = [
+			(start + i, start + j, group)
+			for group, (start, size) in enumerate(zip([0, 3, 4], group_sizes))
+			for i, j in itertools.combinations(range(size), 2)
+		]
+		assert list(zip(first.tolist(), second.tolist(), groups.tolist())) == expected
+
 	def test_edge_with_multiple_shared_rooms(self):
 		room1 = Room('room1', 'Room A', 5, 100, 200, 1.9, 1)
 		room2 = Room('room2', 'Room B', 3, 50, 150, 0.9, 1)
@@ -95,3 +109,325 @@ class TestSensorGraph:
 		graph_obj.build_graph()
 		with pytest.raises(nx.NetworkXNoPath):
 			graph_obj.find_fastest_path('sensor1', 'sensor2')
+
+	def test_update_room_occupancy_touches_only_room_edges(self):
+		room1 = Room('room1', 'Room A', 2, 10, 100, 1.2, 1)
+		room2 = Room('room2', 'Room B', 3, 20, 100, 1.2, 1)
+		sensor1 = Sensor('sensor1', 0.0, 0.0, False, [room1])
+		sensor2 = Sensor('sensor2', 3.0, 4.0, False, [room1, room2])
+		sensor3 = Sensor('sensor3', 6.0, 8.0, False, [room2])
+		graph_obj = SensorGraph([sensor1, sensor2, sensor3])
+		graph = graph_obj.build_graph()
+		untouched_weight = graph['sensor2']['sensor3']['weight']
+
+		updated = graph_obj.update_room_occupancy({'room1': 50})
+
+		assert updated == 1
+		assert room1.occupants == 50
+		assert graph['sensor1']['sensor2']['weight'] == 5.0 * room1.calculate_weight() * 2.0
+		assert graph['sensor2']['sensor3']['weight'] == untouched_weight
+
+	def test_update_room_occupancy_unknown_room(self, sensors_and_rooms):
+		sensors, (room1, _, _, _, _) = sensors_and_rooms
+		graph_obj = SensorGraph(sensors)
+		graph_obj.build_graph()
+		with pytest.raises(ValueError):
+			graph_obj.update_room_occupancy({'room1': 10, 'missing_room': 3})
+		assert room1.occupants == 100
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_pinned_weights_ignore_later_updates(self, backend):
+		room1 = Room('room1', 'Room A', 2, 10, 100, 1.2, 1)
+		room2 = Room('room2', 'Room B', 3, 20, 100, 1.2, 1)
+		sensor1 = Sensor('sensor1', 0.0, 0.0, False, [room1])
+		sensor2 = Sensor('sensor2', 3.0, 4.0, False, [room1, room2])
+		sensor3 = Sensor('sensor3', 6.0, 8.0, False, [room2])
+		graph_obj = SensorGraph([sensor1, sensor2, sensor3], backend=backend)
+		graph_obj.build_graph()
+
+		with graph_obj.pinned_weights() as pinned:
+			_, before = graph_obj.find_fastest_path('sensor1', 'sensor3')
+			graph_obj.update_room_occupancy({'room1': 50})
+			_, during = graph_obj.find_fastest_path('sensor1', 'sensor3')
+			assert graph_obj.weights_version == pinned.version
+
+		_, after = graph_obj.find_fastest_path('sensor1', 'sensor3')
+		assert during == before
+		assert after > before
+		assert graph_obj.weights_version == pinned.version + 1
+
+	def test_csr_backend_matches_networkx(self):
+		results = []
+		for backend in ('networkx', 'csr'):
+			rooms = [Room(f'room{i}', f'Room {i}', 0.3, i * 3, 50, 1.0, i % 2) for i in range(6)]
+			sensors = [
+				Sensor(f'sensor{i}', float(i), float(i % 3), False, [rooms[i], rooms[(i + 1) % 6]])
+				for i in range(6)
+			]
+			graph_obj = SensorGraph(sensors, backend=backend)
+			graph_obj.build_graph()
+			path, distance = graph_obj.find_fastest_path('room0', 'room4')
+			tour, tour_distance = graph_obj.find_multi_point_path_nearest_neighbor(
+				'room0', ['room2', 'room4']
+			)
+			graph_obj.update_room_occupancy({'room1': 40})
+			updated_path, updated_distance = graph_obj.find_fastest_path('room0', 'room4')
+			results.append(
+				(
+					[s.id for s in path],
+					distance,
+					[s.id for s in tour],
+					tour_distance,
+					[s.id for s in updated_path],
+					updated_distance,
+				)
+			)
+		assert results[0] == results[1]
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_room_endpoints_do_not_modify_graph(self, backend):
+		start = Room('start', 'Start', 1.0, 0, 10, 1.0, 1)
+		hall = Room('hall', 'Hall', 1.0, 90, 10, 1.0, 1)
+		corridor = Room('corridor', 'Corridor', 1.0, 0, 10, 1.0, 1)
+		exit_room = Room('exit', 'Exit', 1.0, 0, 10, 1.0, 1)
+		sensors = [
+			Sensor('sensor0', -1.0, 0.0, False, [start]),
+			Sensor('sensor1', 0.0, 0.0, False, [start, hall, corridor]),
+			Sensor('sensor2', 1.0, 0.0, False, [corridor]),
+			Sensor('sensor3', 2.0, 0.0, False, [corridor]),
+			Sensor('sensor4', 3.0, 0.0, False, [hall, corridor, exit_room]),
+			Sensor('sensor5', 4.0, 0.0, False, [exit_room]),
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph = graph_obj.build_graph()
+		edge_count = graph.number_of_edges()
+
+		tree = graph_obj.shortest_path_tree('start', ['hall', 'exit'])
+		_, distance = graph_obj.find_fastest_path('start', 'exit')
+
+		# Reaching the hall ends there: the way to the exit takes the corridor.
+		assert 'hall' not in tree.path('exit')
+		assert tree.distance('exit') == pytest.approx(distance)
+		assert distance == pytest.approx(0.03)
+		assert sorted(graph) == [sensor.id for sensor in sensors]
+		assert graph.number_of_edges() == edge_count
+
+	def test_unknown_backend(self):
+		with pytest.raises(ValueError):
+			SensorGraph([], backend='igraph')
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_shortest_path_tree_serves_every_target(self, backend):
+		room1 = Room('room1', 'Room A', 2, 10, 100, 1.2, 1)
+		room2 = Room('room2', 'Room B', 3, 20, 100, 1.2, 1)
+		sensor1 = Sensor('sensor1', 0.0, 0.0, False, [room1])
+		sensor2 = Sensor('sensor2', 3.0, 4.0, False, [room1, room2])
+		sensor3 = Sensor('sensor3', 6.0, 8.0, False, [room2])
+		graph_obj = SensorGraph([sensor1, sensor2, sensor3], backend=backend)
+		graph = graph_obj.build_graph()
+
+		tree = graph_obj.shortest_path_tree('sensor1')
+
+		for target in ('sensor2', 'sensor3'):
+			assert tree.distance(target) == nx.dijkstra_path_length(graph, 'sensor1', target)
+			assert tree.path(target) == nx.dijkstra_path(graph, 'sensor1', target)
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	@pytest.mark.parametrize('mode', ['astar', 'bidirectional'])
+	def test_search_modes_find_shortest_path(self, backend, mode):
+		rooms = [Room(f'room{i}', f'Room {i}', 0.3, i * 4, 50, 1.0, 1) for i in range(5)]
+		sensors = [
+			Sensor(f'sensor{i}', float(i), float(i % 2), False, [rooms[i], rooms[(i + 1) % 5]])
+			for i in range(5)
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph = graph_obj.build_graph()
+
+		path, distance = graph_obj.find_fastest_path('room0', 'room3', mode=mode)
+
+		expected_graph = graph.copy()
+		for room in (rooms[0], rooms[3]):
+			expected_graph.add_edges_from(
+				(sensor.id, room.id, {'weight': 0}) for sensor in sensors if room in sensor.rooms
+			)
+		assert distance == pytest.approx(nx.dijkstra_path_length(expected_graph, 'room0', 'room3'))
+		assert [sensor.id for sensor in path] == nx.dijkstra_path(expected_graph, 'room0', 'room3')[
+			1:-1
+		]
+
+	def test_heuristic_scale_uses_empty_room_weight(self):
+		room1 = Room('room1', 'Room A', 2, 0, 100, 1.2, 1)
+		room2 = Room('room2', 'Room B', 3, 20, 100, 1.2, 1)
+		sensor1 = Sensor('sensor1', 0.0, 0.0, False, [room1, room2])
+		sensor2 = Sensor('sensor2', 3.0, 4.0, False, [room1, room2])
+		graph_obj = SensorGraph([sensor1, sensor2])
+		graph_obj.build_graph()
+		assert graph_obj.heuristic_scale() == pytest.approx(0.01)
+
+	def test_unknown_search_mode(self, sensors_and_rooms):
+		sensors, _ = sensors_and_rooms
+		graph_obj = SensorGraph(sensors)
+		graph_obj.build_graph()
+		with pytest.raises(ValueError):
+			graph_obj.find_fastest_path('sensor1', 'sensor2', mode='teleport')
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_optimized_tour_not_longer_than_nearest_neighbor(self, backend):
+		rooms = [Room(f'room{i}', f'Room {i}', 0.5, i * 3, 50, 1.0, 1) for i in range(6)]
+		sensors = [
+			Sensor(f'sensor{i}', float(i), float(i % 3), False, [rooms[i], rooms[(i + 1) % 6]])
+			for i in range(6)
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph_obj.build_graph()
+		targets = ['room3', 'room1', 'room5', 'room2']
+
+		_, greedy_distance = graph_obj.find_multi_point_path_nearest_neighbor('room0', targets)
+		path, distance = graph_obj.find_multi_point_path_optimized('room0', targets)
+
+		assert distance <= greedy_distance + 1e-9
+		assert path and all(sensor.id.startswith('sensor') for sensor in path)
+
+	def test_optimized_tour_unknown_room(self, sensors_and_rooms):
+		sensors, _ = sensors_and_rooms
+		graph_obj = SensorGraph(sensors)
+		graph_obj.build_graph()
+		with pytest.raises(ValueError):
+			graph_obj.find_multi_point_path_optimized('room1', ['room_missing'])
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_find_paths_from_room_matches_single_queries(self, backend):
+		rooms = [Room(f'room{i}', f'Room {i}', 0.5, i * 3, 50, 1.0, 1) for i in range(6)]
+		sensors = [
+			Sensor(f'sensor{i}', float(i), float(i % 3), False, [rooms[i], rooms[(i + 1) % 6]])
+			for i in range(6)
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph_obj.build_graph()
+
+		paths = graph_obj.find_paths_from_room('room0', ['room0', 'room2', 'room4'])
+
+		assert paths['room0'] == ([], 0)
+		for target in ('room2', 'room4'):
+			expected_path, expected_distance = graph_obj.find_fastest_path('room0', target)
+			path, distance = paths[target]
+			assert distance == pytest.approx(expected_distance)
+			assert [sensor.id for sensor in path] == [sensor.id for sensor in expected_path]
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_find_room_distances_with_budget(self, backend):
+		rooms = [Room(f'room{i}', f'Room {i}', 0.5, 0, 50, 1.0, 1) for i in range(5)]
+		sensors = [
+			Sensor(f'sensor{i}', float(i), 0.0, False, [rooms[i], rooms[i + 1]]) for i in range(4)
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph_obj.build_graph()
+
+		distances = graph_obj.find_room_distances('room0')
+		assert list(distances) == ['room0', 'room1', 'room2', 'room3', 'room4']
+		assert distances['room1'] == 0
+		assert distances['room3'] == pytest.approx(0.02)
+
+		within_budget = graph_obj.find_room_distances('room0', budget=0.015)
+		assert list(within_budget) == ['room0', 'room1', 'room2']
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_find_alternative_paths_uses_parallel_corridor(self, backend):
+		start = Room('start', 'Start', 1, 0, 100, 1.0, 1)
+		north = Room('north', 'North', 1, 10, 100, 1.0, 1)
+		south = Room('south', 'South', 1, 20, 100, 1.0, 1)
+		end = Room('end', 'End', 1, 0, 100, 1.0, 1)
+		sensors = [
+			Sensor('sensor1', 0.0, 1.0, False, [start, north]),
+			Sensor('sensor2', 2.0, 1.0, False, [north, end]),
+			Sensor('sensor3', 0.0, -1.0, False, [start, south]),
+			Sensor('sensor4', 2.0, -1.0, False, [south, end]),
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph_obj.build_graph()
+
+		routes = graph_obj.find_alternative_paths('start', 'end', k=3)
+		_, fastest = graph_obj.find_fastest_path('start', 'end')
+
+		assert [[sensor.id for sensor in path] for path, _ in routes] == [
+			['sensor1', 'sensor2'],
+			['sensor3', 'sensor4'],
+		]
+		assert routes[0][1] == pytest.approx(fastest)
+		assert routes[1][1] == pytest.approx(2 * 1.2)
+		assert len(graph_obj.find_alternative_paths('start', 'end', k=1)) == 1
+		assert len(graph_obj.find_alternative_paths('start', 'end', max_stretch=1.05)) == 1
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_find_alternative_paths_reads_one_weights_version(self, backend, monkeypatch):
+		start = Room('start', 'Start', 1, 0, 100, 1.0, 1)
+		north = Room('north', 'North', 1, 10, 100, 1.0, 1)
+		south = Room('south', 'South', 1, 20, 100, 1.0, 1)
+		end = Room('end', 'End', 1, 0, 100, 1.0, 1)
+		sensors = [
+			Sensor('sensor1', 0.0, 1.0, False, [start, north]),
+			Sensor('sensor2', 2.0, 1.0, False, [north, end]),
+			Sensor('sensor3', 0.0, -1.0, False, [start, south]),
+			Sensor('sensor4', 2.0, -1.0, False, [south, end]),
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph_obj.build_graph()
+		expected = graph_obj.find_alternative_paths('start', 'end', k=3)
+		search_space = graph_obj._csr_search_space
+
+		def search_space_then_update(*args):
+			# Another request publishes new occupancy once the search space is read.
+			result = search_space(*args)
+			north.occupants = 90
+			graph_obj.refresh_room_weights(['north'])
+			return result
+
+		monkeypatch.setattr(graph_obj, '_csr_search_space', search_space_then_update)
+		routes = graph_obj.find_alternative_paths('start', 'end', k=3)
+
+		assert [distance for _, distance in routes] == pytest.approx(
+			[distance for _, distance in expected]
+		)
+
+	@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+	def test_forecast_tour_with_steady_forecast_matches_nearest_neighbor(self, backend):
+		rooms = [Room(f'room{i}', f'Room {i}', 0.5, 4 * i, 50, 1.0, 1) for i in range(5)]
+		sensors = [
+			Sensor(f'sensor{i}', float(i), 0.0, False, [rooms[i], rooms[i + 1]]) for i in range(4)
+		]
+		graph_obj = SensorGraph(sensors, backend=backend)
+		graph_obj.build_graph()
+		room_ids = [room.id for room in rooms]
+		steady = np.repeat(np.array([[room.occupants] for room in rooms], dtype=np.float64), 3, 1)
+
+		table = graph_obj.forecast_edge_weights(room_ids, steady)
+		assert list(table[:, 2]) == graph_obj.current_weights().edge_weights[:-1]
+
+		path, distance = graph_obj.find_multi_point_path_forecast(
+			'room0', ['room4', 'room2'], table, 60.0, 1.0
+		)
+		expected_path, expected = graph_obj.find_multi_point_path_nearest_neighbor(
+			'room0', ['room4', 'room2']
+		)
+		assert distance == pytest.approx(expected)
+		assert [sensor.id for sensor in path] == [sensor.id for sensor in expected_path]
+
+	def test_forecast_tour_weighs_rooms_when_reached(self):
+		rooms = [Room(f'room{i}', f'Room {i}', 1.0, 0, 10, 1.0, 1) for i in range(4)]
+		sensors = [
+			Sensor(f'sensor{i}', 10.0 * i, 0.0, False, [rooms[i], rooms[i + 1]]) for i in range(3)
+		]
+		graph_obj = SensorGraph(sensors)
+		graph_obj.build_graph()
+		# room2 is empty now and full from the second bucket on.
+		forecast = np.zeros((4, 3))
+		forecast[2, 1:] = 10
+		table = graph_obj.forecast_edge_weights(['room0', 'room1', 'room2', 'room3'], forecast)
+
+		_, early = graph_obj.find_multi_point_path_forecast('room0', ['room3'], table, 60.0, 1.0)
+		_, late = graph_obj.find_multi_point_path_forecast('room0', ['room3'], table, 0.01, 1.0)
+
+		# room2 is reached after room1's edge (weight 0.1): early in a minute-long
+		# bucket, but after several 0.01 second buckets.
+		assert early < 1
+		assert late == pytest.approx(0.1 + 10 * 2.0)
@@ -0,0 +1,100 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from app.classes.room import Room
+from app.classes.sensor import Sensor
+from app.classes.sensor_graph import SensorGraph
+from app.classes.shared_graph import (
+	GraphSnapshot,
+	SolverPool,
+	attached_graph,
+	solve_fastest_path,
+	solve_multi_point_path,
+)
+from app.classes.topology_cache import CachedTopology
+
+
+def make_graph():
+	rooms = [Room(f'room{i}', f'Room {i}', 0.5, i * 3, 50, 1.0, 1) for i in range(6)]
+	sensors = [
+		Sensor(f'sensor{i}', float(i), float(i % 3), False, [rooms[i], rooms[(i + 1) % 6]])
+		for i in range(6)
+	]
+	graph_obj = SensorGraph(sensors, backend='csr')
+	graph_obj.build_graph()
+	return graph_obj, {room.id: room for room in rooms}
+
+
+def expected_fastest_path(graph_obj, source, target, mode='dijkstra'):
+	path, distance = graph_obj.find_fastest_path(source, target, mode=mode)
+	return [sensor.id for sensor in path], distance
+
+
+class TestSharedGraph:
+	@pytest.mark.parametrize('mode', ['dijkstra', 'astar', 'bidirectional'])
+	def test_snapshot_matches_sensor_graph(self, mode):
+		graph_obj, _ = make_graph()
+		snapshot = GraphSnapshot(graph_obj)
+		handle = snapshot.acquire(graph_obj)
+		try:
+			result = solve_fastest_path(handle, 'room0', 'room3', mode)
+			assert result == expected_fastest_path(graph_obj, 'room0', 'room3', mode)
+		finally:
+			snapshot.release(handle)
+			snapshot.close()
+
+	def test_weight_update_publishes_new_block(self):
+		graph_obj, rooms = make_graph()
+		snapshot = GraphSnapshot(graph_obj)
+		old_handle = snapshot.acquire(graph_obj)
+
+		rooms['room1'].occupants = 40
+		graph_obj.refresh_room_weights(['room1'])
+		new_handle = snapshot.acquire(graph_obj)
+
+		assert new_handle.weights.name != old_handle.weights.name
+		assert new_handle.structure == old_handle.structure
+		assert (
+			attached_graph(new_handle).get_csr_graph().weights == graph_obj.get_csr_graph().weights
+		).all()
+
+		snapshot.release(old_handle)
+		assert old_handle.weights.name not in snapshot._memory
+		snapshot.release(new_handle)
+		snapshot.close()
+
+	def test_solver_pool_answers_queries(self):
+		graph_obj, rooms = make_graph()
+		topology = CachedTopology('topology', rooms, graph_obj)
+		pool = SolverPool(max_workers=1)
+		try:
+			with pool.lease(topology) as lease:
+				fastest = lease.run(solve_fastest_path, 'room0', 'room3', 'dijkstra')
+				tour = lease.run(solve_multi_point_path, 'room0', ['room2', 'room4'])
+		finally:
+			pool.shutdown()
+
+		assert fastest == expected_fastest_path(graph_obj, 'room0', 'room3')
+		path, distance = graph_obj.find_multi_point_path_nearest_neighbor(
+			'room0', ['room2', 'room4']
+		)
+		assert tour[1] == pytest.approx(distance)
+
+	def test_evicted_snapshot_stays_attachable_until_its_lease_ends(self):
+		graph_obj, rooms = make_graph()
+		other_graph, other_rooms = make_graph()
+		topology = CachedTopology('topology', rooms, graph_obj)
+		pool = SolverPool(max_workers=1, max_snapshots=1)
+		try:
+			with pool.lease(topology) as lease:
+				with pool.lease(CachedTopology('other', other_rooms, other_graph)):
+					pass
+				# The first snapshot was evicted; the worker has not attached it yet.
+				fastest = lease.run(solve_fastest_path, 'room0', 'room3', 'dijkstra')
+			with pytest.raises(FileNotFoundError):
+				SharedMemory(name=lease.handle.structure.name)
+		finally:
+			pool.shutdown()
+
+		assert fastest == expected_fastest_path(graph_obj, 'room0', 'room3')
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from app.classes.topology_cache import TopologyCache, compute_topology_hash
+from app.schemas.room import RoomSchema
+from app.schemas.sensor import SensorSchema
+
+
+def make_rooms(occupants_a=5, occupants_b=3):
+	return [
+		RoomSchema(
+			id='roomA',
+			name='Room A',
+			occupants=occupants_a,
+			area=100,
+			crowd_factor=2,
+			popularity_factor=1.2,
+			floor=1,
+		),
+		RoomSchema(
+			id='roomB',
+			name='Room B',
+			occupants=occupants_b,
+			area=50,
+			crowd_factor=1,
+			popularity_factor=1.1,
+			floor=1,
+		),
+	]
+
+
+def make_sensors(longitude=1.0):
+	return [
+		SensorSchema(id='s1', rooms=['roomA'], longitude=0.0, latitude=0.0, is_vertical=False),
+		SensorSchema(
+			id='s2', rooms=['roomA', 'roomB'], longitude=longitude, latitude=0.0, is_vertical=False
+		),
+		SensorSchema(id='s3', rooms=['roomB'], longitude=2.0, latitude=0.0, is_vertical=False),
+	]
+
+
+class TestTopologyCache:
+	def test_hash_ignores_occupancy(self):
+		assert compute_topology_hash(make_rooms(5, 3), make_sensors()) == compute_topology_hash(
+			make_rooms(40, 0), make_sensors()
+		)
+
+	def test_hash_changes_with_structure(self):
+		assert compute_topology_hash(make_rooms(), make_sensors()) != compute_topology_hash(
+			make_rooms(), make_sensors(longitude=1.5)
+		)
+
+	def test_same_topology_reuses_graph(self):
+		cache = TopologyCache()
+		first = cache.get_or_build(make_rooms(), make_sensors())
+		second = cache.get_or_build(make_rooms(), make_sensors())
+		assert first is second
+		assert len(cache) == 1
+
+	def test_cache_hit_refreshes_weights(self):
+		cache = TopologyCache()
+		cache.get_or_build(make_rooms(5, 3), make_sensors())
+		topology = cache.get_or_build(make_rooms(50, 3), make_sensors())
+
+		room_a = topology.room_mapping['roomA']
+		assert room_a.occupants == 50
+		edge = topology.sensor_graph.graph.get_edge_data('s1', 's2')
+		assert edge['weight'] == pytest.approx(1.0 * room_a.calculate_weight() * 2.0)
+
+	def test_least_recently_used_topology_is_evicted(self):
+		cache = TopologyCache(max_entries=1)
+		first = cache.get_or_build(make_rooms(), make_sensors())
+		cache.get_or_build(make_rooms(), make_sensors(longitude=1.5))
+		assert len(cache) == 1
+		assert cache.get_or_build(make_rooms(), make_sensors()) is not first
+
+	def test_checkout_does_not_serialize_requests(self):
+		cache = TopologyCache()
+		with cache.checkout(make_rooms(7, 3), make_sensors()) as topology:
+			assert topology.room_mapping['roomA'].occupants == 7
+			entered = []
+
+			def checkout_again():
+				with cache.checkout(make_rooms(7, 3), make_sensors()) as other:
+					entered.append(other)
+
+			worker = threading.Thread(target=checkout_again)
+			worker.start()
+			worker.join(timeout=1)
+			assert entered == [topology]
+		assert cache.get_or_build(make_rooms(), make_sensors()) is topology
+
+	def test_dict_records_share_topology_with_schemas(self):
+		cache = TopologyCache()
+		topology = cache.get_or_build(make_rooms(), make_sensors())
+		room_records = [room.model_dump() for room in make_rooms(20, 3)]
+		sensor_records = [sensor.model_dump() for sensor in make_sensors()]
+
+		assert compute_topology_hash(room_records, sensor_records) == topology.topology_hash
+		assert cache.get_or_build(room_records, sensor_records) is topology
+		assert topology.room_mapping['roomA'].occupants == 20
+
+	def test_occupancy_feeds_forecast(self):
+		cache = TopologyCache()
+		topology = cache.get_or_build(make_rooms(5, 3), make_sensors())
+		assert topology.occupancy_forecast.forecast()[0, 0] == 5
+
+		cache.get_or_build(make_rooms(40, 3), make_sensors())
+		topology.update_occupancy({'roomB': 9})
+
+		forecast = topology.occupancy_forecast.forecast()
+		assert forecast[0, 0] == 40
+		assert forecast[1, 0] == 9
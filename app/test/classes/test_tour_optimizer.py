@@ -0,0 +1,63 @@
+import itertools
+import random
+
+import pytest
+
+from app.classes.tour_optimizer import TourOptimizer
+
+
+def random_matrix(size, seed):
+	rng = random.Random(seed)
+	points = [(rng.random(), rng.random()) for _ in range(size)]
+	return [[abs(ax - bx) + abs(ay - by) for bx, by in points] for ax, ay in points]
+
+
+def brute_force_cost(matrix):
+	return min(
+		TourOptimizer.tour_cost([0, *order], matrix)
+		for order in itertools.permutations(range(1, len(matrix)))
+	)
+
+
+class TestTourOptimizer:
+	@pytest.mark.parametrize('seed', range(5))
+	def test_held_karp_is_optimal(self, seed):
+		matrix = random_matrix(7, seed)
+		order, cost = TourOptimizer().optimize(matrix)
+
+		assert order[0] == 0
+		assert sorted(order) == list(range(7))
+		assert cost == pytest.approx(brute_force_cost(matrix))
+		assert cost == pytest.approx(TourOptimizer.tour_cost(order, matrix))
+
+	def test_local_search_improves_nearest_neighbor(self):
+		matrix = random_matrix(40, 0)
+		optimizer = TourOptimizer(time_budget=1.0, exact_max_stops=0)
+
+		order, cost = optimizer.optimize(matrix)
+
+		assert sorted(order) == list(range(40))
+		assert cost <= TourOptimizer.tour_cost(TourOptimizer.nearest_neighbor(matrix), matrix)
+
+	def test_move_deltas_match_tour_costs(self):
+		rng = random.Random(2)
+		matrix = [[rng.uniform(1, 10) for _ in range(9)] for _ in range(9)]
+		order = [0, 4, 2, 8, 1, 6, 3, 7, 5]
+		cost = TourOptimizer.tour_cost(order, matrix)
+
+		moves = list(TourOptimizer._moves(order, matrix))
+
+		assert moves
+		for delta, move in moves:
+			candidate = TourOptimizer._apply_move(order, move)
+			assert sorted(candidate) == list(range(9))
+			assert candidate[0] == 0
+			assert delta == pytest.approx(TourOptimizer.tour_cost(candidate, matrix) - cost)
+
+	def test_zero_budget_returns_nearest_neighbor(self):
+		matrix = random_matrix(20, 1)
+		order, _ = TourOptimizer(time_budget=0, exact_max_stops=0).optimize(matrix)
+		assert order == TourOptimizer.nearest_neighbor(matrix)
+
+	def test_single_room(self):
+		assert TourOptimizer().optimize([[0.0]]) == ([0], 0.0)
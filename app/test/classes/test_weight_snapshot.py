@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from app.classes.csr_graph import CSRGraph
+from app.classes.weight_snapshot import WeightSnapshot
+
+
+@pytest.fixture
+def path_graph():
+	return CSRGraph.from_index_edges(['a', 'b', 'c'], [0, 1], [1, 2], [1.0, 2.0])
+
+
+class TestWeightSnapshot:
+	def test_arc_weights_follow_csr_order(self, path_graph):
+		snapshot = WeightSnapshot(1, [1.0, 2.0, 0.0], 0.5)
+		arc_weights = snapshot.arc_weights(path_graph)
+
+		assert np.array_equal(arc_weights, path_graph.weights)
+		assert not arc_weights.flags.writeable
+		assert snapshot.room_link_edge == 2
+
+	def test_updated_leaves_snapshot_unchanged(self, path_graph):
+		snapshot = WeightSnapshot(1, [1.0, 2.0, 0.0], 0.5)
+		old_arc_weights = snapshot.arc_weights(path_graph).copy()
+
+		newer = snapshot.updated([1], [7.0], 0.25, csr_graph=path_graph)
+
+		assert newer.version == 2
+		assert newer.edge_weights == [1.0, 7.0, 0.0]
+		assert newer.heuristic_scale == 0.25
+		assert snapshot.edge_weights == [1.0, 2.0, 0.0]
+		assert np.array_equal(snapshot.arc_weights(path_graph), old_arc_weights)
+		assert sorted(newer.arc_weights(path_graph)) == [1.0, 1.0, 7.0, 7.0]
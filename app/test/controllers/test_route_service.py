@@ -1,8 +1,14 @@
 import json
+import threading
+
 import pytest
-from app.controllers.route_service import create_fastest_path
+from app.classes.path_result_cache import PathResultCache
+from app.classes.shared_graph import SolverPool
+from app.controllers import route_service
+from app.controllers.route_service import create_fastest_path, topology_cache
 from app.schemas.path import FastestPathRequest
 from app.classes.sensor import Sensor
+from app.classes.topology_cache import CachedTopology
 
 MOCK_DATA_PATH = 'app/test/mock_data/rooms_and_sensors.json'
 MOCK_DATA_NO_PATH = 'app/test/mock_data/rooms_and_sensors_no_path.json'
@@ -58,3 +64,121 @@ def test_fastest_path_success(load_mock_payload):
 	assert isinstance(result['distance'], (int, float))
 	assert all(isinstance(sensor, Sensor) for sensor in result['fastest_path'])
 	assert isinstance(result['distance'], (int, float))
+
+
+def test_repeated_request_reuses_topology(load_mock_payload):
+	request = FastestPathRequest.model_validate(load_mock_payload)
+
+	first = create_fastest_path(request)
+	second = create_fastest_path(request)
+	assert [sensor.id for sensor in first['fastest_path']] == [
+		sensor.id for sensor in second['fastest_path']
+	]
+	assert first['distance'] == second['distance']
+
+	topology = topology_cache.get_or_build(request.rooms, request.sensors)
+	assert not topology.sensor_graph.graph.has_node(request.source_room)
+	assert not topology.sensor_graph.graph.has_node(request.target_room)
+
+
+def test_solver_pool_matches_in_process_search(load_mock_payload, monkeypatch):
+	request = FastestPathRequest.model_validate(load_mock_payload)
+	expected = create_fastest_path(request)
+
+	pool = SolverPool(max_workers=1)
+	monkeypatch.setattr(route_service, 'solver_pool', pool)
+	monkeypatch.setattr(route_service, 'path_result_cache', None)
+	try:
+		result = create_fastest_path(request)
+	finally:
+		pool.shutdown()
+
+	assert [sensor.id for sensor in result['fastest_path']] == [
+		sensor.id for sensor in expected['fastest_path']
+	]
+	assert result['distance'] == expected['distance']
+	assert all(isinstance(sensor, Sensor) for sensor in result['fastest_path'])
+
+
+def test_repeated_request_is_served_from_path_cache(load_mock_payload, monkeypatch):
+	cache = PathResultCache(max_entries=8, ttl=60)
+	monkeypatch.setattr(route_service, 'path_result_cache', cache)
+	request = FastestPathRequest.model_validate(load_mock_payload)
+
+	first = create_fastest_path(request)
+	second = create_fastest_path(request)
+	assert [sensor.id for sensor in second['fastest_path']] == [
+		sensor.id for sensor in first['fastest_path']
+	]
+	assert second['distance'] == first['distance']
+	assert cache.stats['hits'] == 1
+
+	crowded = load_mock_payload | {
+		'rooms': [
+			room | {'occupants': room['occupants'] + 40} for room in load_mock_payload['rooms']
+		]
+	}
+	third = create_fastest_path(FastestPathRequest.model_validate(crowded))
+	assert cache.stats['invalidated'] == 1
+	assert third['distance'] > first['distance']
+	assert third['weights_version'] > first['weights_version']
+
+
+def test_concurrent_requests_search_their_own_occupancy(load_mock_payload, monkeypatch):
+	monkeypatch.setattr(route_service, 'path_result_cache', None)
+	quiet = FastestPathRequest.model_validate(load_mock_payload)
+	crowded = FastestPathRequest.model_validate(
+		load_mock_payload
+		| {
+			'rooms': [
+				room | {'occupants': room['occupants'] + 40} for room in load_mock_payload['rooms']
+			]
+		}
+	)
+	expected = {}
+	for name, request in (('quiet', quiet), ('crowded', crowded)):
+		expected[name] = create_fastest_path(request)['distance']
+	assert expected['quiet'] != expected['crowded']
+
+	# Both requests apply their occupancy before either of them searches.
+	applied = threading.Barrier(2, timeout=5)
+	apply_occupancy = CachedTopology.apply_occupancy
+
+	def apply_then_wait(topology, room_schemas):
+		weights = apply_occupancy(topology, room_schemas)
+		applied.wait()
+		return weights
+
+	monkeypatch.setattr(CachedTopology, 'apply_occupancy', apply_then_wait)
+	results = {}
+
+	def run(name, request):
+		results[name] = create_fastest_path(request)
+
+	threads = [
+		threading.Thread(target=run, args=('quiet', quiet)),
+		threading.Thread(target=run, args=('crowded', crowded)),
+	]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert results['quiet']['distance'] == pytest.approx(expected['quiet'])
+	assert results['crowded']['distance'] == pytest.approx(expected['crowded'])
+	assert results['quiet']['weights_version'] != results['crowded']['weights_version']
+
+
+def test_response_rooms_keep_the_request_occupancy(load_mock_payload):
+	quiet = create_fastest_path(FastestPathRequest.model_validate(load_mock_payload))
+	crowded_payload = load_mock_payload | {
+		'rooms': [
+			room | {'occupants': room['occupants'] + 40} for room in load_mock_payload['rooms']
+		]
+	}
+	create_fastest_path(FastestPathRequest.model_validate(crowded_payload))
+
+	occupants = {room['id']: room['occupants'] for room in load_mock_payload['rooms']}
+	for sensor in quiet['fastest_path']:
+		for room in sensor.rooms:
+			assert room.occupants == occupants[room.id]
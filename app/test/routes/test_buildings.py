@@ -0,0 +1,153 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.controllers.route_service import (
+	building_executor,
+	building_registry,
+	occupancy_ingestor,
+)
+
+client = TestClient(app)
+
+MOCK_DATA_PATH = 'app/test/mock_data/rooms_and_sensors.json'
+MULTIPLE_POINTS_PATH = 'app/test/mock_data/multiple_points.json'
+
+
+@pytest.fixture
+def registered_building():
+	with open(MOCK_DATA_PATH, 'r') as f:
+		payload = json.load(f)
+	building = {'rooms': payload['rooms'], 'sensors': payload['sensors']}
+	response = client.put('/buildings/test-building', json=building)
+	assert response.status_code == 200
+	yield payload
+	building_registry.remove('test-building')
+
+
+def test_put_building_returns_version(registered_building):
+	response = client.put(
+		'/buildings/test-building',
+		json={'rooms': registered_building['rooms'], 'sensors': registered_building['sensors']},
+	)
+	data = response.json()
+	assert data['building_id'] == 'test-building'
+	assert data['rooms'] == len(registered_building['rooms'])
+	assert data['sensors'] == len(registered_building['sensors'])
+	assert isinstance(data['version'], str)
+
+
+def test_put_building_returns_503_when_executor_is_saturated(monkeypatch):
+	with open(MOCK_DATA_PATH, 'r') as f:
+		payload = json.load(f)
+	monkeypatch.setattr(building_executor, 'max_in_flight', 0)
+
+	response = client.put(
+		'/buildings/busy-building',
+		json={'rooms': payload['rooms'], 'sensors': payload['sensors']},
+	)
+
+	assert response.status_code == 503
+
+
+def test_building_fastest_path_matches_full_request(registered_building):
+	expected = client.post('/pathfinding/fastest-path', json=registered_building).json()
+	response = client.post(
+		'/buildings/test-building/fastest-path',
+		json={
+			'source_room': registered_building['source_room'],
+			'target_room': registered_building['target_room'],
+		},
+	)
+	assert response.status_code == 200
+	data = response.json()
+	assert data['fastest_path'] == expected['fastest_path']
+	assert data['distance'] == expected['distance']
+
+
+def test_building_multiple_points(registered_building):
+	with open(MULTIPLE_POINTS_PATH, 'r') as f:
+		payload = json.load(f)
+	client.put(
+		'/buildings/test-building', json={'rooms': payload['rooms'], 'sensors': payload['sensors']}
+	)
+	expected = client.post('/pathfinding/multiple-points', json=payload).json()
+	response = client.post(
+		'/buildings/test-building/multiple-points',
+		json={'source_room': payload['source_room'], 'target_rooms': payload['target_rooms']},
+	)
+	assert response.status_code == 200
+	data = response.json()
+	assert data['fastest_path'] == expected['fastest_path']
+	assert data['distance'] == expected['distance']
+
+
+def test_patch_occupancy_changes_distance(registered_building):
+	route = {
+		'source_room': registered_building['source_room'],
+		'target_room': registered_building['target_room'],
+	}
+	before = client.post('/buildings/test-building/fastest-path', json=route).json()
+	rooms = [
+		{'id': room['id'], 'occupants': room['occupants'] + 50}
+		for room in registered_building['rooms']
+	]
+	response = client.patch('/buildings/test-building/occupancy', json={'rooms': rooms})
+	assert response.status_code == 200
+
+	after = client.post('/buildings/test-building/fastest-path', json=route).json()
+	assert after['distance'] > before['distance']
+	assert after['weights_version'] == response.json()['weights_version']
+	assert after['weights_version'] > before['weights_version']
+
+
+def test_patch_unknown_room_is_rejected(registered_building):
+	response = client.patch(
+		'/buildings/test-building/occupancy', json={'rooms': [{'id': 'nope', 'occupants': 1}]}
+	)
+	assert response.status_code == 400
+
+
+def test_unknown_building_returns_404():
+	response = client.post(
+		'/buildings/missing/fastest-path', json={'source_room': 'a', 'target_room': 'b'}
+	)
+	assert response.status_code == 404
+
+
+def test_occupancy_events_are_applied(registered_building):
+	room_id = registered_building['rooms'][0]['id']
+	other_room_id = registered_building['rooms'][1]['id']
+	events = [
+		{'type': 'count', 'room_id': room_id, 'occupants': 40},
+		{'type': 'pass', 'sensor_id': 's', 'from_room': room_id, 'to_room': other_room_id},
+		{'type': 'count', 'room_id': room_id},
+	]
+	response = client.post(
+		'/buildings/test-building/occupancy/events',
+		content='\n'.join(json.dumps(event) for event in events) + '\n',
+		headers={'Content-Type': 'application/x-ndjson'},
+	)
+	data = response.json()
+	assert (data['accepted'], data['rejected']) == (2, 1)
+	assert data['errors'][0]['line'] == 3
+
+	occupancy_ingestor.flush()
+	room_mapping = building_registry.get('test-building').room_mapping
+	assert room_mapping[room_id].occupants == 39
+
+
+def test_occupancy_websocket_reports_invalid_events(registered_building):
+	room_id = registered_building['rooms'][0]['id']
+	with client.websocket_connect('/buildings/test-building/occupancy/stream') as websocket:
+		websocket.send_text('{"type": "count", "room_id": "%s", "occupants": 7}' % room_id)
+		websocket.send_text('{"type": "teleport"}')
+		assert 'error' in websocket.receive_json()
+
+	occupancy_ingestor.flush()
+	assert building_registry.get('test-building').room_mapping[room_id].occupants == 7
+
+
+def test_occupancy_events_for_unknown_building_return_404():
+	response = client.post('/buildings/missing/occupancy/events', content='')
+	assert response.status_code == 404
@@ -2,6 +2,7 @@ import json
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.controllers.route_service import path_executor, topology_cache
 
 client = TestClient(app)
 
@@ -150,3 +151,177 @@ def test_multiple_points_handles_same_source_and_target(load_multiple_points_pay
 		data['detail']
 		== 'Target rooms list must contain at least one room different from the source room.'
 	)
+
+
+@pytest.mark.parametrize('mode', ['astar', 'bidirectional'])
+def test_pathfinding_search_modes_match_dijkstra(load_mock_payload, mode):
+	expected = client.post('/pathfinding/fastest-path', json=load_mock_payload).json()
+
+	response = client.post('/pathfinding/fastest-path', json={**load_mock_payload, 'mode': mode})
+
+	assert response.status_code == 200
+	assert response.json()['distance'] == pytest.approx(expected['distance'])
+
+
+def test_pathfinding_rejects_unknown_mode(load_mock_payload):
+	response = client.post(
+		'/pathfinding/fastest-path', json={**load_mock_payload, 'mode': 'teleport'}
+	)
+	assert response.status_code == 422
+
+
+def test_multiple_points_optimized_not_longer(load_multiple_points_payload):
+	greedy = client.post('/pathfinding/multiple-points', json=load_multiple_points_payload).json()
+
+	response = client.post(
+		'/pathfinding/multiple-points',
+		json={**load_multiple_points_payload, 'optimizer': 'optimized', 'time_budget_ms': 20},
+	)
+
+	assert response.status_code == 200
+	assert response.json()['distance'] <= greedy['distance'] + 1e-9
+
+
+def test_pathfinding_returns_503_when_executor_is_saturated(load_mock_payload, monkeypatch):
+	monkeypatch.setattr(path_executor, 'max_in_flight', 0)
+	response = client.post('/pathfinding/fastest-path', json=load_mock_payload)
+	assert response.status_code == 503
+
+
+def test_batch_streams_pair_and_tour_results(load_multiple_points_payload):
+	payload = load_multiple_points_payload
+	source_room = payload['source_room']
+	target_rooms = payload['target_rooms']
+	batch = {
+		'rooms': payload['rooms'],
+		'sensors': payload['sensors'],
+		'pairs': [
+			{'source_room': source_room, 'target_room': target_rooms[0]},
+			{'source_room': source_room, 'target_room': 'non_existent_room'},
+			{'source_room': target_rooms[1], 'target_room': target_rooms[2]},
+		],
+		'tours': [{'source_room': source_room, 'target_rooms': target_rooms}],
+	}
+
+	response = client.post('/pathfinding/batch', json=batch)
+
+	assert response.status_code == 200
+	assert response.headers['content-type'].startswith('application/x-ndjson')
+	results = [json.loads(line) for line in response.text.splitlines()]
+	by_key = {(result['type'], result['index']): result for result in results}
+	assert len(by_key) == 4
+
+	single = client.post(
+		'/pathfinding/fastest-path',
+		json={
+			'rooms': payload['rooms'],
+			'sensors': payload['sensors'],
+			'source_room': source_room,
+			'target_room': target_rooms[0],
+		},
+	).json()
+	assert by_key[('pair', 0)]['distance'] == pytest.approx(single['distance'])
+	assert by_key[('pair', 0)]['fastest_path'] == single['fastest_path']
+	assert by_key[('pair', 1)]['error'] == "Target room 'non_existent_room' is not valid."
+	assert 'distance' in by_key[('pair', 2)]
+
+	tour = client.post('/pathfinding/multiple-points', json=payload).json()
+	assert by_key[('tour', 0)]['distance'] == pytest.approx(tour['distance'])
+
+
+def test_batch_is_checked_out_once(load_multiple_points_payload, monkeypatch):
+	payload = load_multiple_points_payload
+	checkouts = []
+	checkout = topology_cache.checkout
+
+	def counting_checkout(*args):
+		checkouts.append(args)
+		return checkout(*args)
+
+	monkeypatch.setattr(topology_cache, 'checkout', counting_checkout)
+	batch = {
+		'rooms': payload['rooms'],
+		'sensors': payload['sensors'],
+		'pairs': [
+			{'source_room': payload['source_room'], 'target_room': room_id}
+			for room_id in payload['target_rooms']
+		]
+		+ [{'source_room': payload['target_rooms'][0], 'target_room': payload['source_room']}],
+		'tours': [{'source_room': payload['source_room'], 'target_rooms': payload['target_rooms']}],
+	}
+
+	response = client.post('/pathfinding/batch', json=batch)
+
+	results = [json.loads(line) for line in response.text.splitlines()]
+	assert len(results) == len(batch['pairs']) + 1
+	assert len(checkouts) == 1
+	assert len({result['weights_version'] for result in results}) == 1
+
+
+def test_room_distances_match_fastest_path(load_mock_payload):
+	payload = {
+		'rooms': load_mock_payload['rooms'],
+		'sensors': load_mock_payload['sensors'],
+		'source_room': load_mock_payload['source_room'],
+	}
+	single = client.post('/pathfinding/fastest-path', json=load_mock_payload).json()
+
+	response = client.post('/pathfinding/room-distances', json=payload)
+
+	assert response.status_code == 200
+	distances = {item['room_id']: item['distance'] for item in response.json()['distances']}
+	assert distances[load_mock_payload['target_room']] == pytest.approx(single['distance'])
+
+	budget = single['distance'] / 2
+	limited = client.post('/pathfinding/room-distances', json={**payload, 'budget': budget})
+	assert all(item['distance'] <= budget for item in limited.json()['distances'])
+	assert load_mock_payload['target_room'] not in {
+		item['room_id'] for item in limited.json()['distances']
+	}
+
+
+def test_pathfinding_reports_invalid_room_fields(load_mock_payload):
+	payload = json.loads(json.dumps(load_mock_payload))
+	payload['rooms'][0]['occupants'] = 'many'
+	response = client.post('/pathfinding/fastest-path', json=payload)
+	assert response.status_code == 422
+	assert response.json()['detail'][0]['loc'] == ['body', 'rooms', 0, 'occupants']
+
+
+def test_pathfinding_rejects_malformed_json():
+	response = client.post(
+		'/pathfinding/fastest-path',
+		content=b'{"rooms": [',
+		headers={'Content-Type': 'application/json'},
+	)
+	assert response.status_code == 422
+
+
+def test_alternative_paths_start_with_fastest_path(load_mock_payload):
+	payload = {
+		key: load_mock_payload[key] for key in ('rooms', 'sensors', 'source_room', 'target_room')
+	}
+	single = client.post('/pathfinding/fastest-path', json=payload).json()
+
+	response = client.post('/pathfinding/alternative-paths', json={**payload, 'spread': False})
+
+	assert response.status_code == 200
+	data = response.json()
+	assert data['assigned_route'] == 0
+	assert data['routes'][0]['distance'] == pytest.approx(single['distance'])
+	assert data['distance'] == pytest.approx(single['distance'])
+	assert 1 <= len(data['routes']) <= 3
+
+	spread = client.post('/pathfinding/alternative-paths', json={**payload, 'k': 2}).json()
+	assert spread['assigned_route'] in (0, 1)
+	assert spread['fastest_path'] == spread['routes'][spread['assigned_route']]['path']
+
+
+def test_multiple_points_forecast_tour(load_multiple_points_payload):
+	payload = {**load_multiple_points_payload, 'optimizer': 'forecast'}
+	response = client.post('/pathfinding/multiple-points', json=payload)
+
+	assert response.status_code == 200
+	data = response.json()
+	assert isinstance(data['distance'], (int, float))
+	assert all('id' in point for point in data['fastest_path'])
@@ -0,0 +1,106 @@
+"""
+Measures the cost of alternative routes against a single fastest-path search:
+
+- fastest: SensorGraph.find_fastest_path() per query.
+- alternatives k=N: SensorGraph.find_alternative_paths() per query, plus the
+  RouteDispersion assignment the alternative-paths routes make for every request.
+
+Also reports how the assignments of repeated requests for one query were spread
+over its routes. Run with:
+
+    python -m benchmarks.alternatives --rooms 2000 --sensors 8000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+import networkx as nx
+
+from app.classes.route_dispersion import RouteDispersion
+from app.classes.sensor_graph import SensorGraph
+from benchmarks.ingestion import ingest_records, make_payload
+
+
+def sample_queries(sensor_graph: SensorGraph, count: int, seed: int = 0) -> list:
+	"""Returns (source room, target room) pairs of distinct rooms that are connected."""
+	rng = random.Random(seed)
+	room_ids = sorted(sensor_graph.rooms)
+	queries = []
+	while len(queries) < count:
+		source_room_id, target_room_id = rng.sample(room_ids, 2)
+		try:
+			sensor_graph.find_fastest_path(source_room_id, target_room_id)
+			queries.append((source_room_id, target_room_id))
+		except nx.NetworkXNoPath:
+			pass
+	return queries
+
+
+def time_queries(sensor_graph: SensorGraph, queries: list, search) -> tuple:
+	"""Runs search(source, target) for every query; returns (mean ms, results)."""
+	results = []
+	started = time.perf_counter()
+	for source_room_id, target_room_id in queries:
+		results.append(search(source_room_id, target_room_id))
+	return (time.perf_counter() - started) / len(queries) * 1000, results
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--rooms', type=int, default=2000)
+	parser.add_argument('--sensors', type=int, default=8000)
+	parser.add_argument('--backend', choices=['networkx', 'csr'], default='networkx')
+	parser.add_argument('--queries', type=int, default=50)
+	parser.add_argument('--k', type=int, nargs='+', default=[2, 3, 5])
+	parser.add_argument('--requests', type=int, default=100)
+	args = parser.parse_args()
+
+	sensor_graph = SensorGraph(
+		ingest_records(make_payload(args.rooms, args.sensors)), backend=args.backend
+	)
+	sensor_graph.build_graph()
+	sensor_graph.get_csr_graph()
+	queries = sample_queries(sensor_graph, args.queries)
+	print(f'{args.rooms} rooms, {args.sensors} sensors, {args.backend}, {len(queries)} queries')
+
+	fastest, _ = time_queries(sensor_graph, queries, sensor_graph.find_fastest_path)
+	print(f'fastest          {fastest:8.2f} ms')
+
+	dispersion = RouteDispersion()
+	for k in args.k:
+
+		def search(source_room_id, target_room_id, k=k):
+			routes = sensor_graph.find_alternative_paths(source_room_id, target_room_id, k=k)
+			dispersion.assign(
+				(source_room_id, target_room_id),
+				[tuple(sensor.id for sensor in path) for path, _ in routes],
+				[distance for _, distance in routes],
+			)
+			return routes
+
+		elapsed, results = time_queries(sensor_graph, queries, search)
+		found = sum(len(routes) for routes in results) / len(results)
+		stretch = max(routes[-1][1] / routes[0][1] for routes in results if routes[0][1] > 0)
+		print(
+			f'alternatives k={k} {elapsed:8.2f} ms  ({elapsed / fastest:.1f}x fastest, '
+			f'{found:.2f} routes per query, max stretch {stretch:.2f})'
+		)
+
+	# Spread of repeated requests for the query with the most routes.
+	routes = max(results, key=len)
+	signatures = [tuple(sensor.id for sensor in path) for path, _ in routes]
+	distances = [distance for _, distance in routes]
+	dispersion = RouteDispersion()
+	picks = Counter(dispersion.assign('query', signatures, distances) for _ in range(args.requests))
+	shares = RouteDispersion.shares(distances)
+	for index, distance in enumerate(distances):
+		print(
+			f'route {index}: distance {distance:8.3f}  assigned {picks[index] / args.requests:5.1%}'
+			f'  (share {shares[index]:5.1%})'
+		)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,100 @@
+"""
+Compares the two ways a path request body becomes a sensor graph input:
+
+- schemas: json.loads(), FastestPathRequest validation into RoomSchema/SensorSchema
+  models, then Room/Sensor objects copied from the schemas.
+- records: FastestPathRecords.model_validate_json() into plain dict records, then
+  BuildingStore columns and Room/Sensor objects built from the store.
+
+Both include the topology hash, which every request computes. Run with:
+
+    python -m benchmarks.ingestion --rooms 5000 --sensors 20000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from app.classes.building_store import BuildingStore
+from app.classes.room import Room
+from app.classes.sensor import Sensor
+from app.classes.topology_cache import compute_topology_hash
+from app.schemas.path import FastestPathRecords, FastestPathRequest
+
+
+def make_payload(room_count: int, sensor_count: int, seed: int = 0) -> bytes:
+	"""Returns the JSON body of a fastest-path request over a random building."""
+	rng = random.Random(seed)
+	rooms = [
+		{
+			'id': f'room-{index}',
+			'name': f'Room {index}',
+			'occupants': rng.randint(0, 50),
+			'area': rng.uniform(10, 500),
+			'crowd_factor': rng.random(),
+			'popularity_factor': 1.0,
+			'floor': index % 4,
+		}
+		for index in range(room_count)
+	]
+	sensors = [
+		{
+			'id': f'sensor-{index}',
+			'rooms': [rng.choice(rooms)['id'] for _ in range(2)],
+			'longitude': rng.random(),
+			'latitude': rng.random(),
+			'is_vertical': False,
+		}
+		for index in range(sensor_count)
+	]
+	return json.dumps(
+		{
+			'rooms': rooms,
+			'sensors': sensors,
+			'source_room': rooms[0]['id'],
+			'target_room': rooms[-1]['id'],
+		}
+	).encode()
+
+
+def ingest_schemas(body: bytes) -> list:
+	request = FastestPathRequest.model_validate(json.loads(body))
+	compute_topology_hash(request.rooms, request.sensors)
+	room_mapping = Room.create_room_mapping_from_schemas(request.rooms)
+	return Sensor.create_sensors_from_schemas(request.sensors, room_mapping)
+
+
+def ingest_records(body: bytes) -> list:
+	request = FastestPathRecords.model_validate_json(body)
+	compute_topology_hash(request.rooms, request.sensors)
+	store = BuildingStore.from_schemas(request.rooms, request.sensors)
+	return store.create_sensors(store.create_room_mapping())
+
+
+def best_time(func, body: bytes, repeat: int) -> float:
+	timings = []
+	for _ in range(repeat):
+		started = time.perf_counter()
+		func(body)
+		timings.append(time.perf_counter() - started)
+	return min(timings)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--rooms', type=int, default=5000)
+	parser.add_argument('--sensors', type=int, default=20000)
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args()
+
+	body = make_payload(args.rooms, args.sensors)
+	print(f'payload: {len(body) / 1e6:.1f} MB, {args.rooms} rooms, {args.sensors} sensors')
+	schemas = best_time(ingest_schemas, body, args.repeat)
+	records = best_time(ingest_records, body, args.repeat)
+	print(f'schemas  {schemas * 1000:8.1f} ms')
+	print(f'records  {records * 1000:8.1f} ms  ({schemas / records:.2f}x faster)')
+
+
+if __name__ == '__main__':
+	main()
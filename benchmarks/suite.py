@@ -0,0 +1,395 @@
+"""
+Benchmark suite over synthetic buildings, with a machine-readable report:
+
+- build_graph: BuildingStore ingestion and SensorGraph.build_graph(), per backend.
+- find_fastest_path: room-to-room queries, per backend and search mode.
+- find_multi_point_path_nearest_neighbor: tours through --tour-size rooms, per backend.
+- HTTP: the fastest-path and multiple-points routes, with the building in the body
+  and for a registered building, through the ASGI app in-process.
+
+Buildings come from benchmarks.synthetic_building, one per --sensors value. Every
+benchmark reports p50/p95/p99 and mean latency in milliseconds over distinct
+queries, after an untimed warm-up call that builds lazily built indexes, and the
+tracemalloc peak of one more untimed call. The report is JSON on stdout or in
+--output; --compare prints the change against an earlier report and exits with
+status 1 when a p50 grew by more than --threshold. Run with:
+
+    python -m benchmarks.suite --sensors 1000 10000 100000 --output baseline.json
+    python -m benchmarks.suite --sensors 1000 10000 100000 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from functools import partial
+
+import httpx
+import numpy as np
+
+from app.classes.building_store import BuildingStore
+from app.classes.sensor_graph import SEARCH_MODES, SensorGraph
+from app.controllers.route_service import building_registry, topology_cache
+from app.main import app
+from benchmarks.synthetic_building import building_shape, generate_building
+
+BACKENDS = ['networkx', 'csr']
+JSON_HEADERS = {'content-type': 'application/json'}
+BUILDING_ID = 'benchmark'
+
+
+def log(message: str):
+	print(message, file=sys.stderr, flush=True)
+
+
+def latency_stats(samples: list) -> dict:
+	"""Returns count, p50/p95/p99 and mean of samples in seconds, in milliseconds."""
+	milliseconds = np.asarray(samples, dtype=np.float64) * 1000
+	p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+	return {
+		'count': len(samples),
+		'p50_ms': round(float(p50), 4),
+		'p95_ms': round(float(p95), 4),
+		'p99_ms': round(float(p99), 4),
+		'mean_ms': round(float(milliseconds.mean()), 4),
+	}
+
+
+def measure(calls: list) -> dict:
+	"""
+	Times every call but the last, then runs the last one under tracemalloc.
+
+	Args:
+	    calls (list): At least two zero-argument functions.
+
+	Returns:
+	    dict: latency_stats() of the timed calls plus 'peak_bytes'.
+	"""
+	samples = []
+	for call in calls[:-1]:
+		started = time.perf_counter()
+		call()
+		samples.append(time.perf_counter() - started)
+	tracemalloc.start()
+	try:
+		calls[-1]()
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+	return {**latency_stats(samples), 'peak_bytes': peak}
+
+
+async def measure_requests(client: httpx.AsyncClient, requests: list) -> dict:
+	"""
+	measure() for HTTP requests. The JSON body of each request is encoded before its
+	timer starts.
+
+	Args:
+	    client (httpx.AsyncClient): Client on the ASGI app.
+	    requests (list): At least two (method, url, make_body) tuples, make_body
+	                     returning the body bytes.
+	"""
+
+	async def send(method: str, url: str, make_body) -> float:
+		body = make_body()
+		started = time.perf_counter()
+		response = await client.request(method, url, content=body, headers=JSON_HEADERS)
+		elapsed = time.perf_counter() - started
+		if response.status_code != 200:
+			raise RuntimeError(f'{method} {url} returned {response.status_code}: {response.text}')
+		return elapsed
+
+	samples = [await send(*request) for request in requests[:-1]]
+	tracemalloc.start()
+	try:
+		await send(*requests[-1])
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+	return {**latency_stats(samples), 'peak_bytes': peak}
+
+
+def sample_room_pairs(room_ids: list, count: int, rng: random.Random) -> list:
+	"""Returns count distinct (source, target) pairs of different rooms."""
+	pairs = set()
+	while len(pairs) < min(count, len(room_ids) * (len(room_ids) - 1)):
+		pairs.add(tuple(rng.sample(room_ids, 2)))
+	return sorted(pairs)
+
+
+def sample_tours(room_ids: list, count: int, size: int, rng: random.Random) -> list:
+	"""Returns count (source, [targets]) tours through size distinct rooms."""
+	size = min(size, len(room_ids))
+	tours = []
+	for _ in range(count):
+		source, *targets = rng.sample(room_ids, size)
+		tours.append((source, targets))
+	return tours
+
+
+def build_sensor_graph(building: dict, backend: str) -> SensorGraph:
+	"""Builds the sensor graph of building records the way build_topology() does."""
+	store = BuildingStore.from_schemas(building['rooms'], building['sensors'])
+	sensors = store.create_sensors(store.create_room_mapping())
+	sensor_graph = SensorGraph(sensors, backend=backend, store=store)
+	sensor_graph.build_graph()
+	return sensor_graph
+
+
+def run_graph_benchmarks(building: dict, args, rng: random.Random) -> dict:
+	room_ids = [room['id'] for room in building['rooms']]
+	# One extra query and tour for the memory measurement, one for the warm-up.
+	pairs = sample_room_pairs(room_ids, args.queries + 2, rng)
+	tours = sample_tours(room_ids, args.tours + 2, args.tour_size, rng)
+	results = {}
+	for backend in args.backends:
+		log(f'  build_graph [{backend}]')
+		results[f'build_graph[{backend}]'] = measure(
+			[partial(build_sensor_graph, building, backend)] * (args.build_repeat + 1)
+		)
+		sensor_graph = build_sensor_graph(building, backend)
+
+		for mode in args.modes:
+			log(f'  find_fastest_path [{backend}, {mode}]')
+			(warm_up_source, warm_up_target), *timed = pairs
+			sensor_graph.find_fastest_path(warm_up_source, warm_up_target, mode=mode)
+			results[f'find_fastest_path[{backend},{mode}]'] = measure(
+				[
+					partial(sensor_graph.find_fastest_path, source, target, mode=mode)
+					for source, target in timed
+				]
+			)
+
+		log(f'  find_multi_point_path_nearest_neighbor [{backend}]')
+		results[f'find_multi_point_path_nearest_neighbor[{backend}]'] = measure(
+			[
+				partial(sensor_graph.find_multi_point_path_nearest_neighbor, source, targets)
+				for source, targets in tours[1:]
+			]
+		)
+	return results
+
+
+async def run_http_benchmarks(building: dict, args, rng: random.Random) -> dict:
+	room_ids = [room['id'] for room in building['rooms']]
+	# Distinct queries, so that the path result cache never answers them. Each route
+	# also gets two warm-up queries and one for the memory measurement.
+	pairs = sample_room_pairs(room_ids, 2 * (args.http_requests + 3), rng)
+	tours = sample_tours(room_ids, 2 * (args.http_requests + 2), args.tour_size, rng)
+	records = json.dumps({'rooms': building['rooms'], 'sensors': building['sensors']})
+
+	def with_records(fields: dict):
+		# Splices the query fields into the encoded building instead of re-encoding it.
+		return lambda: (records[:-1] + ', ' + json.dumps(fields)[1:]).encode()
+
+	def query(fields: dict):
+		return lambda: json.dumps(fields).encode()
+
+	results = {}
+	transport = httpx.ASGITransport(app=app)
+	async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+		inline_pairs, building_pairs = pairs[: len(pairs) // 2], pairs[len(pairs) // 2 :]
+		inline_tours, building_tours = tours[: len(tours) // 2], tours[len(tours) // 2 :]
+
+		log('  POST /pathfinding/fastest-path')
+		# The warm-up request builds the topology that later requests find in the cache.
+		requests = [
+			(
+				'POST',
+				'/pathfinding/fastest-path',
+				with_records({'source_room': source, 'target_room': target}),
+			)
+			for source, target in inline_pairs
+		]
+		await measure_requests(client, requests[:2])
+		results['POST /pathfinding/fastest-path'] = await measure_requests(client, requests[2:])
+
+		log('  POST /pathfinding/multiple-points')
+		results['POST /pathfinding/multiple-points'] = await measure_requests(
+			client,
+			[
+				(
+					'POST',
+					'/pathfinding/multiple-points',
+					with_records({'source_room': source, 'target_rooms': targets}),
+				)
+				for source, targets in inline_tours[1:]
+			],
+		)
+
+		log('  PUT /buildings/{id}')
+		# New building IDs, so that every registration builds the graph.
+		building_ids = [f'{BUILDING_ID}-{index}' for index in range(args.build_repeat + 1)]
+		results['PUT /buildings/{id}'] = await measure_requests(
+			client,
+			[
+				('PUT', f'/buildings/{building_id}', lambda: records.encode())
+				for building_id in building_ids
+			],
+		)
+
+		log('  POST /buildings/{id}/fastest-path')
+		requests = [
+			(
+				'POST',
+				f'/buildings/{building_ids[0]}/fastest-path',
+				query({'source_room': source, 'target_room': target}),
+			)
+			for source, target in building_pairs
+		]
+		await measure_requests(client, requests[:2])
+		results['POST /buildings/{id}/fastest-path'] = await measure_requests(client, requests[2:])
+
+		log('  POST /buildings/{id}/multiple-points')
+		results['POST /buildings/{id}/multiple-points'] = await measure_requests(
+			client,
+			[
+				(
+					'POST',
+					f'/buildings/{building_ids[0]}/multiple-points',
+					query({'source_room': source, 'target_rooms': targets}),
+				)
+				for source, targets in building_tours[1:]
+			],
+		)
+
+	for building_id in building_ids:
+		building_registry.remove(building_id)
+	topology_cache.clear()
+	return results
+
+
+def git_commit() -> str | None:
+	try:
+		return subprocess.run(
+			['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def run_suite(args) -> dict:
+	buildings = []
+	for sensor_count in args.sensors:
+		shape = building_shape(sensor_count, floors=args.floors, doors_per_wall=args.doors_per_wall)
+		building = generate_building(*shape, stairwells=args.stairwells, seed=args.seed)
+		floors, rows, columns, _ = shape
+		log(
+			f'{sensor_count} sensors: {floors} floors of {rows}x{columns} rooms, '
+			f'{len(building["sensors"])} sensors'
+		)
+		rng = random.Random(args.seed)
+		benchmarks = run_graph_benchmarks(building, args, rng)
+		if not args.skip_http:
+			benchmarks.update(asyncio.run(run_http_benchmarks(building, args, rng)))
+		buildings.append(
+			{
+				'label': str(sensor_count),
+				'floors': floors,
+				'rows': rows,
+				'columns': columns,
+				'rooms': len(building['rooms']),
+				'sensors': len(building['sensors']),
+				'benchmarks': benchmarks,
+			}
+		)
+
+	settings = {
+		name: value for name, value in vars(args).items() if name not in ('output', 'compare')
+	}
+	return {
+		'commit': git_commit(),
+		'created': datetime.now(UTC).isoformat(),
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'settings': settings,
+		# ru_maxrss is in kilobytes on Linux.
+		'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+		'buildings': buildings,
+	}
+
+
+def compare_reports(baseline: dict, report: dict, threshold: float) -> list:
+	"""
+	Compares the p50 and p95 latency of every benchmark in both reports.
+
+	Args:
+	    baseline (dict): The earlier report.
+	    report (dict): The new report.
+	    threshold (float): p50 ratio (new / baseline) above which a benchmark regressed.
+
+	Returns:
+	    list: (building label, benchmark, baseline stats, new stats, p50 ratio, regressed)
+	          for benchmarks present in both reports.
+	"""
+	baseline_stats = {
+		(building['label'], name): stats
+		for building in baseline['buildings']
+		for name, stats in building['benchmarks'].items()
+	}
+	rows = []
+	for building in report['buildings']:
+		for name, stats in building['benchmarks'].items():
+			old = baseline_stats.get((building['label'], name))
+			if old is None:
+				continue
+			ratio = stats['p50_ms'] / old['p50_ms'] if old['p50_ms'] > 0 else float('inf')
+			rows.append((building['label'], name, old, stats, ratio, ratio > threshold))
+	return rows
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--sensors', type=int, nargs='+', default=[1000, 10000])
+	parser.add_argument('--floors', type=int, default=4)
+	parser.add_argument('--doors-per-wall', type=int, default=1)
+	parser.add_argument('--stairwells', type=int, default=2)
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS)
+	parser.add_argument('--modes', nargs='+', choices=SEARCH_MODES, default=['dijkstra', 'astar'])
+	parser.add_argument('--build-repeat', type=int, default=3)
+	parser.add_argument('--queries', type=int, default=50)
+	parser.add_argument('--tours', type=int, default=10)
+	parser.add_argument('--tour-size', type=int, default=5)
+	parser.add_argument('--http-requests', type=int, default=20)
+	parser.add_argument('--skip-http', action='store_true')
+	parser.add_argument('--output', help='Write the report to this file instead of stdout.')
+	parser.add_argument('--compare', help='Earlier report to compare against.')
+	parser.add_argument('--threshold', type=float, default=1.2)
+	args = parser.parse_args()
+
+	try:
+		report = run_suite(args)
+	finally:
+		for handler in app.router.on_shutdown:
+			handler()
+
+	if args.output:
+		with open(args.output, 'w') as file:
+			json.dump(report, file, indent=2)
+	else:
+		print(json.dumps(report, indent=2))
+
+	if args.compare:
+		with open(args.compare) as file:
+			baseline = json.load(file)
+		rows = compare_reports(baseline, report, args.threshold)
+		for label, name, old, new, ratio, regressed in rows:
+			log(
+				f'{label:>8} {name:<56} p50 {old["p50_ms"]:9.3f} -> {new["p50_ms"]:9.3f} ms'
+				f'  p95 {old["p95_ms"]:9.3f} -> {new["p95_ms"]:9.3f} ms  {ratio:5.2f}x'
+				+ ('  REGRESSION' if regressed else '')
+			)
+		if any(regressed for *_, regressed in rows):
+			sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,124 @@
+"""
+Generates synthetic buildings in the request format of the API, for the benchmarks.
+
+Every floor is a grid of square rooms. Neighboring rooms share door sensors on
+their common wall, and stairwells connect the room at the same grid cell of
+consecutive floors with an is_vertical sensor. Coordinates are in meters. Build a
+building of about a given size with:
+
+    generate_building(*building_shape(sensor_count=100_000, floors=10))
+"""
+
+import math
+import random
+
+# Side of one square room in meters.
+ROOM_SIZE = 10.0
+
+
+def building_shape(sensor_count: int, floors: int = 4, doors_per_wall: int = 1) -> tuple:
+	"""
+	Picks the room grid for a building of about sensor_count sensors.
+
+	Returns:
+	    tuple: (floors, rows, columns, doors_per_wall) for generate_building().
+	"""
+	# A square grid of n x n rooms has 2 * n * (n - 1) inner walls.
+	walls_per_floor = max(sensor_count / floors / doors_per_wall, 4)
+	side = max(2, round((1 + math.sqrt(1 + 2 * walls_per_floor)) / 2))
+	return floors, side, side, doors_per_wall
+
+
+def room_id(floor: int, row: int, column: int) -> str:
+	return f'room-{floor}-{row}-{column}'
+
+
+def generate_building(
+	floors: int,
+	rows: int,
+	columns: int,
+	doors_per_wall: int = 1,
+	stairwells: int = 2,
+	seed: int = 0,
+) -> dict:
+	"""
+	Generates the rooms and sensors of a building.
+
+	Args:
+	    floors (int): Number of floors.
+	    rows (int): Rooms per grid column on every floor.
+	    columns (int): Rooms per grid row on every floor.
+	    doors_per_wall (int): Door sensors on the wall between two neighboring rooms.
+	    stairwells (int): Grid cells with a vertical sensor between every two
+	                      consecutive floors; at least one connects the floors.
+	    seed (int): Seed for occupancy, crowd and popularity factors.
+
+	Returns:
+	    dict: {'rooms': [room record], 'sensors': [sensor record]}.
+	"""
+	rng = random.Random(seed)
+	rooms = [
+		{
+			'id': room_id(floor, row, column),
+			'name': f'Floor {floor} room {row}.{column}',
+			'occupants': rng.randint(0, 40),
+			'area': ROOM_SIZE * ROOM_SIZE,
+			'crowd_factor': rng.uniform(0.5, 2.0),
+			'popularity_factor': rng.uniform(0.8, 1.5),
+			'floor': floor,
+		}
+		for floor in range(floors)
+		for row in range(rows)
+		for column in range(columns)
+	]
+
+	sensors = []
+	for floor in range(floors):
+		for row in range(rows):
+			for column in range(columns):
+				for door in range(doors_per_wall):
+					offset = ROOM_SIZE * (door + 1) / (doors_per_wall + 1)
+					if column + 1 < columns:
+						sensors.append(
+							{
+								'id': f'door-{floor}-{row}-{column}-east-{door}',
+								'rooms': [
+									room_id(floor, row, column),
+									room_id(floor, row, column + 1),
+								],
+								'longitude': (column + 1) * ROOM_SIZE,
+								'latitude': row * ROOM_SIZE + offset,
+								'is_vertical': False,
+							}
+						)
+					if row + 1 < rows:
+						sensors.append(
+							{
+								'id': f'door-{floor}-{row}-{column}-south-{door}',
+								'rooms': [
+									room_id(floor, row, column),
+									room_id(floor, row + 1, column),
+								],
+								'longitude': column * ROOM_SIZE + offset,
+								'latitude': (row + 1) * ROOM_SIZE,
+								'is_vertical': False,
+							}
+						)
+
+	cell_count = rows * columns
+	stairwell_cells = sorted(
+		{index * cell_count // max(stairwells, 1) for index in range(max(stairwells, 1))}
+	)
+	for floor in range(floors - 1):
+		for cell in stairwell_cells:
+			row, column = divmod(cell, columns)
+			sensors.append(
+				{
+					'id': f'stairs-{row}-{column}-{floor}',
+					'rooms': [room_id(floor, row, column), room_id(floor + 1, row, column)],
+					'longitude': (column + 0.5) * ROOM_SIZE,
+					'latitude': (row + 0.5) * ROOM_SIZE,
+					'is_vertical': True,
+				}
+			)
+	return {'rooms': rooms, 'sensors': sensors}